@@ -0,0 +1,369 @@
+import argparse
+import importlib.util
+import logging
+import os
+import sys
+import tempfile
+import time
+from logging import Logger
+from pathlib import Path
+from threading import Event, Thread
+from typing import Any, Callable
+
+import httpx
+import polars as pl
+from tabulate import tabulate
+
+from source.common.common import LogTools
+from source.get_japan_government_statistics.gjgs_class import GetJapanGovernmentStatistics, StatsDataParser
+from source.get_japan_government_statistics.gjgs_fake_server import FakeEStatServer
+
+
+class PeakRssSampler:
+    """処理中のRSS(物理メモリの使用量)のピークを計測するクラス"""
+
+    def __init__(self, interval: float = 0.005):
+        """初期化します"""
+        # 計測の間隔(秒)
+        self.interval: float = interval
+        self.rss_at_start: int = 0
+        self.peak_rss: int = 0
+        self.stop_event: Event = Event()
+        self.thread: Thread | None = None
+
+    @staticmethod
+    def get_rss() -> int:
+        """現在のRSS(バイト)を取得します(取得できない場合は、0)"""
+        # psutilがない場合は、Linuxの/procから読む
+        if importlib.util.find_spec("psutil") is not None:
+            import psutil
+
+            return int(psutil.Process().memory_info().rss)
+        statm: Path = Path("/proc/self/statm")
+        if statm.exists():
+            return int(statm.read_text().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        return 0
+
+    def _sample(self) -> None:
+        """停止するまで、一定の間隔でRSSを計測します"""
+        while not self.stop_event.wait(self.interval):
+            self.peak_rss = max(self.peak_rss, self.get_rss())
+
+    def __enter__(self) -> "PeakRssSampler":
+        self.rss_at_start = self.peak_rss = self.get_rss()
+        self.stop_event.clear()
+        self.thread = Thread(target=self._sample, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        self.peak_rss = max(self.peak_rss, self.get_rss())
+
+
+class GJGS_Benchmark:
+    """疑似サーバーで、統計表IDの一覧の取得、解析器、フィルターの処理速度を計測するクラス"""
+
+    def __init__(
+        self,
+        logger: Logger,
+        number_of_ids: int = 10000,
+        number_of_areas: int = 47,
+        number_of_times: int = 30,
+        latency: float = 0.0,
+        repeat: int = 5,
+        latency_per_row: float = 0.0,
+    ):
+        """初期化します"""
+        self.log: Logger = logger
+        # 統計表IDの一覧の総件数
+        self.NUMBER_OF_IDS: int = number_of_ids
+        # 指定の統計表の地域と時間軸の数(件数は、分類の数 x 地域の数 x 時間軸の数)
+        self.NUMBER_OF_AREAS: int = number_of_areas
+        self.NUMBER_OF_TIMES: int = number_of_times
+        # 疑似サーバーの応答の遅延(秒)
+        self.LATENCY: float = latency
+        # 疑似サーバーの取得件数1件あたりの応答の遅延(秒)
+        self.LATENCY_PER_ROW: float = latency_per_row
+        # 解析器とフィルターを繰り返す回数
+        self.REPEAT: int = repeat
+        # 計測する統計表ID
+        self.STATS_DATA_ID: str = "0000000001"
+        # 計測結果の表の見出し
+        self.header_of_results: list = ["対象", "条件", "ページ数", "件数", "秒", "ページ/秒", "件/秒", "ピークRSS(MiB)", "増加(MiB)"]
+        # 計測結果
+        self.lst_of_result: list[dict] = []
+
+    def _create_obj_of_cls(self, url_of_api: str, folder_p: Path) -> GetJapanGovernmentStatistics:
+        """疑似サーバーに接続して、一時フォルダに書き出すインスタンスを作成します"""
+        # 計測中の通常のログは出力しない
+        logger: Logger = self.log.getChild("gjgs")
+        logger.setLevel(logging.WARNING)
+        obj_of_cls: GetJapanGovernmentStatistics = GetJapanGovernmentStatistics(logger)
+        obj_of_cls.URL_OF_API = url_of_api
+        obj_of_cls.APP_ID = "benchmark"
+        # キャッシュ、流量制限、データセットへの保存は、計測の対象外
+        obj_of_cls.use_cache = False
+        obj_of_cls.use_store_of_tables = False
+        obj_of_cls.RATE_OF_REQUESTS = 0
+        obj_of_cls.folder_p_of_ids = folder_p / "__stats_data_ids__"
+        obj_of_cls.folder_s_of_ids = str(obj_of_cls.folder_p_of_ids)
+        obj_of_cls._resolve_generation_of_ids()
+        obj_of_cls.folder_p_of_table = folder_p / "__output__"
+        obj_of_cls.folder_s_of_table = str(obj_of_cls.folder_p_of_table)
+        obj_of_cls.folder_p_of_dataset = obj_of_cls.folder_p_of_table / "dataset"
+        obj_of_cls.folder_s_of_dataset = str(obj_of_cls.folder_p_of_dataset)
+        obj_of_cls.file_p_of_manifest = obj_of_cls.folder_p_of_dataset / "manifest.json"
+        obj_of_cls.folder_p_of_meta = folder_p / "__meta__"
+        obj_of_cls.folder_s_of_meta = str(obj_of_cls.folder_p_of_meta)
+        obj_of_cls.folder_p_of_cache = folder_p / "__cache__"
+        obj_of_cls.folder_s_of_cache = str(obj_of_cls.folder_p_of_cache)
+        return obj_of_cls
+
+    def _measure(self, target: str, condition: str, func: Callable[[], Any], pages: int | Callable[[], int], rows: int) -> dict:
+        """処理時間とRSSのピークを計測して、結果に追加します"""
+        with PeakRssSampler() as sampler:
+            start: float = time.perf_counter()
+            func()
+            elapsed: float = time.perf_counter() - start
+        # ページ数が取得件数の調整で決まる場合は、計測後に数える
+        if callable(pages):
+            pages = pages()
+        mib: int = 1024 * 1024
+        result: dict = {
+            "対象": target,
+            "条件": condition,
+            "ページ数": pages,
+            "件数": rows,
+            "秒": round(elapsed, 3),
+            "ページ/秒": round(pages / elapsed, 1) if elapsed > 0 else 0.0,
+            "件/秒": round(rows / elapsed) if elapsed > 0 else 0,
+            "ピークRSS(MiB)": round(sampler.peak_rss / mib, 1),
+            "増加(MiB)": round((sampler.peak_rss - sampler.rss_at_start) / mib, 1),
+        }
+        self.lst_of_result.append(result)
+        self.log.info(f"{target} ({condition}) => {result['秒']}秒")
+        return result
+
+    def bench_catalog_download(self, fake: FakeEStatServer, folder_p: Path) -> bool:
+        """統計表IDの一覧の取得を計測します"""
+        result: bool = False
+        try:
+            # 1ページあたりの件数は取得時間に応じて変わるため、疑似サーバーが受け付けたリクエストの数をページ数とする
+            names: tuple[str, ...] = ("getStatsList", "getSimpleStatsList")
+            for data_type in ("xml", "json", "csv"):
+                for get_type in ("非同期", "並行", "パイプライン"):
+                    obj_of_cls: GetJapanGovernmentStatistics = self._create_obj_of_cls(fake.url_of_api, folder_p / f"catalog_{data_type}_{get_type}")
+                    obj_of_cls.lst_of_data_type = [data_type, obj_of_cls.dct_of_data_type[data_type]]
+                    obj_of_cls.lst_of_get_type = [get_type, obj_of_cls.dct_of_get_type[get_type]]
+                    count_at_start: int = fake.get_count_of_requests(*names)
+                    try:
+                        self._measure(
+                            "統計表IDの一覧の取得",
+                            f"{data_type}, {get_type}",
+                            lambda: obj_of_cls.submit(obj_of_cls.write_stats_data_ids_to_file()).result(),
+                            lambda: fake.get_count_of_requests(*names) - count_at_start,
+                            self.NUMBER_OF_IDS,
+                        )
+                        # 速くても、件数が欠けていれば失敗とする
+                        height: int = obj_of_cls.scan_stats_data_ids().select(pl.len()).collect().item()
+                        if height != self.NUMBER_OF_IDS:
+                            raise Exception(f"統計表IDの一覧の件数が一致しません。 => {height}件")
+                    finally:
+                        obj_of_cls.close()
+        except Exception:
+            raise
+        else:
+            result = True
+        finally:
+            pass
+        return result
+
+    def bench_parsers(self, fake: FakeEStatServer, folder_p: Path) -> bool:
+        """統計表IDの一覧と指定の統計表の解析器を、通信を除いて計測します"""
+        result: bool = False
+        try:
+            obj_of_cls: GetJapanGovernmentStatistics = self._create_obj_of_cls(fake.url_of_api, folder_p / "parsers")
+            request: httpx.Request = httpx.Request("GET", fake.url_of_api)
+            # 統計表IDの一覧の解析器
+            limit: int = 100
+            params: dict = {"startPosition": 1, "limit": limit}
+            rows: int = min(limit, self.NUMBER_OF_IDS)
+            parser_map: dict = {"xml": obj_of_cls._parser_xml, "json": obj_of_cls._parser_json, "csv": obj_of_cls._parser_csv}
+            for data_type, parser in parser_map.items():
+                res: httpx.Response = httpx.Response(200, content=fake.build_stats_list(data_type, params), request=request)
+
+                def _parse_ids(parser: Any = parser, res: httpx.Response = res) -> None:
+                    for _ in range(self.REPEAT):
+                        parser(res)
+
+                self._measure("統計表IDの一覧の解析器", data_type, _parse_ids, self.REPEAT, rows * self.REPEAT)
+            # 指定の統計表の解析器(メタ情報は取得済みとする)
+            meta: dict = obj_of_cls._parse_meta(self.STATS_DATA_ID, httpx.Response(200, content=fake.build_meta_info({})).json())
+            mapping, id2name = obj_of_cls._get_mapping_of_meta(meta)
+            params = {"startPosition": 1, "limit": obj_of_cls.LIMIT_OF_TABLE, "metaGetFlg": "N"}
+            _, total = fake.get_rows_of_table(params)
+            rows = min(obj_of_cls.LIMIT_OF_TABLE, total)
+            for data_type in ("xml", "json", "csv"):
+                body: bytes = fake.build_stats_data(data_type, params)
+
+                def _parse_table(data_type: str = data_type, body: bytes = body) -> None:
+                    for _ in range(self.REPEAT):
+                        page_parser: StatsDataParser = obj_of_cls._get_parser_of_table(data_type, mapping, id2name)
+                        # 受信と同じように、分割して渡す
+                        for i in range(0, len(body), 65536):
+                            page_parser.feed(body[i : i + 65536])
+                        page_parser.close()
+                        page_parser.to_pl_df()
+
+                self._measure("指定の統計表の解析器", data_type, _parse_table, self.REPEAT, rows * self.REPEAT)
+            obj_of_cls.close()
+        except Exception:
+            raise
+        else:
+            result = True
+        finally:
+            pass
+        return result
+
+    def bench_table_download(self, fake: FakeEStatServer, folder_p: Path) -> bool:
+        """指定の統計表の取得を計測します"""
+        result: bool = False
+        try:
+            for data_type in ("xml", "json", "csv"):
+                obj_of_cls: GetJapanGovernmentStatistics = self._create_obj_of_cls(fake.url_of_api, folder_p / f"table_{data_type}")
+                obj_of_cls.lst_of_data_type = [data_type, obj_of_cls.dct_of_data_type[data_type]]
+                obj_of_cls.STATS_DATA_ID = self.STATS_DATA_ID
+                _, total = fake.get_rows_of_table({})
+                names: tuple[str, ...] = ("getStatsData", "getSimpleStatsData")
+                count_at_start: int = fake.get_count_of_requests(*names)
+                try:
+                    self._measure(
+                        "指定の統計表の取得",
+                        data_type,
+                        lambda: obj_of_cls.submit(obj_of_cls.get_table_from_api_with_async()).result(),
+                        lambda: fake.get_count_of_requests(*names) - count_at_start,
+                        total,
+                    )
+                    if obj_of_cls.pl_df is None or obj_of_cls.pl_df.height != total:
+                        raise Exception("指定の統計表の件数が一致しません。")
+                finally:
+                    obj_of_cls.close()
+        except Exception:
+            raise
+        else:
+            result = True
+        finally:
+            pass
+        return result
+
+    def bench_filter_pl_df(self, fake: FakeEStatServer, folder_p: Path) -> bool:
+        """polarsのデータフレームのフィルターを計測します"""
+        result: bool = False
+        try:
+            obj_of_cls: GetJapanGovernmentStatistics = self._create_obj_of_cls(fake.url_of_api, folder_p / "filter")
+            rows: list[tuple] = [fake._get_row_of_id(i) for i in range(1, self.NUMBER_OF_IDS + 1)]
+            pl_df: pl.DataFrame = pl.DataFrame(rows, schema=obj_of_cls.header_of_ids_l, orient="row")
+            lst_of_condition: list[tuple[str, str, list[str]]] = [
+                ("部分一致", "OR抽出", ["統計調査1", "人口"]),
+                ("部分一致", "AND抽出", ["統計調査1", "人口"]),
+                ("完全一致", "OR抽出", ["統計調査1", "統計調査2"]),
+            ]
+            for match_type, logic_type, keywords in lst_of_condition:
+                obj_of_cls.lst_of_match_type = [match_type, obj_of_cls.dct_of_match_type[match_type]]
+                obj_of_cls.lst_of_logic_type = [logic_type, obj_of_cls.dct_of_logic_type[logic_type]]
+                obj_of_cls.lst_of_keyword = keywords
+
+                def _filter() -> None:
+                    for _ in range(self.REPEAT):
+                        obj_of_cls.filter_pl_df(pl_df)
+
+                self._measure("filter_pl_df", f"{match_type}, {logic_type}", _filter, self.REPEAT, len(pl_df) * self.REPEAT)
+            obj_of_cls.close()
+        except Exception:
+            raise
+        else:
+            result = True
+        finally:
+            pass
+        return result
+
+    def run(self) -> list[dict]:
+        """全ての計測を実行します"""
+        self.lst_of_result = []
+        try:
+            fake: FakeEStatServer = FakeEStatServer(
+                number_of_ids=self.NUMBER_OF_IDS,
+                number_of_areas=self.NUMBER_OF_AREAS,
+                number_of_times=self.NUMBER_OF_TIMES,
+                latency=self.LATENCY,
+                latency_per_row=self.LATENCY_PER_ROW,
+            )
+            with fake, tempfile.TemporaryDirectory() as folder_s:
+                folder_p: Path = Path(folder_s)
+                self.bench_catalog_download(fake, folder_p)
+                self.bench_parsers(fake, folder_p)
+                self.bench_table_download(fake, folder_p)
+                self.bench_filter_pl_df(fake, folder_p)
+        except Exception:
+            raise
+        else:
+            pass
+        finally:
+            pass
+        return self.lst_of_result
+
+    def show_results(self) -> bool:
+        """計測結果を表示します"""
+        result: bool = False
+        try:
+            rows: list = [[r[h] for h in self.header_of_results] for r in self.lst_of_result]
+            self.log.info(tabulate(rows, headers=self.header_of_results, tablefmt="github"))
+            self.log.info(
+                f"統計表IDの一覧 => {self.NUMBER_OF_IDS}件, 指定の統計表 => 地域{self.NUMBER_OF_AREAS} x 時間軸{self.NUMBER_OF_TIMES}, "
+                f"遅延 => {self.LATENCY}秒 + {self.LATENCY_PER_ROW}秒/件, 繰り返し => {self.REPEAT}回"
+            )
+        except Exception:
+            raise
+        else:
+            result = True
+        finally:
+            pass
+        return result
+
+
+def main() -> bool:
+    """主要関数"""
+    result: bool = False
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description="疑似サーバーで、日本政府の統計データの取得の処理速度を計測します")
+    parser.add_argument("--ids", type=int, default=10000, help="統計表IDの一覧の総件数")
+    parser.add_argument("--areas", type=int, default=47, help="指定の統計表の地域の数")
+    parser.add_argument("--times", type=int, default=30, help="指定の統計表の時間軸の数")
+    parser.add_argument("--latency", type=float, default=0.0, help="疑似サーバーの応答の遅延(秒)")
+    parser.add_argument("--repeat", type=int, default=5, help="解析器とフィルターを繰り返す回数")
+    parser.add_argument("--latency-per-row", type=float, default=0.0, help="疑似サーバーの取得件数1件あたりの応答の遅延(秒)")
+    args: argparse.Namespace = parser.parse_args()
+    obj_of_lt: LogTools = LogTools()
+    obj_of_lt._setup_stream_handler()
+    try:
+        obj_of_bm: GJGS_Benchmark = GJGS_Benchmark(
+            obj_of_lt.logger, args.ids, args.areas, args.times, args.latency, args.repeat, args.latency_per_row
+        )
+        obj_of_bm.run()
+        obj_of_bm.show_results()
+    except KeyboardInterrupt:
+        sys.exit(0)
+    except Exception as e:
+        obj_of_lt.logger.critical(f"***処理が失敗しました。***: \n{str(e)}")
+    else:
+        result = True
+    finally:
+        pass
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,1033 @@
 import asyncio
 import csv
+import gzip
+import hashlib
+import importlib.util
 import io
 import json
+import math
+import os
+import random
 import re
 import shutil
 import sys
+import time
+import unicodedata
+import uuid
+import zlib
+from array import array
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from logging import Logger
 from pathlib import Path
-from threading import Event
-from typing import Any, AsyncGenerator, cast
+from threading import Event, Lock, Thread
+from typing import Any, AsyncGenerator, Callable, Coroutine, Generator, Iterator, cast
 from xml.etree import ElementTree
 
 import httpx
-import pandas as pd
 import polars as pl
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 from tabulate import tabulate
 
 from source.common.common import DatetimeTools
 
 
+class OperationCancelledError(Exception):
+    """処理がキャンセルされた場合の例外(失敗と区別するために使います)"""
+
+    def __init__(self, msg: str = "処理がキャンセルされました。"):
+        super().__init__(msg)
+
+
+class ResponseCache:
+    """e-StatのAPIのレスポンスをディスクにキャッシュするクラス"""
+
+    def __init__(self, folder_p: Path, ttl: int, max_bytes: int):
+        """初期化します"""
+        # キャッシュを格納するフォルダ
+        self.folder_p: Path = folder_p
+        # キャッシュの有効期間(秒)
+        self.ttl: int = ttl
+        # キャッシュの合計サイズの上限(バイト)
+        self.max_bytes: int = max_bytes
+        # キャッシュから除外するパラメータ
+        self.excluded_params: tuple = ("appId",)
+        # 応答の先頭の保持するバイト数(STATUSの確認用)
+        self.HEAD_SIZE: int = 8192
+        # 読み込みのチャンクサイズ
+        self.CHUNK_SIZE: int = 65536
+        self.lock: Lock = Lock()
+        self.folder_p.mkdir(parents=True, exist_ok=True)
+        # キャッシュの合計サイズ
+        self.total_bytes: int = sum(p.stat().st_size for p in self.folder_p.glob("*.bin"))
+
+    def get_key(self, request: httpx.Request) -> str:
+        """エンドポイントと正規化したパラメータからキーを取得します"""
+        params: list = sorted((k, v) for k, v in request.url.params.multi_items() if k not in self.excluded_params)
+        endpoint: str = str(request.url.copy_with(query=None))
+        text: str = json.dumps([request.method, endpoint, params], ensure_ascii=False)
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def load(self, key: str) -> dict | None:
+        """キャッシュのメタ情報を読み込みます"""
+        meta_p: Path = self.folder_p / f"{key}.json"
+        body_p: Path = self.folder_p / f"{key}.bin"
+        if not meta_p.exists() or not body_p.exists():
+            return None
+        try:
+            meta: dict = json.loads(meta_p.read_text(encoding="utf-8"))
+        except Exception:
+            # 壊れたキャッシュは使わない
+            return None
+        return meta
+
+    def is_fresh(self, meta: dict) -> bool:
+        """キャッシュが有効期間内かどうか判定します"""
+        return time.time() - meta.get("stored_at", 0.0) < self.ttl
+
+    def is_no_cache(self, request: httpx.Request) -> bool:
+        """有効期間内でも、サーバーに再検証するように要求されているかどうか判定します"""
+        return "no-cache" in request.headers.get("cache-control", "").lower()
+
+    def refresh(self, key: str, meta: dict) -> dict:
+        """再検証できたキャッシュの保存時刻を更新します"""
+        meta["stored_at"] = time.time()
+        self._write_meta(key, meta)
+        return meta
+
+    def build_response(self, key: str, meta: dict, request: httpx.Request) -> httpx.Response:
+        """キャッシュからレスポンスを作成します"""
+        body_p: Path = self.folder_p / f"{key}.bin"
+        # LRUのために、最終アクセス時刻を更新する
+        os.utime(body_p)
+        return httpx.Response(
+            status_code=meta["status"],
+            headers=meta["headers"],
+            stream=_FileByteStream(body_p, self.CHUNK_SIZE),
+            request=request,
+            extensions={"from_cache": True},
+        )
+
+    def wrap_response(self, key: str, response: httpx.Response, request: httpx.Request) -> httpx.Response:
+        """レスポンスの本体をディスクに書き出しながら返すように包みます"""
+        headers: list = [(k, v) for k, v in response.headers.multi_items() if k.lower() != "transfer-encoding"]
+        meta: dict = {
+            "status": response.status_code,
+            "headers": headers,
+            "etag": response.headers.get("etag", ""),
+            "last_modified": response.headers.get("last-modified", ""),
+            "content_encoding": response.headers.get("content-encoding", "").lower(),
+        }
+        stream: _TeeByteStream = _TeeByteStream(response.stream, self, key, meta)
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=stream,
+            request=request,
+            extensions=response.extensions,
+        )
+
+    def commit(self, key: str, tmp_p: Path, meta: dict, head: bytes) -> bool:
+        """書き出しが完了したキャッシュを確定します"""
+        result: bool = False
+        try:
+            if not self._is_cacheable(head, meta["content_encoding"]):
+                tmp_p.unlink(missing_ok=True)
+                return result
+            body_p: Path = self.folder_p / f"{key}.bin"
+            size: int = tmp_p.stat().st_size
+            with self.lock:
+                old_size: int = body_p.stat().st_size if body_p.exists() else 0
+                os.replace(tmp_p, body_p)
+                meta["stored_at"] = time.time()
+                meta["size"] = size
+                self._write_meta(key, meta)
+                self.total_bytes += size - old_size
+            self.evict()
+        except Exception:
+            tmp_p.unlink(missing_ok=True)
+        else:
+            result = True
+        finally:
+            pass
+        return result
+
+    def evict(self) -> bool:
+        """合計サイズが上限を超えた場合に、最後に使われてから最も長いキャッシュから削除します"""
+        result: bool = False
+        with self.lock:
+            if self.total_bytes <= self.max_bytes:
+                return result
+            bodies: list = sorted(self.folder_p.glob("*.bin"), key=lambda p: p.stat().st_mtime)
+            self.total_bytes = sum(p.stat().st_size for p in bodies)
+            for body_p in bodies:
+                if self.total_bytes <= self.max_bytes:
+                    break
+                size: int = body_p.stat().st_size
+                body_p.unlink(missing_ok=True)
+                body_p.with_suffix(".json").unlink(missing_ok=True)
+                self.total_bytes -= size
+                result = True
+        return result
+
+    def _write_meta(self, key: str, meta: dict) -> None:
+        """メタ情報を書き出します"""
+        meta_p: Path = self.folder_p / f"{key}.json"
+        tmp_p: Path = self.folder_p / f"{key}.{uuid.uuid4().hex}.json.tmp"
+        tmp_p.write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_p, meta_p)
+
+    def _is_cacheable(self, head: bytes, content_encoding: str) -> bool:
+        """e-StatのSTATUSが正常なレスポンスかどうか判定します"""
+        match content_encoding:
+            case "":
+                text: bytes = head
+            case "gzip" | "deflate":
+                # 先頭だけを展開する(gzipとzlibの両方に対応する)
+                text = zlib.decompressobj(wbits=47).decompress(head, self.HEAD_SIZE)
+            case _:
+                return False
+        # XML、JSON、CSV(見出し行の次の行)のいずれかのSTATUS
+        m: re.Match | None = re.search(rb'<STATUS>(\d+)|"STATUS"\s*:\s*"?(\d+)|"STATUS"[^\n]*\n"?(\d+)', text)
+        if m is None:
+            return False
+        # 0: 正常終了、1: 該当データなし、2: 一部に誤り
+        return int(next(g for g in m.groups() if g is not None)) < 100
+
+
+class _FileByteStream(httpx.SyncByteStream, httpx.AsyncByteStream):
+    """キャッシュのファイルを読み込むストリーム"""
+
+    def __init__(self, file_p: Path, chunk_size: int):
+        self.file_p: Path = file_p
+        self.chunk_size: int = chunk_size
+
+    def __iter__(self):
+        with self.file_p.open("rb") as f:
+            while chunk := f.read(self.chunk_size):
+                yield chunk
+
+    async def __aiter__(self):
+        for chunk in self:
+            yield chunk
+
+
+class _TeeByteStream(httpx.SyncByteStream, httpx.AsyncByteStream):
+    """レスポンスの本体を返しながら、キャッシュのファイルに書き出すストリーム"""
+
+    def __init__(self, stream: Any, cache: ResponseCache, key: str, meta: dict):
+        self.stream: Any = stream
+        self.cache: ResponseCache = cache
+        self.key: str = key
+        self.meta: dict = meta
+        self.tmp_p: Path = cache.folder_p / f"{key}.{uuid.uuid4().hex}.tmp"
+        self.head: bytearray = bytearray()
+        self.completed: bool = False
+
+    def _write(self, f: Any, chunk: bytes) -> None:
+        """チャンクを書き出します"""
+        f.write(chunk)
+        if len(self.head) < self.cache.HEAD_SIZE:
+            self.head.extend(chunk[: self.cache.HEAD_SIZE - len(self.head)])
+
+    def __iter__(self):
+        with self.tmp_p.open("wb") as f:
+            for chunk in self.stream:
+                self._write(f, chunk)
+                yield chunk
+        self.completed = True
+
+    async def __aiter__(self):
+        with self.tmp_p.open("wb") as f:
+            async for chunk in self.stream:
+                self._write(f, chunk)
+                yield chunk
+        self.completed = True
+
+    def _finish(self) -> None:
+        """最後まで読み込めた場合だけ、キャッシュを確定します"""
+        if self.completed:
+            self.cache.commit(self.key, self.tmp_p, self.meta, bytes(self.head))
+        else:
+            self.tmp_p.unlink(missing_ok=True)
+
+    def close(self) -> None:
+        try:
+            self.stream.close()
+        finally:
+            self._finish()
+
+    async def aclose(self) -> None:
+        try:
+            await self.stream.aclose()
+        finally:
+            self._finish()
+
+
+class CachedTransport(httpx.BaseTransport):
+    """キャッシュを使う同期版のトランスポート"""
+
+    def __init__(self, cache: ResponseCache, transport: httpx.BaseTransport):
+        self.cache: ResponseCache = cache
+        self.transport: httpx.BaseTransport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method != "GET":
+            return self.transport.handle_request(request)
+        key: str = self.cache.get_key(request)
+        meta: dict | None = self.cache.load(key)
+        if meta is not None and self.cache.is_fresh(meta) and not self.cache.is_no_cache(request):
+            return self.cache.build_response(key, meta, request)
+        if meta is not None:
+            # 条件付きリクエストで再検証する
+            if meta.get("etag"):
+                request.headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                request.headers["If-Modified-Since"] = meta["last_modified"]
+        response: httpx.Response = self.transport.handle_request(request)
+        if response.status_code == 304 and meta is not None:
+            response.close()
+            return self.cache.build_response(key, self.cache.refresh(key, meta), request)
+        if response.status_code != 200:
+            return response
+        return self.cache.wrap_response(key, response, request)
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+class AsyncCachedTransport(httpx.AsyncBaseTransport):
+    """キャッシュを使う非同期版のトランスポート"""
+
+    def __init__(self, cache: ResponseCache, transport: httpx.AsyncBaseTransport):
+        self.cache: ResponseCache = cache
+        self.transport: httpx.AsyncBaseTransport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method != "GET":
+            return await self.transport.handle_async_request(request)
+        key: str = self.cache.get_key(request)
+        meta: dict | None = self.cache.load(key)
+        if meta is not None and self.cache.is_fresh(meta) and not self.cache.is_no_cache(request):
+            return self.cache.build_response(key, meta, request)
+        if meta is not None:
+            # 条件付きリクエストで再検証する
+            if meta.get("etag"):
+                request.headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                request.headers["If-Modified-Since"] = meta["last_modified"]
+        response: httpx.Response = await self.transport.handle_async_request(request)
+        if response.status_code == 304 and meta is not None:
+            await response.aclose()
+            return self.cache.build_response(key, self.cache.refresh(key, meta), request)
+        if response.status_code != 200:
+            return response
+        return self.cache.wrap_response(key, response, request)
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+class RateLimiter:
+    """トークンバケットでリクエストの頻度を制限するクラス(スレッドとイベントループで共有します)"""
+
+    def __init__(self, rate: float, burst: int):
+        # 1秒あたりに補充するトークンの数(0以下の場合は、制限しない)
+        self.rate: float = rate
+        # バケットに貯められるトークンの数
+        self.burst: int = max(1, burst)
+        self.tokens: float = float(self.burst)
+        self.updated_at: float = time.monotonic()
+        self.lock: Lock = Lock()
+
+    def reserve(self) -> float:
+        """トークンを1つ予約して、待つ時間(秒)を返します"""
+        if self.rate <= 0:
+            return 0.0
+        with self.lock:
+            now: float = time.monotonic()
+            self.tokens = min(float(self.burst), self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            # 足りない分は前借りして、補充されるまで待つ
+            self.tokens -= 1.0
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def acquire(self) -> None:
+        """トークンを取得するまで待ちます"""
+        delay: float = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self) -> None:
+        """トークンを取得するまで待ちます(非同期版)"""
+        delay: float = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class RateLimitedTransport(httpx.BaseTransport):
+    """リクエストの頻度を制限する同期版のトランスポート"""
+
+    def __init__(self, limiter: RateLimiter, transport: httpx.BaseTransport):
+        self.limiter: RateLimiter = limiter
+        self.transport: httpx.BaseTransport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        self.limiter.acquire()
+        return self.transport.handle_request(request)
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+class AsyncRateLimitedTransport(httpx.AsyncBaseTransport):
+    """リクエストの頻度を制限する非同期版のトランスポート"""
+
+    def __init__(self, limiter: RateLimiter, transport: httpx.AsyncBaseTransport):
+        self.limiter: RateLimiter = limiter
+        self.transport: httpx.AsyncBaseTransport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await self.limiter.acquire_async()
+        return await self.transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+class AdaptivePageSize:
+    """ページの取得時間と大きさに応じて、1ページあたりの取得件数を調整するクラス"""
+
+    def __init__(self, initial: int, minimum: int, maximum: int, target_latency: float, max_bytes: int):
+        # 取得件数の下限と上限
+        self.minimum: int = max(1, minimum)
+        self.maximum: int = max(self.minimum, maximum)
+        # 次のページの取得件数
+        self.size: int = min(self.maximum, max(self.minimum, initial))
+        # 1ページの取得時間(秒)とバイト数の目安
+        self.target_latency: float = target_latency
+        self.max_bytes: int = max_bytes
+
+    def shrink(self) -> int:
+        """取得件数を半分にします"""
+        self.size = max(self.minimum, self.size // 2)
+        return self.size
+
+    def grow(self) -> int:
+        """取得件数を2倍にします"""
+        self.size = min(self.maximum, self.size * 2)
+        return self.size
+
+    def cap(self, size: int) -> int:
+        """取得件数を指定の件数以下にします"""
+        self.size = min(self.size, max(self.minimum, size))
+        return self.size
+
+    def update(self, limit: int, rows: int, latency: float, size_of_bytes: int) -> int:
+        """取得したページの件数、取得時間、バイト数から、次のページの取得件数を決めます"""
+        # 同時に取得したページは、取得した時点の取得件数を基準にする(同じ大きさのページで何度も小さくしない)
+        if latency > self.target_latency or size_of_bytes > self.max_bytes:
+            # 遅い、もしくは大きすぎる場合は、小さくする
+            self.size = min(self.size, max(self.minimum, limit // 2))
+        elif limit >= self.size and rows >= limit and latency < self.target_latency / 2 and size_of_bytes < self.max_bytes / 2:
+            # 満杯のページが十分に速く、小さい場合は、大きくする
+            self.grow()
+        return self.size
+
+
+class NgramIndex:
+    """統計表IDの一覧の統計名と表題のN-gramの転置インデックスのクラス"""
+
+    def __init__(self):
+        """初期化します"""
+        # インデックスの形式のバージョン
+        self.VERSION: int = 2
+        # 行番号の配列の型
+        self.TYPECODE: str = "I"
+        # 統計表ID、統計名、表題の行
+        self.rows: list[tuple] = []
+        # 正規化した検索対象の文字列
+        self.texts: list[str] = []
+        # 統計表IDと行番号の対応表
+        self.positions: dict[str, int] = {}
+        # N-gramと行番号の配列の対応表
+        self.postings: dict[str, array] = {}
+
+    def _normalize(self, text: str) -> str:
+        """全角と半角、大文字と小文字を揃えます"""
+        return unicodedata.normalize("NFKC", text).lower()
+
+    def _get_grams(self, text: str) -> set[str]:
+        """1文字と2文字のN-gramを取得します"""
+        grams: set[str] = set(text)
+        grams.update(text[i : i + 2] for i in range(len(text) - 1))
+        return grams
+
+    def _set_row(self, stat_id: str, stat_name: str, title: str) -> tuple[int, str]:
+        """行を追加、もしくは更新して、行番号と検索対象の文字列を返します"""
+        # 統計名と表題をまたぐN-gramを作らないように、改行で区切る
+        text: str = self._normalize(f"{stat_name}\n{title}")
+        position: int | None = self.positions.get(stat_id)
+        if position is None:
+            position = len(self.rows)
+            self.positions[stat_id] = position
+            self.rows.append((stat_id, stat_name, title))
+            self.texts.append(text)
+        else:
+            # 古いN-gramは検索時の照合で除外される
+            self.rows[position] = (stat_id, stat_name, title)
+            self.texts[position] = text
+        return position, text
+
+    def get_digest(self) -> str:
+        """インデックスの行のハッシュ値を取得します(統計表IDの一覧と対応しているかどうかの照合に使います)"""
+        h: Any = hashlib.sha256()
+        for row in self.rows:
+            h.update("\x1f".join(map(str, row)).encode("utf-8"))
+            h.update(b"\n")
+        return h.hexdigest()
+
+    def add_rows(self, rows: list[tuple]) -> int:
+        """行をインデックスに追加します(同じ統計表IDの行は更新します)"""
+        count: int = 0
+        for stat_id, stat_name, title in rows:
+            position, text = self._set_row(stat_id, stat_name, title)
+            for gram in self._get_grams(text):
+                posting: array | None = self.postings.get(gram)
+                if posting is None:
+                    posting = array(self.TYPECODE)
+                    self.postings[gram] = posting
+                if not posting or posting[-1] != position:
+                    posting.append(position)
+            count += 1
+        return count
+
+    def _search_keyword(self, keyword: str) -> set[int]:
+        """1つのキーワードを含む行番号を検索します"""
+        text: str = self._normalize(keyword)
+        if not text:
+            return set(range(len(self.rows)))
+        grams: list[str] = [text] if len(text) == 1 else [text[i : i + 2] for i in range(len(text) - 1)]
+        postings: list = []
+        for gram in set(grams):
+            posting: array | None = self.postings.get(gram)
+            if posting is None:
+                return set()
+            postings.append(posting)
+        # 件数が少ない順に積集合をとる
+        postings.sort(key=len)
+        candidates: set[int] = set(postings[0])
+        for posting in postings[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                break
+        # N-gramの一致だけでは誤りがあるため、文字列で照合する
+        return {p for p in candidates if text in self.texts[p]}
+
+    def search(self, keywords: list[str], logic_type: str) -> list[tuple]:
+        """部分一致でOR抽出、もしくはAND抽出をします"""
+        result: set[int] = set()
+        for i, keyword in enumerate(keywords):
+            found: set[int] = self._search_keyword(keyword)
+            if logic_type == "AND抽出":
+                result = found if i == 0 else result & found
+                if not result:
+                    break
+            else:
+                result |= found
+        return [self.rows[p] for p in sorted(result)]
+
+    def save(self, file_p: Path) -> bool:
+        """インデックスをParquetファイルに書き出します(行は統計表IDの一覧から読み込むため、ハッシュ値だけを保存します)"""
+        result: bool = False
+        tmp_p: Path = file_p.with_name(f"{file_p.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            # 全てのN-gramの行番号を1つの配列につなげて、区切りの位置で分ける
+            values: array = array(self.TYPECODE)
+            offsets: array = array("i", [0])
+            for posting in self.postings.values():
+                values.extend(posting)
+                offsets.append(len(values))
+            positions: pa.ListArray = pa.ListArray.from_arrays(
+                pa.Array.from_buffers(pa.int32(), len(offsets), [None, pa.py_buffer(offsets)]),
+                pa.Array.from_buffers(pa.uint32(), len(values), [None, pa.py_buffer(values)]),
+            )
+            metadata: dict = {"version": str(self.VERSION), "number_of_rows": str(len(self.rows)), "digest": self.get_digest()}
+            table: pa.Table = pa.table({"gram": pa.array(list(self.postings), pa.string()), "positions": positions}).replace_schema_metadata(metadata)
+            pq.write_table(table, tmp_p, compression="zstd")
+            os.replace(tmp_p, file_p)
+        except Exception:
+            tmp_p.unlink(missing_ok=True)
+            raise
+        else:
+            result = True
+        finally:
+            pass
+        return result
+
+    def load(self, file_p: Path, rows: list[tuple]) -> bool:
+        """インデックスをParquetファイルから読み込みます(統計表IDの一覧の行と照合して、異なる場合は例外を送出します)"""
+        result: bool = False
+        try:
+            for stat_id, stat_name, title in rows:
+                self._set_row(stat_id, stat_name, title)
+            table: pa.Table = pq.read_table(file_p)
+            metadata: dict = {k.decode(): v.decode() for k, v in (table.schema.metadata or {}).items()}
+            if metadata.get("version") != str(self.VERSION):
+                raise Exception("インデックスの形式が異なります。")
+            # 共有のフォルダで書き換えられたインデックスや、別の世代のインデックスは使わない
+            if metadata.get("number_of_rows") != str(len(self.rows)) or metadata.get("digest") != self.get_digest():
+                raise Exception("インデックスが統計表IDの一覧と一致しません。")
+            if table.schema.field("gram").type != pa.string() or table.schema.field("positions").type != pa.list_(pa.uint32()):
+                raise Exception("インデックスの列の型が異なります。")
+            grams: list[str] = table.column("gram").to_pylist()
+            positions: Any = table.column("positions").combine_chunks()
+            values: Any = positions.flatten()
+            if len(values) and pc.max(values).as_py() >= len(self.rows):
+                raise Exception("インデックスの行番号が範囲外です。")
+            offsets: list[int] = positions.offsets.to_pylist()
+            # 行番号の配列(4バイトの符号なし整数)を、コピーせずに区切る
+            data: memoryview = memoryview(values.buffers()[1]).cast("B")[values.offset * 4 :]
+            for i, gram in enumerate(grams):
+                posting: array = array(self.TYPECODE)
+                posting.frombytes(data[(offsets[i] - offsets[0]) * 4 : (offsets[i + 1] - offsets[0]) * 4])
+                self.postings[gram] = posting
+        except Exception:
+            raise
+        else:
+            result = True
+        finally:
+            pass
+        return result
+
+
+class StatsDataParser:
+    """getStatsDataの1ページを解析して、列ごとのバッファに格納するクラス"""
+
+    def __init__(self, mapping: dict, id2name: dict):
+        """初期化します"""
+        # CLASS_OBJからコードと名称のマッピング(ページ間で共有する)
+        self.mapping: dict = mapping
+        # 列名を日本語に変換する辞書(ページ間で共有する)
+        self.id2name: dict = id2name
+        # 列ごとのバッファ
+        self.columns: dict[str, list] = {}
+        # 行数
+        self.count: int = 0
+        # 次のページの開始位置
+        self.next_key: str = ""
+        # 受信したバイト列(まとめて解析する形式の場合)
+        self.body: bytearray = bytearray()
+        # CLASS_OBJにないが、カテゴリ型にする列
+        self.tpl_of_category_cols: tuple = ("unit", "単位")
+
+    def feed(self, chunk: bytes) -> None:
+        """受信したバイト列を追加します"""
+        self.body.extend(chunk)
+
+    def close(self) -> None:
+        """解析を終了します"""
+        pass
+
+    def _append_row(self, row: dict) -> None:
+        """1行を列ごとのバッファに追加します"""
+        n: int = self.count
+        for key, value in row.items():
+            col: list | None = self.columns.get(key)
+            if col is None:
+                # 途中から現れた列は、それまでの行を欠損値で埋める
+                col = [None] * n
+                self.columns[key] = col
+            col.append(value)
+        self.count = n + 1
+        # 値がなかった列は、欠損値で埋める
+        for col in self.columns.values():
+            if len(col) == n:
+                col.append(None)
+
+    def to_pl_df(self) -> pl.DataFrame:
+        """列ごとのバッファからデータフレームを作成します"""
+        pl_df: pl.DataFrame = pl.DataFrame(self.columns, schema={k: pl.String for k in self.columns})
+        # 分類事項の列は、行ごとに名称の文字列を持たずに、CLASS_OBJのコード表からカテゴリ型の列を作成する
+        exprs: list[pl.Expr] = []
+        for key in self.columns:
+            code_map: dict | None = self.mapping.get(key)
+            if code_map is not None:
+                # コード表にないコードは、コードのまま残す
+                exprs.append(pl.col(key).replace_strict(code_map, default=pl.col(key), return_dtype=pl.Categorical))
+            elif key in self.tpl_of_category_cols:
+                exprs.append(pl.col(key).cast(pl.Categorical))
+        if exprs:
+            pl_df = pl_df.with_columns(exprs)
+        # 列名を日本語に変換する
+        pl_df = pl_df.rename({k: v for k, v in self.id2name.items() if k in self.columns and k != v})
+        return self._convert_values(pl_df)
+
+    def _convert_values(self, pl_df: pl.DataFrame) -> pl.DataFrame:
+        """値列を、値を変えずに持てる最も小さい数値型に変換します(ページごとに決めて、結合する時に揃えます)"""
+        if "値" not in pl_df.columns:
+            return pl_df
+        text: pl.Series = pl_df.get_column("値").str.strip_chars()
+        values: pl.Series = text.cast(pl.Float64, strict=False)
+        dtype: pl.DataType = pl.Float64()
+        if bool((values == values.round(0)).all()) and bool((values.abs() < 2**31).all()):
+            # 全て整数で、32ビットに収まる場合は、整数型にする
+            dtype = pl.Int32()
+        else:
+            # 元の文字列の小数点以下の桁数まで変わらない場合は、32ビットの浮動小数点数型にする
+            decimals: int = int(text.str.extract(r"\.(\d+)$").str.len_chars().max() or 0)
+            if bool((values.cast(pl.Float32).cast(pl.Float64).round(decimals) == values.round(decimals)).all()):
+                dtype = pl.Float32()
+        return pl_df.with_columns(values.cast(dtype).alias("値"))
+
+
+class StatsDataXmlParser(StatsDataParser):
+    """getStatsDataのXMLを逐次解析して、列ごとのバッファに格納するクラス"""
+
+    def __init__(self, mapping: dict, id2name: dict):
+        """初期化します"""
+        super().__init__(mapping, id2name)
+        self.parser: ElementTree.XMLPullParser = ElementTree.XMLPullParser(events=("start", "end"))
+        # VALUEの親要素
+        self.data_inf: ElementTree.Element | None = None
+
+    def feed(self, chunk: bytes) -> None:
+        """受信したバイト列を解析します"""
+        self.parser.feed(chunk)
+        self._read_events()
+
+    def close(self) -> None:
+        """解析を終了します"""
+        self.parser.close()
+        self._read_events()
+
+    def _read_events(self) -> None:
+        """解析済みの要素を処理して、不要になった要素を削除します"""
+        for event, elem in self.parser.read_events():
+            if event == "start":
+                if elem.tag == "DATA_INF":
+                    self.data_inf = elem
+                continue
+            match elem.tag:
+                case "VALUE":
+                    self._append_value(elem)
+                    # 処理済みのVALUEを木から外す
+                    if self.data_inf is not None:
+                        self.data_inf.clear()
+                case "CLASS_OBJ":
+                    obj_id: str = elem.attrib["id"]
+                    if obj_id not in self.mapping:
+                        # codeをキー、nameを値とする辞書を作成する
+                        self.mapping[obj_id] = {cls.attrib["code"]: cls.attrib.get("name", cls.attrib["code"]) for cls in elem.iter("CLASS")}
+                        self.id2name[obj_id] = elem.attrib.get("name", obj_id)
+                    elem.clear()
+                case "NEXT_KEY":
+                    self.next_key = (elem.text or "").strip()
+
+    def _append_value(self, elem: ElementTree.Element) -> None:
+        """VALUEの属性とテキストを列ごとのバッファに追加します(名称への変換は、列ごとにまとめて行います)"""
+        row: dict = dict(elem.attrib)
+        row["値"] = elem.text
+        self._append_row(row)
+
+
+class StatsDataJsonParser(StatsDataParser):
+    """getStatsDataのJSONを解析して、列ごとのバッファに格納するクラス"""
+
+    def close(self) -> None:
+        """受信したJSONを解析します"""
+        data: Any = json.loads(self.body)
+        self.body = bytearray()
+        statistical_data: Any = data["GET_STATS_DATA"]["STATISTICAL_DATA"]
+        if "CLASS_INF" in statistical_data:
+            # CLASS_OBJを抽出する
+            class_inf: Any = statistical_data["CLASS_INF"]["CLASS_OBJ"]
+            class_inf = [class_inf] if isinstance(class_inf, dict) else class_inf
+            for obj in class_inf:
+                obj_id: str = obj["@id"]
+                if obj_id in self.mapping:
+                    continue
+                cls: Any = obj["CLASS"]
+                cls = [cls] if isinstance(cls, dict) else cls
+                self.mapping[obj_id] = {c["@code"]: c.get("@name", c["@code"]) for c in cls}
+                self.id2name[obj_id] = obj.get("@name", obj_id)
+        # VALUEを抽出する
+        values: Any = (statistical_data.get("DATA_INF") or {}).get("VALUE", [])
+        values = [values] if isinstance(values, dict) else values
+        for value in values:
+            row: dict = {}
+            for k, v in value.items():
+                if k == "$":
+                    row["値"] = v if v is None else str(v)
+                    continue
+                # 名称への変換は、列ごとにまとめて行う
+                row[k[1:] if k.startswith("@") else k] = v
+            self._append_row(row)
+        # 次のページの開始位置
+        self.next_key = str(statistical_data.get("RESULT_INF", {}).get("NEXT_KEY", "") or "")
+
+
+class StatsDataCsvParser(StatsDataParser):
+    """getSimpleStatsDataのCSVを解析するクラス"""
+
+    def __init__(self, mapping: dict, id2name: dict):
+        """初期化します"""
+        super().__init__(mapping, id2name)
+        # 解析したデータフレーム
+        self.pl_df: pl.DataFrame = pl.DataFrame()
+
+    @staticmethod
+    def get_offset_of_section(data: bytes, name: str) -> int:
+        """セクション名の行の次の行の先頭の位置を取得します(ない場合は-1)"""
+        m: re.Match | None = re.search(rb'^"?' + re.escape(name.encode("utf-8")) + rb'"?\r?$', data, re.MULTILINE)
+        if m is None:
+            return -1
+        end: int = data.find(b"\n", m.end())
+        return len(data) if end < 0 else end + 1
+
+    @staticmethod
+    def get_value_of_header(head: bytes, key: str) -> str:
+        """見出し行と値の行の組から、指定の項目の値を取得します"""
+        rows: list[list[str]] = list(csv.reader(io.StringIO(head.decode("utf-8"))))
+        for cols, values in zip(rows, rows[1:]):
+            if key in cols:
+                return dict(zip(cols, values)).get(key, "")
+        return ""
+
+    def close(self) -> None:
+        """受信したCSVを解析します"""
+        data: bytes = bytes(self.body)
+        self.body = bytearray()
+        # 行に分割せずに、VALUE行の位置をバイト列から検索する
+        offset: int = self.get_offset_of_section(data, "VALUE")
+        if offset < 0:
+            raise Exception("CSVに 'VALUE' 行が見つかりませんでした。")
+        # VALUE行より前の部分だけを文字列にする
+        self.next_key = self.get_value_of_header(data[:offset], "NEXT_KEY")
+        # 見出し行からの残りをそのままCSVの読み込みに渡す
+        buffer: io.BytesIO = io.BytesIO(data)
+        buffer.seek(offset)
+        pl_df: pl.DataFrame = pl.read_csv(buffer, infer_schema=False)
+        header_cols: list[str] = pl_df.columns
+        # 列名を日本語に置換し、不要な英語コード列を削除する
+        rename_map: dict = {}
+        drop_cols: list = []
+        # 分類事項の名称の列
+        category_cols: list = []
+        # コード表から名称に変換する列
+        exprs: list[pl.Expr] = []
+        i: int = 0
+        while i < len(header_cols):
+            eng: str = header_cols[i]
+            if eng.endswith("_code"):
+                key: str = eng.removesuffix("_code")
+                # メタ情報を取得しない場合は、名称の列がない
+                has_name: bool = i + 1 < len(header_cols) and not header_cols[i + 1].endswith("_code") and header_cols[i + 1] not in ("unit", "value")
+                code_map: dict | None = self.mapping.get(key)
+                if has_name:
+                    # 英語コード列は削除する
+                    drop_cols.append(eng)
+                    category_cols.append(header_cols[i + 1])
+                    i += 2
+                    continue
+                elif code_map is not None:
+                    # コード表から名称のカテゴリ型の列を作成する
+                    exprs.append(pl.col(eng).replace_strict(code_map, default=pl.col(eng), return_dtype=pl.Categorical))
+                    rename_map[eng] = self.id2name.get(key, key)
+                else:
+                    category_cols.append(eng)
+                    rename_map[eng] = key
+            # 単独列を処理する
+            elif eng == "unit":
+                rename_map[eng] = "単位"
+                category_cols.append(eng)
+            elif eng == "value":
+                rename_map[eng] = "値"
+            i += 1
+        # 分類事項の列は、カテゴリ型にする
+        exprs.append(pl.col(category_cols).cast(pl.Categorical))
+        pl_df = pl_df.drop(drop_cols).with_columns(exprs).rename(rename_map)
+        self.pl_df = self._convert_values(pl_df)
+        self.count = len(pl_df)
+
+    def to_pl_df(self) -> pl.DataFrame:
+        """解析したデータフレームを返します"""
+        return self.pl_df
+
+
+class TableFileWriter:
+    """統計表をページごとにファイルへ追記して、完了したら確定するクラス"""
+
+    def __init__(self, file_p: Path, output_type: str, schema_of_meta: pl.Schema | None = None):
+        """初期化します"""
+        # 出力するファイル
+        self.file_p: Path = file_p
+        # 出力形式
+        self.output_type: str = output_type
+        # メタ情報から分かる列と型(最初のページにない列も、ファイルの列に含める)
+        self.schema_of_meta: pl.Schema | None = schema_of_meta
+        # 書き出し中の一時ファイル
+        self.tmp_p: Path = file_p.with_name(f"{file_p.name}.{uuid.uuid4().hex}.tmp")
+        # ファイルの列と型(最初のページとメタ情報から決めて、以降のページを揃える)
+        self.schema: pl.Schema | None = None
+        # 出力先
+        self.sink: Any = None
+        self.writer: Any = None
+        # Arrow IPCのファイルのスキーマ
+        self.arrow_schema: pa.Schema | None = None
+        # 書き出した行数
+        self.count: int = 0
+
+    def _open(self, pl_df: pl.DataFrame) -> None:
+        """最初のページとメタ情報の列と型で、ファイルを開きます"""
+        if self.schema_of_meta is not None:
+            # 最初のページにない列は、欠損値の列として後ろに追加する
+            pl_df = pl_df.with_columns([pl.lit(None, dtype=dtype).alias(c) for c, dtype in self.schema_of_meta.items() if c not in pl_df.columns])
+            # 最初のページの型ではなく、メタ情報の型にする(ページごとに型が異なる場合も、後のページの値を変えない)
+            pl_df = pl_df.with_columns([pl.col(c).cast(dtype) for c, dtype in self.schema_of_meta.items() if c in pl_df.columns])
+        self.schema = pl_df.schema
+        match self.output_type:
+            case "csv":
+                self.sink = self.tmp_p.open("wb")
+            case "csv.gz":
+                self.sink = gzip.open(self.tmp_p, "wb")
+            case "parquet":
+                self.writer = pq.ParquetWriter(self.tmp_p, pl_df.to_arrow().schema, compression="zstd")
+            case "feather":
+                # Arrow IPCのファイルは、ページごとに異なる辞書を持てないため、カテゴリ型の列は文字列にする
+                arrow_schema: pa.Schema = pl_df.to_arrow().schema
+                for i, field in enumerate(arrow_schema):
+                    if pa.types.is_dictionary(field.type):
+                        arrow_schema = arrow_schema.set(i, field.with_type(field.type.value_type))
+                self.arrow_schema = arrow_schema
+                self.sink = pa.OSFile(str(self.tmp_p), "wb")
+                self.writer = pa.ipc.new_file(self.sink, arrow_schema, options=pa.ipc.IpcWriteOptions(compression="zstd"))
+            case _:
+                raise Exception("その出力形式は対応していません。")
+        if self.sink is not None and self.writer is None:
+            # CSVの見出しは、最初に1回だけ書き出す
+            pl_df.head(0).write_csv(self.sink)
+
+    def _align(self, pl_df: pl.DataFrame) -> pl.DataFrame:
+        """ファイルと列の順番と型を揃えます(ない列は欠損値で埋めます)"""
+        schema: pl.Schema = cast(pl.Schema, self.schema)
+        if pl_df.schema == schema:
+            return pl_df
+        # 書き出し済みのファイルに列は追加できないため、黙って捨てずに中止する
+        lst_of_extra_col: list[str] = [c for c in pl_df.columns if c not in schema]
+        if lst_of_extra_col:
+            raise Exception(f"ファイルにない列が、途中のページにあります。 => {', '.join(lst_of_extra_col)}")
+        return pl_df.select([(pl.col(c) if c in pl_df.columns else pl.lit(None)).cast(dtype).alias(c) for c, dtype in schema.items()])
+
+    def write(self, pl_df: pl.DataFrame) -> int:
+        """1ページを追記します"""
+        if self.schema is None:
+            self._open(pl_df)
+        pl_df = self._align(pl_df)
+        match self.output_type:
+            case "csv" | "csv.gz":
+                pl_df.write_csv(self.sink, include_header=False)
+            case "parquet":
+                self.writer.write_table(pl_df.to_arrow())
+            case "feather":
+                self.writer.write_table(pl_df.to_arrow().cast(self.arrow_schema))
+        self.count += pl_df.height
+        return pl_df.height
+
+    def close(self) -> None:
+        """書き出しを完了して、ファイルを確定します(ページがなく、メタ情報の列もない場合は、ファイルを作りません)"""
+        if self.schema is None:
+            if self.schema_of_meta is None:
+                self.abort()
+                return
+            # ページがない場合は、メタ情報の列だけのファイルを作る
+            self._open(pl.DataFrame(schema=self.schema_of_meta))
+        if self.writer is not None:
+            self.writer.close()
+        if self.sink is not None:
+            self.sink.close()
+        os.replace(self.tmp_p, self.file_p)
+
+    def abort(self) -> None:
+        """書き出しを中止して、一時ファイルを削除します"""
+        for obj in (self.writer, self.sink):
+            try:
+                if obj is not None:
+                    obj.close()
+            except Exception:
+                pass
+        self.tmp_p.unlink(missing_ok=True)
+
+
+class TableLruCache:
+    """取得した統計表を、件数と大きさの上限までメモリに保持するクラス(古く使ったものから削除します)"""
+
+    def __init__(self, max_tables: int, max_bytes: int):
+        """初期化します"""
+        # 保持する統計表の数の上限
+        self.max_tables: int = max_tables
+        # 保持する統計表の合計サイズの上限(バイト)
+        self.max_bytes: int = max_bytes
+        self.dct_of_pl_df: OrderedDict[tuple, pl.DataFrame] = OrderedDict()
+        # データセットに保存済みの統計表のキー
+        self.set_of_stored: set[tuple] = set()
+        # 画面のスレッドとイベントループのスレッドから使う
+        self.lock: Lock = Lock()
+        self.total_bytes: int = 0
+
+    def get(self, key: tuple) -> pl.DataFrame | None:
+        """統計表を取得して、最近使ったものにします"""
+        with self.lock:
+            pl_df: pl.DataFrame | None = self.dct_of_pl_df.get(key)
+            if pl_df is not None:
+                self.dct_of_pl_df.move_to_end(key)
+            return pl_df
+
+    def put(self, key: tuple, pl_df: pl.DataFrame) -> None:
+        """統計表を追加して、上限を超えた分を古く使ったものから削除します"""
+        size: int = int(pl_df.estimated_size())
+        with self.lock:
+            old_pl_df: pl.DataFrame | None = self.dct_of_pl_df.pop(key, None)
+            self.set_of_stored.discard(key)
+            if old_pl_df is not None:
+                self.total_bytes -= int(old_pl_df.estimated_size())
+            # 1つで上限を超える統計表は、保持しない
+            if size > self.max_bytes:
+                return
+            self.dct_of_pl_df[key] = pl_df
+            self.total_bytes += size
+            while len(self.dct_of_pl_df) > self.max_tables or self.total_bytes > self.max_bytes:
+                evicted_key, evicted_pl_df = self.dct_of_pl_df.popitem(last=False)
+                self.set_of_stored.discard(evicted_key)
+                self.total_bytes -= int(evicted_pl_df.estimated_size())
+
+    def mark_stored(self, key: tuple) -> None:
+        """統計表をデータセットに保存済みにします(保持している場合だけ)"""
+        with self.lock:
+            if key in self.dct_of_pl_df:
+                self.set_of_stored.add(key)
+
+    def is_stored(self, key: tuple) -> bool:
+        """統計表をデータセットに保存済みかどうか判定します"""
+        with self.lock:
+            return key in self.set_of_stored
+
+    def clear(self) -> None:
+        """全て削除します"""
+        with self.lock:
+            self.dct_of_pl_df.clear()
+            self.set_of_stored.clear()
+            self.total_bytes = 0
+
+
 class GetJapanGovernmentStatistics:
     """
     日本政府の統計データを取得します
     """
 
-    def __init__(self, logger: Logger, cancel_event=None):
+    def __init__(self, logger: Logger):
         """初期化します"""
         self.log: Logger = logger
         self.obj_of_dt2: DatetimeTools = DatetimeTools()
@@ -37,6 +1040,8 @@ class GetJapanGovernmentStatistics:
         self.dct_of_get_type: dict = {
             "非同期": "処理の実行中に待ち時間が発生しても、次の処理に進める方法",
             "同期": "処理の実行中に待ち時間が発生しても、その処理の完了まで次に進まない方法",
+            "並行": "総件数を先に取得して、複数のページを同時に取得する方法",
+            "パイプライン": "取得、解析、書き出しを別々の段階に分けて、同時に進める方法",
         }
         # 取得するデータ形式
         self.dct_of_data_type: dict = {
@@ -44,6 +1049,18 @@ class GetJapanGovernmentStatistics:
             "json": "キーと値のペアのデータ",
             "csv": "カンマ区切りのデータ",
         }
+        # 統計表IDの一覧の保存形式
+        self.dct_of_catalog_type: dict = {
+            "parquet": "1つの列指向のファイル",
+            "csv": "100件ごとに分割したカンマ区切りのファイル",
+        }
+        # 指定の統計表の出力形式
+        self.dct_of_output_type: dict = {
+            "csv": "カンマ区切りのファイル",
+            "csv.gz": "gzipで圧縮したカンマ区切りのファイル",
+            "parquet": "列指向のファイル",
+            "feather": "Arrow IPCのファイル",
+        }
         # 検索方法
         self.dct_of_match_type: dict = {
             "部分一致": "フィールドの値にキーワードが含まれている",
@@ -54,6 +1071,15 @@ class GetJapanGovernmentStatistics:
             "OR抽出": "複数のキーワードのいずれかが含まれている",
             "AND抽出": "複数のキーワードの全てが含まれている",
         }
+        # ピボットする場合の集計方法
+        self.dct_of_aggregate_type: dict = {
+            "sum": "合計",
+            "mean": "平均",
+            "min": "最小値",
+            "max": "最大値",
+            "len": "件数",
+            "first": "最初の値",
+        }
         # list変数のキー番号
         self.KEY: int = 0
         # list変数の説明番号
@@ -62,39 +1088,175 @@ class GetJapanGovernmentStatistics:
         self.lst_of_get_type: list = []
         # 取得するデータ形式
         self.lst_of_data_type: list = []
+        # 統計表IDの一覧の保存形式
+        self.lst_of_catalog_type: list = list(list(self.dct_of_catalog_type.items())[0])
+        # 指定の統計表の出力形式
+        self.lst_of_output_type: list = list(list(self.dct_of_output_type.items())[0])
         # 検索方法
         self.lst_of_match_type: list = []
         # 抽出するキーワード
         self.lst_of_keyword: list = []
         # 抽出方法
         self.lst_of_logic_type: list = []
+        # ピボットする場合の集計方法
+        self.lst_of_aggregate_type: list = list(list(self.dct_of_aggregate_type.items())[0])
         # 統計表IDの一覧のCSVファイルのヘッダー
         self.header_of_ids_l: list = ["統計表ID", "統計名", "表題"]
         self.header_of_ids_s: str = ",".join(self.header_of_ids_l)
+        # 統計表IDの一覧のParquetファイルのスキーマ
+        self.schema_of_ids: pa.Schema = pa.schema([(h, pa.string()) for h in self.header_of_ids_l])
+        # 統計表IDの一覧のParquetファイルの1つの行グループの件数
+        self.ROW_GROUP_SIZE_OF_IDS: int = 10000
         # APIのバージョン
         self.VERSION: float = 3.0
+        # APIのURLの共通部分(ベンチマークでは、ローカルの疑似サーバーに向ける)
+        self.URL_OF_API: str = f"http://api.e-stat.go.jp/rest/{self.VERSION}/app"
         # アプリケーションID
         self.APP_ID: str = ""
         # 統計表ID
         self.STATS_DATA_ID: str = ""
+        # 取得した統計表の統計表ID(取得中に選択が変わっても、取得した統計表と対応させる)
+        self.STATS_DATA_ID_OF_TABLE: str = ""
         # 統計名
         self.STAT_NAME: str = ""
         # 表題
         self.TITLE: str = ""
         # DataFrameの件数
         self.DATA_COUNT: int = 0
+        # APIで統計表IDの一覧を検索する場合の検索語(スペース区切りでAND、ORやNOTも使える)
+        self.SEARCH_WORD: str = ""
+        # APIで統計表IDの一覧を検索する場合の統計分野(2桁の大分類、もしくは4桁の小分類)
+        self.STATS_FIELD: str = ""
+        # APIで統計表IDの一覧を検索する場合の調査年月(yyyy、yyyymm、もしくはyyyymm-yyyymm)
+        self.SURVEY_YEARS: str = ""
+        # データセットの統計表を集計するSQL
+        self.SQL_OF_QUERY: str = ""
+        # 集計結果をピボットする場合の列名(空欄の場合は、ピボットしない)
+        self.COLUMN_OF_PIVOT: str = ""
+        # ピボットする場合の値の列名
+        self.COLUMN_OF_VALUES: str = "値"
+        # 統計表IDの一覧を並行して取得する場合の同時接続数の上限
+        self.MAX_CONCURRENCY: int = 8
+        # パイプラインの段階の間のキューに溜められるページ数の上限(満杯の場合は、前の段階が待つ)
+        self.MAXSIZE_OF_PIPELINE_QUEUE: int = self.MAX_CONCURRENCY * 2
+        # パイプラインで解析するスレッドの数
+        self.MAX_WORKERS_OF_PARSER: int = min(4, os.cpu_count() or 1)
+        # タイムアウト(秒)
+        self.TIMEOUT: float = 120.0
+        # 使われていない接続を保持する時間(秒)
+        self.KEEPALIVE_EXPIRY: float = 30.0
+        # 圧縮して転送するように要求する(キャッシュで展開できる形式に限る)
+        self.dct_of_headers: dict = {"Accept-Encoding": "gzip, deflate"}
+        # HTTP/2で接続するかどうか(h2が必要)
+        self.use_http2: bool = False
+        # 接続を使い回すクライアント
+        self.client: httpx.Client | None = None
+        self.async_client: httpx.AsyncClient | None = None
+        # 非同期版のクライアントを作成したイベントループ
+        self.loop_of_async_client: asyncio.AbstractEventLoop | None = None
+        # 常駐するイベントループとそのスレッド
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.thread_of_loop: Thread | None = None
+        self.lock_of_client: Lock = Lock()
+        # 1秒あたりのリクエスト数の上限(0以下の場合は、制限しない)
+        self.RATE_OF_REQUESTS: float = 4.0
+        # 連続して送れるリクエスト数の上限
+        self.BURST_OF_REQUESTS: int = 8
+        # 全てのリクエストで共有する流量制限
+        self.rate_limiter: RateLimiter | None = None
+        # 一時的なエラーの場合の再試行の回数
+        self.MAX_RETRIES: int = 5
+        # 再試行までの待ち時間の基準と上限(秒)
+        self.BACKOFF_BASE: float = 1.0
+        self.BACKOFF_MAX: float = 60.0
+        # 再試行するHTTPのステータスコード
+        self.tpl_of_retry_status: tuple = (429, 500, 502, 503, 504)
+        # 一括で取得する場合の同時に取得する統計表の数の上限
+        self.MAX_CONCURRENCY_OF_TABLES: int = 4
+        # キャッシュを使わずに、サーバーに再検証するヘッダー
+        self.dct_of_headers_of_revalidation: dict = {"Cache-Control": "no-cache"}
+        # APIで絞り込む1つのパラメータに指定できるコードの数の上限
+        self.MAX_CODES_OF_QUERY: int = 100
+        # 指定の統計表の1ページあたりの取得件数(APIの上限)
+        self.LIMIT_OF_TABLE: int = 100000
+        # 統計表IDの一覧の1ページあたりの取得件数(最初は大きくして、取得時間に応じて調整する)
+        self.INITIAL_LIMIT_OF_IDS: int = 10000
+        self.MIN_LIMIT_OF_IDS: int = 100
+        self.MAX_LIMIT_OF_IDS: int = 100000
+        # 指定の統計表の1ページあたりの取得件数の下限(上限は、LIMIT_OF_TABLE)
+        self.MIN_LIMIT_OF_TABLE: int = 1000
+        # 1ページの取得時間(秒)の目安(超えた場合は小さくして、半分未満の場合は大きくする)
+        self.TARGET_LATENCY_OF_PAGE: float = 10.0
+        # 1ページのバイト数の目安
+        self.MAX_BYTES_OF_PAGE: int = 32 * 1024 * 1024
         # 指定の統計表のデータフレーム
-        self.pd_df: pd.DataFrame | None = None
-        # 処理をキャンセルするかどうか
-        self.cancel_event: Event | None = cancel_event
+        self.pl_df: pl.DataFrame | None = None
         # exe化されている場合とそれ以外を切り分ける
         exe_path: Path = Path(sys.executable) if getattr(sys, "frozen", False) else Path(__file__)
         # 統計表IDの一覧のCSVファイルを格納するフォルダ
         self.folder_p_of_ids: Path = exe_path.parent / "__stats_data_ids__"
         self.folder_s_of_ids: str = str(self.folder_p_of_ids)
+        # 統計表IDの一覧のParquetファイル
+        self.file_p_of_ids: Path = self.folder_p_of_ids / "list_of_stats_data_ids.parquet"
+        # 統計表IDの一覧の転置インデックスのファイル
+        self.file_p_of_index: Path = self.folder_p_of_ids / "index_of_stats_data_ids.parquet"
+        # 統計表IDの一覧の現在の世代のフォルダ(世代がない場合は、以前の形式のフォルダ)
+        self.folder_p_of_generation_of_ids: Path = self.folder_p_of_ids
+        # 残す世代の数(読み込み中の処理のために、現在と直前の世代を残す)
+        self.KEEP_GENERATIONS_OF_IDS: int = 2
+        # 統計表IDの一覧の転置インデックス
+        self.ngram_index: NgramIndex | None = None
+        # 読み込んだ転置インデックスのファイルの更新時刻
+        self.mtime_of_index: float = 0.0
         # 指定の統計表のCSVファイルを格納するフォルダ
         self.folder_p_of_table: Path = exe_path.parent / "__output__"
         self.folder_s_of_table: str = str(self.folder_p_of_table)
+        # 一括で取得した統計表のデータセットを格納するフォルダ(統計表IDで分割する)
+        self.folder_p_of_dataset: Path = self.folder_p_of_table / "dataset"
+        self.folder_s_of_dataset: str = str(self.folder_p_of_dataset)
+        # データセットの目録のファイル
+        self.file_p_of_manifest: Path = self.folder_p_of_dataset / "manifest.json"
+        # 目録の読み込みから書き込みまでを、1つずつ実行する(表示と一括取得のスレッドから書き込む)
+        self.lock_of_manifest: Lock = Lock()
+        # 指定の統計表のメタ情報を格納するフォルダ
+        self.folder_p_of_meta: Path = exe_path.parent / "__meta__"
+        self.folder_s_of_meta: str = str(self.folder_p_of_meta)
+        # メタ情報のファイルの形式のバージョン
+        self.VERSION_OF_META: int = 3
+        # メタ情報の有効期間(秒)
+        self.META_TTL: int = 60 * 60 * 24
+        # 読み込んだメタ情報(統計表IDごと)
+        self.dct_of_meta: dict[str, dict] = {}
+        # APIのレスポンスのキャッシュを格納するフォルダ
+        self.folder_p_of_cache: Path = exe_path.parent / "__cache__"
+        self.folder_s_of_cache: str = str(self.folder_p_of_cache)
+        # APIのレスポンスをキャッシュするかどうか
+        self.use_cache: bool = True
+        # キャッシュの有効期間(秒)
+        self.CACHE_TTL: int = 60 * 60 * 24
+        # キャッシュの合計サイズの上限(バイト)
+        self.CACHE_MAX_BYTES: int = 1024 * 1024 * 1024
+        # APIのレスポンスのキャッシュ
+        self.response_cache: ResponseCache | None = None
+        # 取得した統計表を、データセットにも保存するかどうか(既定では保存しない、データセットの取得や更新では常に保存する)
+        self.use_store_of_tables: bool = False
+        # 選択した統計表を、表示する前に取得しておくかどうか
+        self.use_prefetch: bool = True
+        # 先読みする前後の統計表の数
+        self.NUMBER_OF_ADJACENT_PREFETCH: int = 1
+        # 同時に先読みする統計表の数の上限(表示する統計表の取得を妨げない)
+        self.MAX_CONCURRENCY_OF_PREFETCH: int = 2
+        # 先読みした統計表をメモリに保持する数と合計サイズ(バイト)の上限
+        self.MAX_TABLES_OF_PREFETCH: int = 8
+        self.MAX_BYTES_OF_PREFETCH: int = 256 * 1024 * 1024
+        # 先読みする統計表の件数の上限(メタ情報の総件数で判定して、大きな統計表は表示する時に取得する)
+        self.MAX_ROWS_OF_PREFETCH: int = 1000000
+        # 先読みした統計表
+        self.table_lru_cache: TableLruCache | None = None
+        # 先読み中の統計表(統計表IDとデータタイプのキーごと)
+        self.dct_of_prefetch_future: dict[tuple, Future] = {}
+        self.lock_of_prefetch: Lock = Lock()
+        self.semaphore_of_prefetch: asyncio.Semaphore | None = None
 
     def append_init_log(self) -> bool:
         """初期化のログを追加します"""
@@ -104,6 +1266,282 @@ class GetJapanGovernmentStatistics:
             self.log.info("\n".join(self.credit_text))
             self.log.info(f"統計表IDのリストを格納するフォルダ => {self.folder_s_of_ids}")
             self.log.info(f"指定の統計表を格納するフォルダ => {self.folder_s_of_table}")
+            self.log.info(f"一括で取得した統計表のデータセットを格納するフォルダ => {self.folder_s_of_dataset}")
+            self.log.info(f"指定の統計表のメタ情報を格納するフォルダ => {self.folder_s_of_meta}")
+            self.log.info(f"APIのレスポンスのキャッシュを格納するフォルダ => {self.folder_s_of_cache}")
+        except Exception:
+            raise
+        else:
+            result = True
+        finally:
+            pass
+        return result
+
+    def _get_response_cache(self) -> ResponseCache:
+        """APIのレスポンスのキャッシュを取得します"""
+        if self.response_cache is None:
+            self.response_cache = ResponseCache(self.folder_p_of_cache, self.CACHE_TTL, self.CACHE_MAX_BYTES)
+        return self.response_cache
+
+    def _get_rate_limiter(self) -> RateLimiter:
+        """全てのリクエストで共有する流量制限を取得します"""
+        if self.rate_limiter is None:
+            self.rate_limiter = RateLimiter(self.RATE_OF_REQUESTS, self.BURST_OF_REQUESTS)
+        return self.rate_limiter
+
+    def _is_transient_error(self, e: BaseException) -> bool:
+        """再試行すれば成功する可能性がある一時的なエラーかどうか判定します"""
+        if isinstance(e, httpx.HTTPStatusError):
+            return e.response.status_code in self.tpl_of_retry_status
+        return isinstance(e, (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError))
+
+    def _get_delay_of_retry(self, attempt: int, e: BaseException) -> float:
+        """再試行までの待ち時間(秒)を取得します(指数関数的に延ばして、揺らぎを加えます)"""
+        delay: float = random.uniform(0, min(self.BACKOFF_MAX, self.BACKOFF_BASE * 2**attempt))
+        if isinstance(e, httpx.HTTPStatusError):
+            # サーバーから待ち時間を指定された場合は、それ以上待つ
+            retry_after: str = e.response.headers.get("retry-after", "")
+            if retry_after.isdecimal():
+                delay = max(delay, min(self.BACKOFF_MAX, float(retry_after)))
+        return delay
+
+    def _is_oversized_error(self, e: BaseException) -> bool:
+        """ページが大きすぎたために失敗した可能性があるかどうか判定します"""
+        if isinstance(e, httpx.HTTPStatusError):
+            return e.response.status_code in (413, 504)
+        return isinstance(e, httpx.TimeoutException)
+
+    def _shrink_page_if_oversized(self, e: BaseException, params: dict, page_size: AdaptivePageSize | None) -> None:
+        """ページが大きすぎて失敗した場合は、同じ開始位置から小さいページで取得し直すように、取得件数を減らします"""
+        if page_size is not None and self._is_oversized_error(e):
+            params["limit"] = page_size.shrink()
+
+    def _get_page_size_of_ids(self) -> AdaptivePageSize:
+        """統計表IDの一覧の1ページあたりの取得件数を調整するインスタンスを取得します"""
+        return AdaptivePageSize(
+            self.INITIAL_LIMIT_OF_IDS, self.MIN_LIMIT_OF_IDS, self.MAX_LIMIT_OF_IDS, self.TARGET_LATENCY_OF_PAGE, self.MAX_BYTES_OF_PAGE
+        )
+
+    def _get_page_size_of_table(self) -> AdaptivePageSize:
+        """指定の統計表の1ページあたりの取得件数を調整するインスタンスを取得します"""
+        return AdaptivePageSize(
+            self.LIMIT_OF_TABLE, self.MIN_LIMIT_OF_TABLE, self.LIMIT_OF_TABLE, self.TARGET_LATENCY_OF_PAGE, self.MAX_BYTES_OF_PAGE
+        )
+
+    def _log_page_size(self, url: str, start: Any, limit: int, rows: int, latency: float, size_of_bytes: int, next_limit: int) -> None:
+        """ページの取得件数と取得時間をログに出力します"""
+        self.log.info(
+            f"{url} => 開始位置: {start}, 取得件数: {limit}, 件数: {rows}, 取得時間: {latency:.2f}秒, "
+            f"{size_of_bytes / 1024:.0f}KiB => 次の取得件数: {next_limit}"
+        )
+
+    def _check_cancel(self, cancel_event: Event | None) -> None:
+        """処理がキャンセルされた場合は、例外を送出します"""
+        if cancel_event is not None and cancel_event.is_set():
+            raise OperationCancelledError()
+
+    def _should_retry(self, attempt: int, e: BaseException, url: str, params: dict, cancel_event: Event | None = None) -> float | None:
+        """再試行する場合は待ち時間(秒)を、しない場合はNoneを返します(キャンセルされた場合は、例外を送出します)"""
+        self._check_cancel(cancel_event)
+        if attempt >= self.MAX_RETRIES or not self._is_transient_error(e):
+            return None
+        delay: float = self._get_delay_of_retry(attempt, e)
+        reason: str = f"HTTP {e.response.status_code}" if isinstance(e, httpx.HTTPStatusError) else f"{type(e).__name__}: {str(e)}"
+        self.log.warning(
+            f"{url} => 開始位置: {params.get('startPosition')}: {reason} => {delay:.1f}秒後に再試行します。({attempt + 1}/{self.MAX_RETRIES})"
+        )
+        return delay
+
+    def _call_with_retry(
+        self, func: Callable[[], Any], url: str, params: dict, page_size: AdaptivePageSize | None = None, cancel_event: Event | None = None
+    ) -> Any:
+        """一時的なエラーの場合は、同じ開始位置で再試行しながら、1回分の取得を呼び出します"""
+        attempt: int = 0
+        while True:
+            try:
+                return func()
+            except Exception as e:
+                delay: float | None = self._should_retry(attempt, e, url, params, cancel_event)
+                if delay is None:
+                    # デバッグ
+                    self.log.debug(f"error: {url} => 開始位置: {params.get('startPosition')}")
+                    raise
+                self._shrink_page_if_oversized(e, params, page_size)
+                # キャンセルされた場合は、待たずに抜ける
+                if cancel_event is not None:
+                    cancel_event.wait(delay)
+                else:
+                    time.sleep(delay)
+                self._check_cancel(cancel_event)
+                attempt += 1
+            finally:
+                pass
+
+    async def _call_with_retry_async(
+        self,
+        func: Callable[[], Coroutine],
+        url: str,
+        params: dict,
+        page_size: AdaptivePageSize | None = None,
+        cancel_event: Event | None = None,
+    ) -> Any:
+        """一時的なエラーの場合は、同じ開始位置で再試行しながら、1回分の取得を呼び出します(非同期版)"""
+        attempt: int = 0
+        while True:
+            try:
+                return await func()
+            except Exception as e:
+                delay: float | None = self._should_retry(attempt, e, url, params, cancel_event)
+                if delay is None:
+                    # デバッグ
+                    self.log.debug(f"error: {url} => 開始位置: {params.get('startPosition')}")
+                    raise
+                self._shrink_page_if_oversized(e, params, page_size)
+                await asyncio.sleep(delay)
+                self._check_cancel(cancel_event)
+                attempt += 1
+            finally:
+                pass
+
+    def _get_with_retry(
+        self, client: httpx.Client, url: str, params: dict, page_size: AdaptivePageSize | None = None, cancel_event: Event | None = None
+    ) -> httpx.Response:
+        """一時的なエラーの場合は、同じ開始位置で再試行しながらGETします"""
+
+        def _get() -> httpx.Response:
+            """1回だけGETします"""
+            res: httpx.Response = client.get(url, params=params)
+            res.encoding = "utf-8"
+            res.raise_for_status()
+            return res
+
+        return self._call_with_retry(_get, url, params, page_size, cancel_event)
+
+    async def _get_with_retry_async(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        params: dict,
+        headers: dict | None = None,
+        page_size: AdaptivePageSize | None = None,
+        cancel_event: Event | None = None,
+    ) -> httpx.Response:
+        """一時的なエラーの場合は、同じ開始位置で再試行しながらGETします(非同期版)"""
+
+        async def _get() -> httpx.Response:
+            """1回だけGETします"""
+            res: httpx.Response = await client.get(url, params=params, headers=headers)
+            res.encoding = "utf-8"
+            res.raise_for_status()
+            return res
+
+        return await self._call_with_retry_async(_get, url, params, page_size, cancel_event)
+
+    def _get_limits(self) -> httpx.Limits:
+        """接続プールの上限を取得します"""
+        return httpx.Limits(
+            max_connections=self.MAX_CONCURRENCY,
+            max_keepalive_connections=self.MAX_CONCURRENCY,
+            keepalive_expiry=self.KEEPALIVE_EXPIRY,
+        )
+
+    def _can_use_http2(self) -> bool:
+        """HTTP/2を使えるかどうか判定します(h2がインストールされている場合のみ)"""
+        if not self.use_http2:
+            return False
+        if importlib.util.find_spec("h2") is None:
+            self.log.warning("h2がインストールされていないため、HTTP/1.1で接続します。")
+            self.use_http2 = False
+        return self.use_http2
+
+    def _get_transport(self, limits: httpx.Limits | None = None) -> httpx.BaseTransport:
+        """同期版のトランスポートを取得します"""
+        transport: httpx.BaseTransport = httpx.HTTPTransport(limits=limits or self._get_limits(), http2=self._can_use_http2())
+        # キャッシュから返す場合は、制限しない
+        transport = RateLimitedTransport(self._get_rate_limiter(), transport)
+        if self.use_cache:
+            transport = CachedTransport(self._get_response_cache(), transport)
+        return transport
+
+    def _get_async_transport(self, limits: httpx.Limits | None = None) -> httpx.AsyncBaseTransport:
+        """非同期版のトランスポートを取得します"""
+        transport: httpx.AsyncBaseTransport = httpx.AsyncHTTPTransport(limits=limits or self._get_limits(), http2=self._can_use_http2())
+        # キャッシュから返す場合は、制限しない
+        transport = AsyncRateLimitedTransport(self._get_rate_limiter(), transport)
+        if self.use_cache:
+            transport = AsyncCachedTransport(self._get_response_cache(), transport)
+        return transport
+
+    def _get_client(self) -> httpx.Client:
+        """接続を使い回す同期版のクライアントを取得します"""
+        with self.lock_of_client:
+            if self.client is None or self.client.is_closed:
+                self.client = httpx.Client(timeout=self.TIMEOUT, headers=self.dct_of_headers, transport=self._get_transport())
+            return self.client
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """接続を使い回す非同期版のクライアントを取得します(イベントループごと)"""
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        with self.lock_of_client:
+            # 接続は作成したイベントループでしか使えないため、ループが変わった場合は作り直す
+            if self.async_client is None or self.async_client.is_closed or self.loop_of_async_client is not loop:
+                self.async_client = httpx.AsyncClient(timeout=self.TIMEOUT, headers=self.dct_of_headers, transport=self._get_async_transport())
+                self.loop_of_async_client = loop
+            return self.async_client
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """常駐するイベントループを取得します(ない場合は、別スレッドで開始します)"""
+        with self.lock_of_client:
+            if self.loop is None or self.loop.is_closed():
+                self.loop = asyncio.new_event_loop()
+                self.thread_of_loop = Thread(target=self.loop.run_forever, name="gjgs-event-loop", daemon=True)
+                self.thread_of_loop.start()
+            return self.loop
+
+    def submit(self, coro: Coroutine) -> Future:
+        """常駐するイベントループでコルーチンを実行します(結果はFutureで受け取ります)"""
+        return asyncio.run_coroutine_threadsafe(coro, self._get_loop())
+
+    async def aclose(self) -> bool:
+        """実行中のイベントループのクライアントを終了してから、残りを終了します"""
+        result: bool = False
+        try:
+            if self.async_client is not None and self.loop_of_async_client is asyncio.get_running_loop():
+                await self.async_client.aclose()
+                self.async_client = None
+                self.loop_of_async_client = None
+            self.close()
+        except Exception:
+            raise
+        else:
+            result = True
+        finally:
+            pass
+        return result
+
+    def close(self) -> bool:
+        """クライアントとイベントループを終了します"""
+        result: bool = False
+        try:
+            # 先読みを取り消して、保持した統計表を解放する
+            self.prefetch_tables([])
+            if self.table_lru_cache is not None:
+                self.table_lru_cache.clear()
+            self.semaphore_of_prefetch = None
+            if self.client is not None:
+                self.client.close()
+                self.client = None
+            if self.loop is not None and not self.loop.is_closed():
+                if self.async_client is not None and self.loop_of_async_client is self.loop:
+                    self.submit(self.async_client.aclose()).result(timeout=self.TIMEOUT)
+                self.loop.call_soon_threadsafe(self.loop.stop)
+                if self.thread_of_loop is not None:
+                    self.thread_of_loop.join()
+                self.loop.close()
+            self.async_client = None
+            self.loop_of_async_client = None
+            self.loop = None
+            self.thread_of_loop = None
         except Exception:
             raise
         else:
@@ -116,7 +1554,7 @@ class GetJapanGovernmentStatistics:
         """XMLのデータを解析します(同期版と非同期版で共通)"""
         page_dct: dict = {}
         try:
-            root: ElementTree.Element[str] = ElementTree.fromstring(res.text)
+            root: ElementTree.Element[str] = ElementTree.fromstring(res.content)
             table_lst: list[ElementTree.Element[str]] = root.findall(".//TABLE_INF")
             for t in table_lst:
                 stat_id: str = (t.attrib.get("id", "") or "") if t is not None else ""
@@ -145,7 +1583,8 @@ class GetJapanGovernmentStatistics:
         page_dct: dict = {}
         try:
             data: Any = res.json()
-            table_data: Any = data["GET_STATS_LIST"]["DATALIST_INF"]["TABLE_INF"]
+            # 最後のページの次は、TABLE_INFが含まれない
+            table_data: Any = data["GET_STATS_LIST"]["DATALIST_INF"].get("TABLE_INF", [])
             table_lst = [table_data] if isinstance(table_data, dict) else table_data
             for t in table_lst:
                 stat_id: str = t.get("@id", "")
@@ -175,24 +1614,18 @@ class GetJapanGovernmentStatistics:
         page_dct: dict = {}
         row_count: int = 0
         try:
-            lines: list = res.text.splitlines()
+            data: bytes = res.content
             # ヘッダー行を探す
-            start_idx: int = 0
-            for i, line in enumerate(lines):
-                if "STAT_INF" in line:
-                    # 次の行
-                    start_idx = i + 1
-                    break
-            if start_idx == 0:
+            offset: int = StatsDataCsvParser.get_offset_of_section(data, "STAT_INF")
+            if offset < 0:
                 raise Exception("CSVファイルにヘッダー行が見つかりません。")
-            csv_text: str = "\n".join(lines[start_idx:])
-            reader: csv.DictReader[str] = csv.DictReader(io.StringIO(csv_text))
-            for row in reader:
-                row_count += 1
-                stat_id: str = row.get("TABLE_INF", "")
-                stat_name: str = row.get("STAT_NAME", "")
-                title: str = row.get("TITLE", "")
-                page_dct[stat_id] = {"stat_name": stat_name, "title": title}
+            # ヘッダー行からの残りをそのままCSVの読み込みに渡す
+            buffer: io.BytesIO = io.BytesIO(data)
+            buffer.seek(offset)
+            pl_df: pl.DataFrame = pl.read_csv(buffer, infer_schema=False, columns=["TABLE_INF", "STAT_NAME", "TITLE"])
+            for stat_id, stat_name, title in pl_df.iter_rows():
+                page_dct[stat_id or ""] = {"stat_name": stat_name or "", "title": title or ""}
+            row_count = pl_df.height
         except asyncio.CancelledError:
             raise
         except KeyboardInterrupt:
@@ -208,48 +1641,281 @@ class GetJapanGovernmentStatistics:
             pass
         return page_dct, row_count
 
-    async def _get_stats_data_ids_with_async(self) -> AsyncGenerator[dict, None]:
-        """ページを取得します(非同期版)"""
+    def _parser_number(self, res: httpx.Response, data_type: str) -> int:
+        """統計表IDの総件数を解析します(同期版と非同期版で共通)"""
+        number: int = 0
         try:
-            parser_map: dict = {
-                "xml": self._parser_xml,
-                "json": self._parser_json,
-                "csv": self._parser_csv,
-            }
-            # 統計表IDの一覧のURL
-            dct_of_ids_url: dict = {
-                "xml": f"http://api.e-stat.go.jp/rest/{self.VERSION}/app/getStatsList",
-                "json": f"http://api.e-stat.go.jp/rest/{self.VERSION}/app/json/getStatsList",
-                "csv": f"http://api.e-stat.go.jp/rest/{self.VERSION}/app/getSimpleStatsList",
-            }
-            data_type: str = self.lst_of_data_type[self.KEY]
-            parser: Any = parser_map.get(data_type)
-            if not parser:
-                raise Exception("データタイプが対応していません")
-            url: str = dct_of_ids_url[data_type]
-            start: int = 1
-            limit: int = 100
-            async with httpx.AsyncClient(timeout=120.0) as client:
-                while True:
-                    params: dict = {
-                        "appId": self.APP_ID,
-                        "lang": "J",
-                        "limit": limit,
-                        "startPosition": start,
-                    }
-                    res: httpx.Response = await client.get(url, params=params)
-                    res.encoding = "utf-8"
-                    res.raise_for_status()
-                    page_dct, count = parser(res)
-                    if count == 0:
-                        break
-                    yield page_dct
-                    start += limit
+            match data_type:
+                case "xml":
+                    root: ElementTree.Element[str] = ElementTree.fromstring(res.content)
+                    number = int((root.findtext(".//DATALIST_INF/NUMBER") or "0").strip())
+                case "json":
+                    data: Any = res.json()
+                    number = int(data["GET_STATS_LIST"]["DATALIST_INF"].get("NUMBER", 0))
+                case "csv":
+                    data: bytes = res.content
+                    # 一覧の部分は文字列にしない
+                    offset: int = StatsDataCsvParser.get_offset_of_section(data, "STAT_INF")
+                    head: bytes = data if offset < 0 else data[:offset]
+                    number = int(StatsDataCsvParser.get_value_of_header(head, "NUMBER") or "0")
+                case _:
+                    raise Exception("データタイプが対応していません")
         except asyncio.CancelledError:
             raise
-        except httpx.HTTPStatusError:
+        except KeyboardInterrupt:
             raise
-        except httpx.RequestError:
+        except Exception:
+            # デバッグ
+            self.log.debug(f"error: {self._parser_number.__qualname__}")
+            self.log.debug(res.text)
+            raise
+        else:
+            pass
+        finally:
+            pass
+        return number
+
+    def _get_params_of_ids(self, dct_of_query: dict, start: int, limit: int) -> dict:
+        """統計表IDの一覧を取得するパラメーターを作成します"""
+        return {
+            "appId": self.APP_ID,
+            "lang": "J",
+            **dct_of_query,
+            "limit": limit,
+            "startPosition": start,
+        }
+
+    async def _get_number_of_ids_with_async(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        data_type: str,
+        page_size: AdaptivePageSize,
+        dct_of_query: dict,
+        cancel_event: Event | None = None,
+    ) -> int:
+        """統計表IDの総件数を取得して、同時に取得できる取得件数に抑えます(非同期版)"""
+        res: httpx.Response = await self._get_with_retry_async(client, url, self._get_params_of_ids(dct_of_query, 1, 1), cancel_event=cancel_event)
+        number: int = self._parser_number(res, data_type)
+        self.log.info(f"統計表IDの総件数 => {number}件")
+        # 同時に取得できるように、1ページの取得件数を総件数の同時取得数分の1以下にする
+        page_size.cap(math.ceil(number / self.MAX_CONCURRENCY))
+        return number
+
+    async def _get_page_of_ids_with_async(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        start: int,
+        limit: int,
+        dct_of_query: dict,
+        cancel_event: Event | None = None,
+    ) -> tuple[httpx.Response, float]:
+        """指定の開始位置のページを取得して、取得時間と一緒に返します(非同期版)"""
+        # 取得中のページの取得件数は変えない(開始位置がずれるため)
+        time_of_start: float = time.perf_counter()
+        res: httpx.Response = await self._get_with_retry_async(
+            client, url, self._get_params_of_ids(dct_of_query, start, limit), cancel_event=cancel_event
+        )
+        return res, time.perf_counter() - time_of_start
+
+    def _update_page_size_of_ids(
+        self, page_size: AdaptivePageSize, url: str, start: int, limit: int, count: int, latency: float, res: httpx.Response
+    ) -> int:
+        """取得したページの件数、取得時間とバイト数から、次の取得件数を決めます"""
+        next_limit: int = page_size.update(limit, count, latency, len(res.content))
+        self._log_page_size(url, start, limit, count, latency, len(res.content), next_limit)
+        return next_limit
+
+    async def _get_stats_data_ids_concurrently(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        parser: Any,
+        data_type: str,
+        page_size: AdaptivePageSize,
+        dct_of_query: dict,
+        cancel_event: Event | None = None,
+    ) -> AsyncGenerator[dict, None]:
+        """総件数を取得してから、複数のページを同時に取得します(非同期版)"""
+        number: int = await self._get_number_of_ids_with_async(client, url, data_type, page_size, dct_of_query, cancel_event)
+        # 同時に取得するページ数の上限
+        semaphore: asyncio.Semaphore = asyncio.Semaphore(self.MAX_CONCURRENCY)
+
+        async def _get_page(start: int, limit: int) -> dict:
+            """指定の開始位置のページを取得します"""
+            async with semaphore:
+                res, latency = await self._get_page_of_ids_with_async(client, url, start, limit, dct_of_query, cancel_event)
+                page_dct, count = parser(res)
+                self._update_page_size_of_ids(page_size, url, start, limit, count, latency, res)
+                return page_dct
+
+        # 順番を保つために、先頭のページから順に結果を受け取る
+        starts: Any = self._iter_pages_of_ids(number, page_size)
+        # 先読みするページ数(待ち時間を埋めるために、同時取得数の2倍にする)
+        window: int = self.MAX_CONCURRENCY * 2
+        pending: deque[asyncio.Task] = deque()
+        try:
+            for start, limit in starts:
+                pending.append(asyncio.create_task(_get_page(start, limit)))
+                if len(pending) >= window:
+                    break
+            while pending:
+                page_dct: dict = await pending.popleft()
+                # 次のページは、その時点の取得件数で取得する
+                start_and_limit: tuple[int, int] | None = next(starts, None)
+                if start_and_limit is not None:
+                    pending.append(asyncio.create_task(_get_page(*start_and_limit)))
+                if page_dct:
+                    yield page_dct
+        finally:
+            # 途中で終了した場合は、残りのページの取得を取り消す
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _get_stats_data_ids_with_pipeline(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        parser: Any,
+        data_type: str,
+        page_size: AdaptivePageSize,
+        dct_of_query: dict,
+        cancel_event: Event | None = None,
+    ) -> AsyncGenerator[dict, None]:
+        """取得と解析の段階を有界のキューでつないで、ページを取得します(非同期版)"""
+        number: int = await self._get_number_of_ids_with_async(client, url, data_type, page_size, dct_of_query, cancel_event)
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        # 同時に取得するページ数の上限
+        semaphore: asyncio.Semaphore = asyncio.Semaphore(self.MAX_CONCURRENCY)
+        # 段階の間のキュー(順番を保つために、ページの到着ではなくタスクを入れる)
+        queue_of_fetched: asyncio.Queue = asyncio.Queue(maxsize=self.MAXSIZE_OF_PIPELINE_QUEUE)
+        queue_of_parsed: asyncio.Queue = asyncio.Queue(maxsize=self.MAXSIZE_OF_PIPELINE_QUEUE)
+        # 解析はイベントループの外で行い、その間も通信を続ける
+        executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=self.MAX_WORKERS_OF_PARSER, thread_name_prefix="gjgs_parser")
+        # 途中で終了した場合に取り消すために、作成した全てのタスクを保持する
+        tasks: set[asyncio.Task] = set()
+
+        def _create_task(coro: Coroutine) -> asyncio.Task:
+            """タスクを作成して、保持します(完了したタスクは手放す)"""
+            task: asyncio.Task = asyncio.create_task(coro)
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            return task
+
+        async def _fetch_page(start: int, limit: int) -> tuple[httpx.Response, int, int, float]:
+            """指定の開始位置のページを取得します"""
+            async with semaphore:
+                res, latency = await self._get_page_of_ids_with_async(client, url, start, limit, dct_of_query, cancel_event)
+                return res, start, limit, latency
+
+        async def _parse_page(task: asyncio.Task) -> dict:
+            """取得したページを、スレッドで解析します"""
+            res, start, limit, latency = await task
+            page_dct, count = await loop.run_in_executor(executor, parser, res)
+            self._update_page_size_of_ids(page_size, url, start, limit, count, latency, res)
+            return page_dct
+
+        async def _stage_of_fetch() -> None:
+            """ページの取得を開始して、順番にキューに入れます"""
+            # 次のページは、キューに空きができた時点の取得件数で取得する
+            for start, limit in self._iter_pages_of_ids(number, page_size):
+                await queue_of_fetched.put(_create_task(_fetch_page(start, limit)))
+            await queue_of_fetched.put(None)
+
+        async def _stage_of_parse() -> None:
+            """取得したページの解析を開始して、順番にキューに入れます"""
+            while True:
+                task: asyncio.Task | None = await queue_of_fetched.get()
+                if task is None:
+                    break
+                await queue_of_parsed.put(_create_task(_parse_page(task)))
+            await queue_of_parsed.put(None)
+
+        _create_task(_stage_of_fetch())
+        _create_task(_stage_of_parse())
+        try:
+            # 書き出しの段階(呼び出し元)が受け取るまで、キューが満杯の段階は待つ
+            while True:
+                task: asyncio.Task | None = await queue_of_parsed.get()
+                if task is None:
+                    break
+                page_dct: dict = await task
+                if page_dct:
+                    yield page_dct
+        finally:
+            # 途中で終了した場合は、残りの段階とページを取り消す
+            pending: list[asyncio.Task] = list(tasks)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _iter_pages_of_ids(self, number: int, page_size: AdaptivePageSize) -> Iterator[tuple[int, int]]:
+        """総件数を、取り出した時点の取得件数で区切って、開始位置と取得件数を返します"""
+        start: int = 1
+        while start <= number:
+            limit: int = page_size.size
+            yield start, limit
+            start += limit
+
+    async def _get_stats_data_ids_with_async(self, dct_of_query: dict | None = None, cancel_event: Event | None = None) -> AsyncGenerator[dict, None]:
+        """ページを取得します(非同期版)"""
+        try:
+            # 検索の条件(ない場合は、全件)
+            dct_of_query = dct_of_query or {}
+            parser_map: dict = {
+                "xml": self._parser_xml,
+                "json": self._parser_json,
+                "csv": self._parser_csv,
+            }
+            # 統計表IDの一覧のURL
+            dct_of_ids_url: dict = {
+                "xml": f"{self.URL_OF_API}/getStatsList",
+                "json": f"{self.URL_OF_API}/json/getStatsList",
+                "csv": f"{self.URL_OF_API}/getSimpleStatsList",
+            }
+            data_type: str = self.lst_of_data_type[self.KEY]
+            parser: Any = parser_map.get(data_type)
+            if not parser:
+                raise Exception("データタイプが対応していません")
+            url: str = dct_of_ids_url[data_type]
+            start: int = 1
+            # 1ページの取得件数(取得時間とバイト数に応じて調整する)
+            page_size: AdaptivePageSize = self._get_page_size_of_ids()
+            # 接続を使い回す
+            client: httpx.AsyncClient = self._get_async_client()
+            if self.lst_of_get_type and self.lst_of_get_type[self.KEY] == "並行":
+                async for page_dct in self._get_stats_data_ids_concurrently(client, url, parser, data_type, page_size, dct_of_query, cancel_event):
+                    yield page_dct
+                return
+            if self.lst_of_get_type and self.lst_of_get_type[self.KEY] == "パイプライン":
+                async for page_dct in self._get_stats_data_ids_with_pipeline(client, url, parser, data_type, page_size, dct_of_query, cancel_event):
+                    yield page_dct
+                return
+            while True:
+                params: dict = self._get_params_of_ids(dct_of_query, start, page_size.size)
+                # 失敗したページから再試行する(最初からやり直さない)
+                # 大きすぎて失敗した場合は、同じ開始位置から小さいページで取得し直す
+                time_of_start: float = time.perf_counter()
+                res: httpx.Response = await self._get_with_retry_async(client, url, params, page_size=page_size, cancel_event=cancel_event)
+                latency: float = time.perf_counter() - time_of_start
+                page_dct, count = parser(res)
+                if count == 0:
+                    break
+                self._update_page_size_of_ids(page_size, url, start, params["limit"], count, latency, res)
+                yield page_dct
+                # 取得件数に満たない場合は、最後のページ
+                if count < params["limit"]:
+                    break
+                # 実際に取得した件数だけ進める
+                start += count
+        except asyncio.CancelledError:
+            raise
+        except httpx.HTTPStatusError:
+            raise
+        except httpx.RequestError:
             raise
         except Exception:
             raise
@@ -258,11 +1924,23 @@ class GetJapanGovernmentStatistics:
         finally:
             pass
 
-    async def write_stats_data_ids_to_file(self, chunk_size: int = 100) -> bool:
+    def _convert_page_to_rows(self, page: dict) -> list[tuple]:
+        """ページの統計表IDの一覧を、統計表ID、統計名、表題の行に変換します"""
+        rows: list[tuple] = []
+        for stat_id, info in page.items():
+            col2: str = info.get("stat_name", info.get("statistics_name", ""))
+            col3: str = info.get("title", "")
+            if col3:
+                # データクレンジング
+                col3 = col3.replace("\u002c", "\u3001").replace("\uff0c", "\u3001")
+            rows.append((stat_id, str(col2), str(col3)))
+        return rows
+
+    async def write_stats_data_ids_to_file(self, chunk_size: int = 100, cancel_event: Event | None = None) -> bool:
         """統計表IDの一覧をCSVファイルに書き出す"""
         result: bool = False
         try:
-            await self._write_stats_data_ids_to_file_with_async(chunk_size)
+            await self._write_stats_data_ids_to_file_with_async(chunk_size, cancel_event)
         except asyncio.CancelledError:
             raise
         except httpx.HTTPStatusError:
@@ -279,12 +1957,41 @@ class GetJapanGovernmentStatistics:
             pass
         return result
 
-    def _common_process_for_writing_stats_data_ids_to_file(self, file_index: int, buffer: list) -> bool:
+    def _common_process_for_writing_stats_data_ids_to_file(
+        self, file_index: int, buffer: list, folder_p: Path | None = None, folder_p_of_previous: Path | None = None
+    ) -> bool:
         """ファイルに書き出す処理(同期版と非同期版で共通)"""
         result: bool = False
         try:
-            file_p_of_ids = self.folder_p_of_ids / f"list_of_stats_data_ids_{file_index}.csv"
-            file_p_of_ids.write_text("\n".join(buffer), encoding="utf-8")
+            file_name: str = f"list_of_stats_data_ids_{file_index}.csv"
+            file_p_of_ids: Path = (folder_p or self.folder_p_of_generation_of_ids) / file_name
+            data: bytes = "\n".join(buffer).encode("utf-8")
+            digest: str = hashlib.sha256(data).hexdigest()
+            # 直前の世代に同じ内容のファイルがある場合は、書き込まずに使い回す(中身は読まずに、サイズとハッシュ値で比べる)
+            file_p_of_previous: Path | None = folder_p_of_previous / file_name if folder_p_of_previous is not None else None
+            if file_p_of_previous is not None and self._is_same_file_of_ids(file_p_of_previous, len(data), digest):
+                self._link_file_of_ids(file_p_of_previous, file_p_of_ids)
+            else:
+                file_p_of_ids.write_bytes(data)
+                self._get_file_p_of_digest_of_ids(file_p_of_ids).write_text(digest, encoding="utf-8")
+        except asyncio.CancelledError:
+            raise
+        except KeyboardInterrupt:
+            raise
+        except Exception:
+            raise
+        else:
+            result = True
+        finally:
+            pass
+        return result
+
+    def _write_stats_data_ids_to_parquet(self, writer: pq.ParquetWriter, rows: list) -> bool:
+        """Parquetファイルに行グループを書き出す処理(同期版と非同期版で共通)"""
+        result: bool = False
+        try:
+            columns: list = [pa.array(col, type=pa.string()) for col in zip(*rows)]
+            writer.write_table(pa.Table.from_arrays(columns, schema=self.schema_of_ids))
         except asyncio.CancelledError:
             raise
         except KeyboardInterrupt:
@@ -297,37 +2004,167 @@ class GetJapanGovernmentStatistics:
             pass
         return result
 
-    async def _write_stats_data_ids_to_file_with_async(self, chunk_size: int = 100) -> bool:
+    def _get_folder_p_of_generations_of_ids(self) -> Path:
+        """統計表IDの一覧の世代を格納するフォルダを取得します"""
+        return self.folder_p_of_ids / "generations"
+
+    def _get_file_p_of_pointer_of_ids(self) -> Path:
+        """統計表IDの一覧の現在の世代を指すファイルを取得します"""
+        return self.folder_p_of_ids / "CURRENT"
+
+    def _resolve_generation_of_ids(self) -> Path:
+        """統計表IDの一覧の現在の世代のフォルダを、ポインタのファイルから解決します"""
+        folder_p: Path = self.folder_p_of_ids
+        file_p_of_pointer: Path = self._get_file_p_of_pointer_of_ids()
+        if file_p_of_pointer.exists():
+            name: str = file_p_of_pointer.read_text(encoding="utf-8").strip()
+            folder_p_of_generation: Path = self._get_folder_p_of_generations_of_ids() / name
+            if name and folder_p_of_generation.is_dir():
+                folder_p = folder_p_of_generation
+        # ポインタがない場合は、以前の形式のフォルダを読み込む
+        self.folder_p_of_generation_of_ids = folder_p
+        self.file_p_of_ids = folder_p / "list_of_stats_data_ids.parquet"
+        self.file_p_of_index = folder_p / "index_of_stats_data_ids.parquet"
+        return folder_p
+
+    def _create_generation_of_ids(self) -> Path:
+        """統計表IDの一覧の新しい世代のフォルダを作成します(公開するまでは、読み込まれない)"""
+        # 名前の順番が、作成した順番になるようにする
+        folder_p: Path = self._get_folder_p_of_generations_of_ids() / f"gen_{time.time_ns():020d}_{uuid.uuid4().hex[:8]}"
+        folder_p.mkdir(parents=True)
+        return folder_p
+
+    def _get_file_p_of_digest_of_ids(self, file_p: Path) -> Path:
+        """統計表IDの一覧のCSVファイルのハッシュ値を保存するファイルのパスを取得します"""
+        return file_p.with_name(f"{file_p.name}.sha256")
+
+    def _is_same_file_of_ids(self, file_p: Path, size: int, digest: str) -> bool:
+        """統計表IDの一覧のCSVファイルが、同じ内容かどうかをサイズと保存したハッシュ値で判定します(ハッシュ値がない場合は、異なるとみなします)"""
+        file_p_of_digest: Path = self._get_file_p_of_digest_of_ids(file_p)
+        if not file_p.exists() or not file_p_of_digest.exists() or file_p.stat().st_size != size:
+            return False
+        return file_p_of_digest.read_text(encoding="utf-8").strip() == digest
+
+    def _link_file_of_ids(self, src: Path, dst: Path) -> None:
+        """直前の世代のファイルを、ハードリンクで新しい世代に追加します(できない場合は、コピーします、ハッシュ値のファイルがある場合は一緒に追加します)"""
+        lst_of_pair: list[tuple[Path, Path]] = [(src, dst)]
+        src_of_digest: Path = self._get_file_p_of_digest_of_ids(src)
+        if src_of_digest.exists():
+            lst_of_pair.append((src_of_digest, self._get_file_p_of_digest_of_ids(dst)))
+        for src_p, dst_p in lst_of_pair:
+            try:
+                os.link(src_p, dst_p)
+            except OSError:
+                shutil.copy2(src_p, dst_p)
+
+    def _publish_generation_of_ids(self, folder_p: Path) -> bool:
+        """ポインタのファイルを置き換えて、統計表IDの一覧の世代を切り替えます"""
+        result: bool = False
+        file_p_of_pointer: Path = self._get_file_p_of_pointer_of_ids()
+        tmp_p: Path = file_p_of_pointer.with_name(f"{file_p_of_pointer.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            tmp_p.write_text(folder_p.name, encoding="utf-8")
+            # 読み込み中の処理は、切り替える前の世代を最後まで読み込める
+            os.replace(tmp_p, file_p_of_pointer)
+            self._resolve_generation_of_ids()
+            self.log.info(f"統計表IDの一覧の世代を切り替えました。 => {folder_p.name}")
+            self._prune_generations_of_ids()
+        except Exception:
+            tmp_p.unlink(missing_ok=True)
+            raise
+        else:
+            result = True
+        finally:
+            pass
+        return result
+
+    def _prune_generations_of_ids(self) -> bool:
+        """現在と直前の世代を残して、古い世代を削除します"""
+        result: bool = False
+        try:
+            folder_p_of_generations: Path = self._get_folder_p_of_generations_of_ids()
+            lst_of_folder_p: list[Path] = sorted(p for p in folder_p_of_generations.iterdir() if p.is_dir())
+            if self.folder_p_of_generation_of_ids not in lst_of_folder_p:
+                return result
+            # 現在の世代より新しいフォルダは、別の処理が書き込み中のため残す
+            i: int = lst_of_folder_p.index(self.folder_p_of_generation_of_ids)
+            for folder_p in lst_of_folder_p[: max(0, i - self.KEEP_GENERATIONS_OF_IDS + 1)]:
+                shutil.rmtree(folder_p, ignore_errors=True)
+            if i >= 1:
+                # 以前の形式の一覧は、直前の世代が世代のフォルダになったら削除する
+                for file_p in self.folder_p_of_ids.glob("list_of_stats_data_ids*"):
+                    file_p.unlink(missing_ok=True)
+                for file_p in self.folder_p_of_ids.glob("index_of_stats_data_ids*"):
+                    file_p.unlink(missing_ok=True)
+        except Exception:
+            raise
+        else:
+            result = True
+        finally:
+            pass
+        return result
+
+    async def _write_stats_data_ids_to_file_with_async(self, chunk_size: int = 100, cancel_event: Event | None = None) -> bool:
         """統計表IDの一覧をCSVファイルに書き出す(非同期版)"""
         result: bool = False
+        writer: pq.ParquetWriter | None = None
+        folder_p: Path | None = None
         try:
             self.log.info(f"{self._write_stats_data_ids_to_file_with_async.__doc__} => 処理中...")
-            self.folder_p_of_ids.mkdir(parents=True, exist_ok=True)
-            # フォルダの中を空にする
-            for e in self.folder_p_of_ids.iterdir():
-                if e.is_dir():
-                    shutil.rmtree(e)
-                else:
-                    e.unlink()
+            # 書き込み中も、現在の世代の一覧は読み込める
+            folder_p_of_previous: Path = self._resolve_generation_of_ids()
+            folder_p = self._create_generation_of_ids()
+            catalog_type: str = self.lst_of_catalog_type[self.KEY]
+            if catalog_type == "parquet":
+                # 1つのファイルに、ページの到着に合わせて行グループを追加する
+                writer = pq.ParquetWriter(folder_p / self.file_p_of_ids.name, self.schema_of_ids, compression="zstd")
+            elif catalog_type != "csv":
+                raise Exception("その保存形式は対応していません。")
+            rows: list = []
             buffer: list = [self.header_of_ids_s]
             file_index: int = 1
-            async for page in self._get_stats_data_ids_with_async():
-                if self.cancel_event and self.cancel_event.is_set():
-                    raise asyncio.CancelledError()
-                for stat_id, info in page.items():
-                    col2: str = info.get("stat_name", info.get("statistics_name", ""))
-                    col3: str = info.get("title", "")
-                    if col3:
-                        # データクレンジング
-                        col3 = col3.replace("\u002c", "\u3001").replace("\uff0c", "\u3001")
+            # 統計名と表題の転置インデックスを、ページごとに更新する
+            index: NgramIndex = NgramIndex()
+
+            def _write_page(page: dict) -> None:
+                """1ページ分の統計表IDを書き出します"""
+                nonlocal file_index
+                page_rows: list[tuple] = self._convert_page_to_rows(page)
+                for stat_id, col2, col3 in page_rows:
+                    if writer is not None:
+                        rows.append((stat_id, col2, col3))
+                        if len(rows) >= self.ROW_GROUP_SIZE_OF_IDS:
+                            self._write_stats_data_ids_to_parquet(writer, rows)
+                            rows.clear()
+                        continue
                     buffer.append(f"{stat_id},{col2},{col3}")
                     if len(buffer) >= chunk_size:
-                        self._common_process_for_writing_stats_data_ids_to_file(file_index, buffer)
+                        self._common_process_for_writing_stats_data_ids_to_file(file_index, buffer, folder_p, folder_p_of_previous)
                         buffer.clear()
                         buffer.append(self.header_of_ids_s)
                         file_index += 1
+                index.add_rows(page_rows)
+
+            # パイプラインの場合は、書き出しもスレッドで行い、その間も取得と解析を進める
+            is_pipeline: bool = bool(self.lst_of_get_type) and self.lst_of_get_type[self.KEY] == "パイプライン"
+            async for page in self._get_stats_data_ids_with_async(cancel_event=cancel_event):
+                self._check_cancel(cancel_event)
+                if is_pipeline:
+                    await asyncio.to_thread(_write_page, page)
+                else:
+                    _write_page(page)
+            if rows:
+                self._write_stats_data_ids_to_parquet(writer, rows)
+            if writer is not None:
+                writer.close()
+                writer = None
             if len(buffer) > 1:
-                self._common_process_for_writing_stats_data_ids_to_file(file_index, buffer)
+                self._common_process_for_writing_stats_data_ids_to_file(file_index, buffer, folder_p, folder_p_of_previous)
+            index.save(folder_p / self.file_p_of_index.name)
+            # 全て書き出してから、世代を切り替える
+            self._publish_generation_of_ids(folder_p)
+            self.ngram_index = index
+            self.mtime_of_index = self.file_p_of_index.stat().st_mtime
         except asyncio.CancelledError:
             raise
         except httpx.HTTPStatusError:
@@ -339,7 +2176,12 @@ class GetJapanGovernmentStatistics:
         else:
             result = True
         finally:
-            if self.cancel_event and self.cancel_event.is_set():
+            if writer is not None:
+                writer.close()
+            if not result and folder_p is not None:
+                # 中止、もしくは失敗した場合は、書き込み中の世代を削除して、現在の世代を残す
+                shutil.rmtree(folder_p, ignore_errors=True)
+            if cancel_event is not None and cancel_event.is_set():
                 self.log.warning(f"{self._write_stats_data_ids_to_file_with_async.__doc__} => 中止しました。")
             elif result:
                 self.log.info(f"{self._write_stats_data_ids_to_file_with_async.__doc__} => 成功しました。")
@@ -347,233 +2189,1139 @@ class GetJapanGovernmentStatistics:
                 self.log.error(f"{self._write_stats_data_ids_to_file_with_async.__doc__} => 失敗しました。")
         return result
 
-    def get_table_from_api(self) -> bool:
-        """APIから指定の統計表を取得します"""
+    def _get_params_of_table(self, stats_data_id: str, dct_of_query: dict | None = None) -> dict:
+        """指定の統計表のAPIのURLのパラメータを取得します"""
+        params: dict = {
+            "appId": self.APP_ID,  # アプリケーションID
+            "statsDataId": stats_data_id,  # 統計表ID
+            "lang": "J",  # 言語
+            "startPosition": 1,  # データの取得開始位置
+            "limit": self.LIMIT_OF_TABLE,  # データの取得件数
+            "metaGetFlg": "N",  # メタ情報の取得フラグ(メタ情報は別に取得して、使い回す)
+            "cntGetFlg": "N",  # 件数の取得フラグ
+            "explanationGetFlg": "N",  # 解説情報の有無フラグ
+            "annotationGetFlg": "N",  # 注釈情報の有無フラグ
+            "sectionHeaderFlg": 1,  # 見出し行の有無フラグ
+            "replaceSpChars": 0,  # 特殊文字のエスケープフラグ
+        }
+        # APIで絞り込む場合(絞り込みのコードは統計表ごとに異なる)
+        params.update(dct_of_query or {})
+        return params
 
-        def _get_params_of_url() -> dict:
-            """APIのURLのパラメータを取得します"""
-            params: dict = {
-                "appId": self.APP_ID,  # アプリケーションID
-                "statsDataId": self.STATS_DATA_ID,  # 統計表ID
-                "lang": "J",  # 言語
-                "limit": 100,
-                "metaGetFlg": "Y",  # メタ情報の取得フラグ
-                "cntGetFlg": "N",  # 件数の取得フラグ
-                "explanationGetFlg": "N",  # 解説情報の有無フラグ
-                "annotationGetFlg": "N",  # 注釈情報の有無フラグ
-                "sectionHeaderFlg": 1,  # 見出し行の有無フラグ
-                "replaceSpChars": 0,  # 特殊文字のエスケープフラグ
-            }
-            return params
+    def _get_url_of_table(self, data_type: str) -> str:
+        """指定の統計表のAPIのURLを取得します"""
+        dct_of_table_url: dict = {
+            "xml": f"{self.URL_OF_API}/getStatsData",
+            "json": f"{self.URL_OF_API}/json/getStatsData",
+            "csv": f"{self.URL_OF_API}/getSimpleStatsData",
+        }
+        if data_type not in dct_of_table_url:
+            raise Exception("データタイプが対応していません。")
+        return dct_of_table_url[data_type]
+
+    def _get_parser_of_table(self, data_type: str, mapping: dict, id2name: dict) -> StatsDataParser:
+        """指定の統計表の1ページの解析器を取得します"""
+        parser_map: dict = {
+            "xml": StatsDataXmlParser,
+            "json": StatsDataJsonParser,
+            "csv": StatsDataCsvParser,
+        }
+        return parser_map[data_type](mapping, id2name)
 
-        def _with_xml(client: httpx.Client, dct_of_params: dict) -> pd.DataFrame:
-            """XMLでデータを取得します"""
+    def _set_params_of_next_page(self, dct_of_params: dict, next_key: str) -> None:
+        """次のページのパラメータを設定します"""
+        dct_of_params["startPosition"] = next_key
+
+    def _get_file_p_of_meta(self, stats_data_id: str) -> Path:
+        """指定の統計表のメタ情報のファイルのパスを取得します"""
+        return self.folder_p_of_meta / f"meta_{stats_data_id}.json"
+
+    def _parse_meta(self, stats_data_id: str, data: Any) -> dict:
+        """getMetaInfoのJSONから、分類事項のコード表を抽出します"""
+        metadata_inf: Any = data["GET_META_INFO"].get("METADATA_INF")
+        if not metadata_inf:
+            result_of_api: Any = data["GET_META_INFO"].get("RESULT", {})
+            raise Exception(f"メタ情報を取得できませんでした。 => {result_of_api.get('ERROR_MSG', '')}")
+        class_objs: Any = metadata_inf["CLASS_INF"]["CLASS_OBJ"]
+        class_objs = [class_objs] if isinstance(class_objs, dict) else class_objs
+        lst_of_class_obj: list[dict] = []
+        for obj in class_objs:
+            classes: Any = obj.get("CLASS", [])
+            classes = [classes] if isinstance(classes, dict) else classes
+            lst_of_class_obj.append(
+                {
+                    "id": obj["@id"],
+                    "name": obj.get("@name", obj["@id"]),
+                    "classes": [
+                        {
+                            "code": c["@code"],
+                            "name": c.get("@name", c["@code"]),
+                            "level": c.get("@level", ""),
+                            "parent_code": c.get("@parentCode", ""),
+                            "unit": c.get("@unit", ""),
+                        }
+                        for c in classes
+                    ],
+                }
+            )
+        table_inf: dict = metadata_inf.get("TABLE_INF", {})
+        # 統計表の総件数(ない場合は、0)
+        total_number: str = str(table_inf.get("OVERALL_TOTAL_NUMBER", ""))
+        return {
+            "version": self.VERSION_OF_META,
+            "stats_data_id": stats_data_id,
+            "stored_at": time.time(),
+            "total_number": int(total_number) if total_number.isdecimal() else 0,
+            # 統計表の更新日(差分の更新で、更新されていない統計表を取得しないために使う)
+            "updated_date": str(table_inf.get("UPDATED_DATE", "") or ""),
+            "class_objs": lst_of_class_obj,
+        }
+
+    def _read_meta_of_table(self, stats_data_id: str) -> dict | None:
+        """有効期間内のメタ情報を、メモリかファイルから読み込みます"""
+        meta: dict | None = self.dct_of_meta.get(stats_data_id)
+        if meta is None:
+            file_p: Path = self._get_file_p_of_meta(stats_data_id)
+            if not file_p.exists():
+                return None
             try:
-                id_url: str = f"http://api.e-stat.go.jp/rest/{self.VERSION}/app/getStatsData"
-                # リクエストを送信する
-                res: httpx.Response = client.get(id_url, params=dct_of_params)
-                # 解析して、ルート要素を取得する
-                root: ElementTree.Element[str] = ElementTree.fromstring(res.text)
-                # CLASS_OBJからコードと名称のマッピングを作成する
-                mapping: dict = {}
-                for obj in root.findall(".//CLASS_OBJ"):
-                    obj_id: str = obj.attrib["id"]
-                    code_map: dict = {}
-                    for cls in obj.findall("CLASS"):
-                        # codeをキー、nameを値とする辞書を作成する
-                        code_map[cls.attrib["code"]] = cls.attrib.get("name", cls.attrib["code"])
-                    mapping[obj_id] = code_map
-                # VALUEを取得し、行ごとの辞書に変換する
-                rows: list = []
-                for element in root.findall(".//VALUE"):
-                    row: dict = {}
-                    for key, value in element.attrib.items():
-                        if key in mapping:
-                            row[key] = mapping[key].get(value, value)
-                        else:
-                            row[key] = value
-                    # VALUEのテキストを追加する
-                    row["値"] = (element.text or "").strip()
-                    rows.append(row)
-                pd_df: pd.DataFrame = pd.DataFrame(rows)
-                # 列名を日本語に変換する
-                id2name: dict = {}
-                for obj in root.findall(".//CLASS_OBJ"):
-                    obj_id: str = obj.attrib["id"]
-                    obj_name: str = obj.attrib.get("name", obj_id)
-                    id2name[obj_id] = obj_name
-                id2name["unit"] = "単位"
-                pd_df.rename(columns=id2name, inplace=True)
-                # 値列を数値型に変換する
-                if "値" in pd_df.columns:
-                    pd_df["値"] = pd.to_numeric(pd_df["値"], errors="coerce")
+                meta = json.loads(file_p.read_text(encoding="utf-8"))
             except Exception:
-                # デバッグ
-                self.log.debug(f"error: {_with_xml.__name__}")
-                self.log.debug(res.text)
-                raise
+                # 壊れたファイルは使わない
+                return None
+        if meta is None or meta.get("version") != self.VERSION_OF_META or time.time() - meta.get("stored_at", 0.0) >= self.META_TTL:
+            return None
+        self.dct_of_meta[stats_data_id] = meta
+        return meta
+
+    def _write_meta_of_table(self, meta: dict) -> bool:
+        """メタ情報をファイルに書き出します"""
+        result: bool = False
+        self.folder_p_of_meta.mkdir(parents=True, exist_ok=True)
+        file_p: Path = self._get_file_p_of_meta(meta["stats_data_id"])
+        tmp_p: Path = file_p.with_name(f"{file_p.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            tmp_p.write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp_p, file_p)
+        except Exception:
+            tmp_p.unlink(missing_ok=True)
+            raise
+        else:
+            result = True
+            self.dct_of_meta[meta["stats_data_id"]] = meta
+        finally:
+            pass
+        return result
+
+    def _get_url_of_meta(self) -> str:
+        """指定の統計表のメタ情報のAPIのURLを取得します"""
+        return f"{self.URL_OF_API}/json/getMetaInfo"
+
+    def _get_params_of_meta(self, stats_data_id: str) -> dict:
+        """メタ情報のAPIのURLのパラメータを取得します"""
+        return {"appId": self.APP_ID, "statsDataId": stats_data_id, "lang": "J"}
+
+    def get_meta_of_table(self, stats_data_id: str = "") -> dict:
+        """指定の統計表のメタ情報を取得します(統計表IDごとに1回だけAPIから取得します)"""
+        stats_data_id = stats_data_id or self.STATS_DATA_ID
+        meta: dict | None = self._read_meta_of_table(stats_data_id)
+        if meta is None:
+            res: httpx.Response = self._get_with_retry(self._get_client(), self._get_url_of_meta(), self._get_params_of_meta(stats_data_id))
+            meta = self._parse_meta(stats_data_id, res.json())
+            self._write_meta_of_table(meta)
+            self.log.info(f"統計表ID => {stats_data_id}: メタ情報を取得しました。")
+        return meta
+
+    async def get_meta_of_table_with_async(self, stats_data_id: str = "", revalidate: bool = False) -> dict:
+        """指定の統計表のメタ情報を取得します(非同期版)"""
+        stats_data_id = stats_data_id or self.STATS_DATA_ID
+        # 再検証する場合は、保存したメタ情報を使わない
+        meta: dict | None = None if revalidate else self._read_meta_of_table(stats_data_id)
+        if meta is None:
+            res: httpx.Response = await self._get_with_retry_async(
+                self._get_async_client(),
+                self._get_url_of_meta(),
+                self._get_params_of_meta(stats_data_id),
+                self.dct_of_headers_of_revalidation if revalidate else None,
+            )
+            meta = self._parse_meta(stats_data_id, res.json())
+            # 書き出しでイベントループを止めないように、別スレッドで実行する
+            await asyncio.to_thread(self._write_meta_of_table, meta)
+            self.log.info(f"統計表ID => {stats_data_id}: メタ情報を取得しました。")
+        return meta
+
+    def _get_total_number_of_meta(self, meta: dict) -> int:
+        """メタ情報から統計表の総件数を取得します(ない場合は、分類事項の組み合わせの数を上限として返します)"""
+        if meta.get("total_number"):
+            return int(meta["total_number"])
+        return math.prod(len(obj["classes"]) or 1 for obj in meta["class_objs"])
+
+    def _get_mapping_of_meta(self, meta: dict) -> tuple[dict, dict]:
+        """メタ情報から、コードと名称のマッピングと列名を日本語に変換する辞書を作成します"""
+        mapping: dict = {obj["id"]: {c["code"]: c["name"] for c in obj["classes"]} for obj in meta["class_objs"]}
+        id2name: dict = {"unit": "単位"}
+        id2name.update({obj["id"]: obj["name"] for obj in meta["class_objs"]})
+        return mapping, id2name
+
+    def _get_schema_of_meta(self, meta: dict) -> pl.Schema:
+        """メタ情報から、統計表の列と型を取得します"""
+        schema: dict = {obj["name"]: pl.Categorical() for obj in meta["class_objs"]}
+        # 単位は、分類事項に単位がある場合だけ列になる
+        if any(c["unit"] for obj in meta["class_objs"] for c in obj["classes"]):
+            schema["単位"] = pl.Categorical()
+        # 値は、ページごとに小さい型にするが、ページを追記するファイルでは、後のページの値も変えずに持てる型にする
+        schema["値"] = pl.Float64()
+        return pl.Schema(schema)
+
+    def _prepare_page_of_table(self, dct_of_params: dict, page_size: AdaptivePageSize, cancel_event: Event | None = None) -> None:
+        """次のページを取得する前に、キャンセルを確認して、その時点の取得件数にします(同期版と非同期版で共通)"""
+        self._check_cancel(cancel_event)
+        dct_of_params["limit"] = page_size.size
+
+    def _finish_page_of_table(
+        self, url: str, dct_of_params: dict, page_size: AdaptivePageSize, page_parser: StatsDataParser, rows: int, latency: float, size_of_bytes: int
+    ) -> bool:
+        """取得したページから次の取得件数を決めて、次のページがある場合は開始位置を進めます(同期版と非同期版で共通)"""
+        next_limit: int = page_size.update(dct_of_params["limit"], rows, latency, size_of_bytes)
+        self._log_page_size(url, dct_of_params["startPosition"], dct_of_params["limit"], rows, latency, size_of_bytes, next_limit)
+        if not page_parser.next_key:
+            return False
+        self._set_params_of_next_page(dct_of_params, page_parser.next_key)
+        return True
+
+    def get_pages_of_table_from_api(
+        self, stats_data_id: str = "", dct_of_query: dict | None = None, cancel_event: Event | None = None
+    ) -> Generator[pl.DataFrame, None, None]:
+        """APIから指定の統計表をページごとに取得します"""
+        stats_data_id = stats_data_id or self.STATS_DATA_ID
+        data_type: str = self.lst_of_data_type[self.KEY]
+        id_url: str = self._get_url_of_table(data_type)
+        dct_of_params: dict = self._get_params_of_table(stats_data_id, dct_of_query)
+        # CLASS_OBJからコードと名称のマッピングと列名を日本語に変換する辞書(保存したメタ情報を使い回す)
+        mapping, id2name = self._get_mapping_of_meta(self.get_meta_of_table(stats_data_id))
+        # 接続を使い回す
+        client: httpx.Client = self._get_client()
+        # 1ページの取得件数(取得時間とバイト数に応じて調整する)
+        page_size: AdaptivePageSize = self._get_page_size_of_table()
+
+        def _get_page() -> tuple[pl.DataFrame, StatsDataParser, float, int]:
+            """1ページを1回だけ取得して、解析します"""
+            page_parser: StatsDataParser = self._get_parser_of_table(data_type, mapping, id2name)
+            size_of_bytes: int = 0
+            time_of_start: float = time.perf_counter()
+            # レスポンスを受信しながら、解析器に渡す
+            with client.stream("GET", id_url, params=dct_of_params) as res:
+                res.raise_for_status()
+                for chunk in res.iter_bytes():
+                    size_of_bytes += len(chunk)
+                    page_parser.feed(chunk)
+            page_parser.close()
+            return page_parser.to_pl_df(), page_parser, time.perf_counter() - time_of_start, size_of_bytes
+
+        while True:
+            self._prepare_page_of_table(dct_of_params, page_size, cancel_event)
+            # 失敗したページから再試行する(最初からやり直さない)
+            pl_df, page_parser, latency, size_of_bytes = self._call_with_retry(_get_page, id_url, dct_of_params, page_size, cancel_event)
+            has_next: bool = self._finish_page_of_table(id_url, dct_of_params, page_size, page_parser, pl_df.height, latency, size_of_bytes)
+            yield pl_df
+            if not has_next:
+                break
+
+    async def get_pages_of_table_from_api_with_async(
+        self,
+        stats_data_id: str = "",
+        dct_of_query: dict | None = None,
+        revalidate: bool = False,
+        cancel_event: Event | None = None,
+        data_type: str = "",
+    ) -> AsyncGenerator[pl.DataFrame, None]:
+        """APIから指定の統計表をページごとに取得します(非同期版)"""
+        stats_data_id = stats_data_id or self.STATS_DATA_ID
+        data_type = data_type or self.lst_of_data_type[self.KEY]
+        id_url: str = self._get_url_of_table(data_type)
+        dct_of_params: dict = self._get_params_of_table(stats_data_id, dct_of_query)
+        headers: dict | None = self.dct_of_headers_of_revalidation if revalidate else None
+        # CLASS_OBJからコードと名称のマッピングと列名を日本語に変換する辞書(保存したメタ情報を使い回す)
+        mapping, id2name = self._get_mapping_of_meta(await self.get_meta_of_table_with_async(stats_data_id))
+        # 接続を使い回す
+        client: httpx.AsyncClient = self._get_async_client()
+        # 1ページの取得件数(取得時間とバイト数に応じて調整する)
+        page_size: AdaptivePageSize = self._get_page_size_of_table()
+
+        async def _get_page() -> tuple[pl.DataFrame, StatsDataParser, float, int]:
+            """1ページを1回だけ取得して、解析します"""
+            page_parser: StatsDataParser = self._get_parser_of_table(data_type, mapping, id2name)
+            size_of_bytes: int = 0
+            time_of_start: float = time.perf_counter()
+            # レスポンスを受信しながら、解析器に渡す
+            async with client.stream("GET", id_url, params=dct_of_params, headers=headers) as res:
+                res.raise_for_status()
+                async for chunk in res.aiter_bytes():
+                    size_of_bytes += len(chunk)
+                    page_parser.feed(chunk)
+            page_parser.close()
+            return page_parser.to_pl_df(), page_parser, time.perf_counter() - time_of_start, size_of_bytes
+
+        while True:
+            self._prepare_page_of_table(dct_of_params, page_size, cancel_event)
+            # 失敗したページから再試行する(最初からやり直さない)
+            pl_df, page_parser, latency, size_of_bytes = await self._call_with_retry_async(_get_page, id_url, dct_of_params, page_size, cancel_event)
+            has_next: bool = self._finish_page_of_table(id_url, dct_of_params, page_size, page_parser, pl_df.height, latency, size_of_bytes)
+            yield pl_df
+            if not has_next:
+                break
+
+    def _concat_pages_of_table(self, lst_of_pl_df: list[pl.DataFrame]) -> pl.DataFrame:
+        """ページごとのデータフレームを1回だけ結合します(同期版と非同期版で共通)"""
+        return pl.concat(lst_of_pl_df, how="diagonal_relaxed") if lst_of_pl_df else pl.DataFrame()
+
+    def _is_match_of_keyword(self, text: str, keyword: str, match_type: str) -> bool:
+        """フィルターと同じ条件で、文字列がキーワードと一致するかどうか判定します"""
+        if match_type == "部分一致":
+            return re.search(f"(?i){re.escape(keyword)}", text) is not None
+        return text == keyword
+
+    def _get_codes_of_keyword(self, meta: dict, keyword: str, match_type: str) -> dict[str, list[str]] | None:
+        """キーワードと一致する分類事項のコードを取得します(単位や値と一致する可能性がある場合は、Noneを返します)"""
+        if keyword == "" or re.fullmatch(r"[0-9.eE+\-]+", keyword):
+            return None
+        dct_of_codes: dict[str, list[str]] = {}
+        for obj in meta["class_objs"]:
+            if any(c["unit"] and self._is_match_of_keyword(c["unit"], keyword, match_type) for c in obj["classes"]):
+                return None
+            codes: list[str] = [c["code"] for c in obj["classes"] if self._is_match_of_keyword(c["name"], keyword, match_type)]
+            if codes:
+                dct_of_codes[obj["id"]] = codes
+        return dct_of_codes
+
+    def _get_query_of_class(self, obj: dict, selected: set) -> dict:
+        """1つの分類事項の一致したコードを、コード、階層、もしくは範囲の絞り込みのパラメータに変換します(変換できない場合は、空の辞書を返します)"""
+        # 例: cat01 => Cat01、area => Area、time => Time
+        name: str = f"{obj['id'][:1].upper()}{obj['id'][1:]}"
+        classes: list[dict] = obj["classes"]
+        # 全てのコードに一致する場合は、絞り込む意味がない
+        if len(selected) == len(classes):
+            return {}
+        if len(selected) <= self.MAX_CODES_OF_QUERY:
+            return {f"cd{name}": ",".join(c["code"] for c in classes if c["code"] in selected)}
+        # 一致したコードが、連続した階層の全てのコードの場合は、階層で絞り込む(例: lvTime=1-2)
+        levels: list[int] = sorted({int(c["level"]) for c in classes if c["code"] in selected and str(c["level"]).isdecimal()})
+        if levels and levels == list(range(levels[0], levels[-1] + 1)):
+            if selected == {c["code"] for c in classes if str(c["level"]).isdecimal() and int(c["level"]) in levels}:
+                return {f"lv{name}": str(levels[0]) if len(levels) == 1 else f"{levels[0]}-{levels[-1]}"}
+        # 一致したコードが、コードの順番で連続している場合は、範囲で絞り込む(例: cdTimeFrom、cdTimeTo)
+        codes: list[str] = sorted(c["code"] for c in classes)
+        indexes: list[int] = [i for i, code in enumerate(codes) if code in selected]
+        if indexes[-1] - indexes[0] + 1 == len(indexes):
+            return {f"cd{name}From": codes[indexes[0]], f"cd{name}To": codes[indexes[-1]]}
+        return {}
+
+    def compile_filter_to_query(self, meta: dict) -> dict | None:
+        """フィルターの条件を、分類事項のコード表でAPIの絞り込みのパラメータに変換します
+        (変換できない条件は、取得後に絞り込みます。一致する行がないことが分かる場合は、Noneを返します)"""
+        query: dict = {}
+        match_type: str = self.lst_of_match_type[self.KEY]
+        logic_type: str = self.lst_of_logic_type[self.KEY]
+        keywords: list = list(map(str, self.lst_of_keyword))
+        lst_of_codes: list = [self._get_codes_of_keyword(meta, k, match_type) for k in keywords]
+        # 分類事項ごとに、一致したコードを絞り込む
+        dct_of_codes: dict[str, set] = {}
+        if len(keywords) == 1 or logic_type == "OR抽出":
+            # APIのパラメータはAND条件のため、1つの分類事項に収まる場合だけ変換する
+            if any(codes is None for codes in lst_of_codes):
+                return query
+            obj_ids: set = {obj_id for codes in lst_of_codes for obj_id in cast(dict, codes)}
+            if not obj_ids:
+                # どのキーワードも、どの分類事項にも一致しない
+                return None
+            if len(obj_ids) != 1:
+                return query
+            obj_id: str = obj_ids.pop()
+            dct_of_codes[obj_id] = {code for codes in lst_of_codes for code in cast(dict, codes)[obj_id]}
+        else:
+            for codes in lst_of_codes:
+                if codes is None:
+                    continue
+                # どの分類事項にも一致しないキーワードがある場合は、一致する行はない
+                if not codes:
+                    return None
+                # 複数の分類事項にまたがるキーワードは、取得後に絞り込む
+                if len(codes) != 1:
+                    continue
+                ((obj_id, lst),) = codes.items()
+                dct_of_codes[obj_id] = dct_of_codes[obj_id] & set(lst) if obj_id in dct_of_codes else set(lst)
+                # 同じ分類事項で、共通するコードがない場合は、一致する行はない
+                if not dct_of_codes[obj_id]:
+                    return None
+        for obj in meta["class_objs"]:
+            selected: set | None = dct_of_codes.get(obj["id"])
+            if selected:
+                query.update(self._get_query_of_class(obj, selected))
+        return query
+
+    def _set_empty_table(self, stats_data_id: str, meta: dict) -> None:
+        """メタ情報の列だけの空の統計表を、取得した統計表にします"""
+        self.pl_df = pl.DataFrame(schema=self._get_schema_of_meta(meta))
+        self.STATS_DATA_ID_OF_TABLE = stats_data_id
+        self.DATA_COUNT = 0
+
+    def get_filtered_table_from_api(self, stats_data_id: str = "") -> bool:
+        """APIで絞り込める条件は絞り込んでから、指定の統計表を取得してフィルターにかけます"""
+        result: bool = False
+        try:
+            # 取得中に選択が変わっても、同じ統計表IDを使う
+            stats_data_id = stats_data_id or self.STATS_DATA_ID
+            meta: dict = self.get_meta_of_table(stats_data_id)
+            # 同時に取得する他の統計表と混ざらないように、引数で渡す
+            dct_of_query: dict | None = self.compile_filter_to_query(meta)
+            self.log.info(f"APIで絞り込むパラメータ => {dct_of_query}")
+            if dct_of_query is None:
+                # 一致する行がないことが分かる場合は、取得しない
+                self._set_empty_table(stats_data_id, meta)
             else:
-                pass
-            finally:
-                pass
-            return pd_df
+                self.get_table_from_api(stats_data_id, dct_of_query)
+                # 変換できなかった条件で絞り込む
+                self.pl_df = self.filter_pl_df(cast(pl.DataFrame, self.pl_df))
+        except Exception:
+            raise
+        else:
+            result = True
+        finally:
+            pass
+        return result
 
-        def _with_json(client: httpx.Client, dct_of_params: dict) -> pd.DataFrame:
-            """JSONでデータを取得します"""
-            try:
-                id_url: str = f"http://api.e-stat.go.jp/rest/{self.VERSION}/app/json/getStatsData"
-                # リクエストを送信する
-                res: httpx.Response = client.get(id_url, params=dct_of_params)
-                data: Any = res.json()
-                # CLASS_OBJとVALUEを抽出する
-                class_inf: Any = data["GET_STATS_DATA"]["STATISTICAL_DATA"]["CLASS_INF"]["CLASS_OBJ"]
-                values: Any = data["GET_STATS_DATA"]["STATISTICAL_DATA"]["DATA_INF"]["VALUE"]
-                # idと列名の対応表を作成する
-                col_name_map: dict = {obj["@id"]: obj["@name"] for obj in class_inf}
-                col_name_map["unit"] = "単位"
-                # CLASS_OBJ内のコードを日本語名に置換する辞書を作成する
-                code_to_name: dict = {}
-                for obj in class_inf:
-                    cid: str = obj["@id"]
-                    cls: Any = obj["CLASS"]
-                    if isinstance(cls, list):
-                        code_to_name[cid] = {c["@code"]: c["@name"] for c in cls}
-                    else:
-                        code_to_name[cid] = {cls["@code"]: cls["@name"]}
-                # VALUEの各行を日本語に変換する
-                translated_rows: list = []
-                for value in values:
-                    row: dict = {}
-                    for k, v in value.items():
-                        jp_col: str = ""
-                        if k.startswith("@") and k[1:] in code_to_name:
-                            jp_col: Any = col_name_map.get(k[1:], k[1:])
-                            row[jp_col] = code_to_name[k[1:]].get(v, v)
-                        elif k == "@unit":
-                            row["単位"] = v
-                        elif k == "$":
-                            row["値"] = v
-                        else:
-                            row[k] = v
-                    translated_rows.append(row)
-                pd_df: pd.DataFrame = pd.DataFrame(translated_rows)
-                # 値列を数値型に変換する
-                if "値" in pd_df.columns:
-                    pd_df["値"] = pd.to_numeric(pd_df["値"], errors="coerce")
-            except Exception:
-                # デバッグ
-                self.log.debug(f"error: {_with_json.__name__}")
-                self.log.debug(json.dumps(res.json(), indent=4, ensure_ascii=False))
-                raise
+    async def get_filtered_table_from_api_with_async(self, stats_data_id: str = "") -> bool:
+        """APIで絞り込める条件は絞り込んでから、指定の統計表を取得してフィルターにかけます(非同期版)"""
+        result: bool = False
+        try:
+            # 取得中に選択が変わっても、同じ統計表IDを使う
+            stats_data_id = stats_data_id or self.STATS_DATA_ID
+            meta: dict = await self.get_meta_of_table_with_async(stats_data_id)
+            # 同時に取得する他の統計表と混ざらないように、引数で渡す
+            dct_of_query: dict | None = self.compile_filter_to_query(meta)
+            self.log.info(f"APIで絞り込むパラメータ => {dct_of_query}")
+            if dct_of_query is None:
+                # 一致する行がないことが分かる場合は、取得しない
+                self._set_empty_table(stats_data_id, meta)
             else:
-                pass
-            finally:
-                pass
-            return pd_df
+                await self.get_table_from_api_with_async(stats_data_id, dct_of_query)
+                # 変換できなかった条件で絞り込む
+                self.pl_df = self.filter_pl_df(cast(pl.DataFrame, self.pl_df))
+        except Exception:
+            raise
+        else:
+            result = True
+        finally:
+            pass
+        return result
 
-        def _with_csv(client: httpx.Client, dct_of_params: dict) -> pd.DataFrame:
-            """CSVでデータを取得します"""
-            try:
-                id_url: str = f"http://api.e-stat.go.jp/rest/{self.VERSION}/app/getSimpleStatsData"
-                # リクエストを送信する
-                res: httpx.Response = client.get(id_url, params=dct_of_params)
-                lines: list[str] = res.text.splitlines()
-                # VALUE行の位置を検索する
-                value_idx: int = 0
-                for i, line in enumerate(lines):
-                    if line.strip().replace('"', "") == "VALUE":
-                        value_idx = i
-                        break
-                if value_idx == 0:
-                    raise Exception("CSVに 'VALUE' 行が見つかりませんでした。")
-                # ヘッダー行を取得する
-                header_cols: list[str] = [h.strip('"') for h in lines[value_idx + 1].split(",")]
-                # データ本体を文字列として抽出する
-                csv_body: str = "\n".join(lines[value_idx + 2 :])
-                pd_df: pd.DataFrame = pd.read_csv(io.StringIO(csv_body), header=None)
-                pd_df.columns = header_cols
-                # 列名を日本語に置換し、不要な英語コード列を削除する
-                rename_map: dict = {}
-                drop_cols: list = []
-                i: int = 0
-                while i < len(header_cols):
-                    eng: str = header_cols[i]
-                    if eng.endswith("_code") and i + 1 < len(header_cols):
-                        # 英語コード列は削除する
-                        drop_cols.append(eng)
-                        i += 2
+    def _get_table_lru_cache(self) -> TableLruCache:
+        """先読みした統計表を保持するキャッシュを取得します(初回だけ作成します)"""
+        if self.table_lru_cache is None:
+            self.table_lru_cache = TableLruCache(self.MAX_TABLES_OF_PREFETCH, self.MAX_BYTES_OF_PREFETCH)
+        return self.table_lru_cache
+
+    def _get_key_of_prefetch(self, stats_data_id: str) -> tuple:
+        """先読みした統計表のキーを取得します(データタイプが異なる場合は、使わない)"""
+        return (stats_data_id, self.lst_of_data_type[self.KEY] if self.lst_of_data_type else "")
+
+    async def _prefetch_table_with_async(self, key: tuple) -> bool:
+        """1つの統計表を先読みして、メモリに保持します(非同期版)"""
+        result: bool = False
+        # 先読みを始めた時のキー(取得中にデータタイプが変わっても、変えない)
+        stats_data_id, data_type = key
+        if self.semaphore_of_prefetch is None:
+            self.semaphore_of_prefetch = asyncio.Semaphore(self.MAX_CONCURRENCY_OF_PREFETCH)
+        try:
+            async with self.semaphore_of_prefetch:
+                # 大きな統計表は、表示するかどうか分からないうちは取得しない
+                total_number: int = self._get_total_number_of_meta(await self.get_meta_of_table_with_async(stats_data_id))
+                if total_number > self.MAX_ROWS_OF_PREFETCH:
+                    self.log.debug(f"統計表ID => {stats_data_id}: {total_number}件のため、先読みしません。")
+                    return result
+                lst_of_pl_df: list[pl.DataFrame] = []
+                async for pl_df in self.get_pages_of_table_from_api_with_async(stats_data_id, data_type=data_type):
+                    lst_of_pl_df.append(pl_df)
+                self._get_table_lru_cache().put(key, self._concat_pages_of_table(lst_of_pl_df))
+        except asyncio.CancelledError:
+            self.log.debug(f"統計表ID => {stats_data_id}: 先読みを取り消しました。")
+            raise
+        except Exception as e:
+            # 先読みに失敗しても、表示する時に取得し直す
+            self.log.debug(f"統計表ID => {stats_data_id}: 先読みに失敗しました。 => {str(e)}")
+        else:
+            result = True
+            self.log.debug(f"統計表ID => {stats_data_id}: 先読みしました。")
+        finally:
+            pass
+        return result
+
+    def prefetch_tables(self, lst_of_stats_data_id: list[str]) -> bool:
+        """指定の統計表を、表示する前に取得しておきます(指定から外れた統計表の先読みは、取り消します)"""
+        result: bool = False
+        try:
+            # 先読みを始める時点のデータタイプで、キーを決める
+            lst_of_key: list[tuple] = [self._get_key_of_prefetch(i) for i in dict.fromkeys(map(str, lst_of_stats_data_id)) if i]
+            lst_of_future_of_cancel: list[Future] = []
+            dct_of_future_of_new: dict[tuple, Future] = {}
+            with self.lock_of_prefetch:
+                # 選択が移った統計表の先読みは、取り消す
+                for key in list(self.dct_of_prefetch_future):
+                    if key not in lst_of_key:
+                        lst_of_future_of_cancel.append(self.dct_of_prefetch_future.pop(key))
+                for key in lst_of_key if self.use_prefetch else []:
+                    if key in self.dct_of_prefetch_future:
                         continue
-                    # 単独列を処理する
-                    elif eng == "unit":
-                        rename_map[eng] = "単位"
-                    elif eng == "value":
-                        rename_map[eng] = "値"
-                    else:
-                        rename_map[eng] = eng
-                    i += 1
-                pd_df = pd_df.rename(columns=rename_map)
-                pd_df = pd_df.drop(columns=drop_cols)
-                # 値列を数値型に変換する
-                if "値" in pd_df.columns:
-                    pd_df["値"] = pd.to_numeric(pd_df["値"], errors="coerce")
-            except Exception:
-                # デバッグ
-                self.log.debug(f"error: {_with_csv.__name__}")
-                self.log.debug(res.text)
+                    if self._get_table_lru_cache().get(key) is not None:
+                        continue
+                    dct_of_future_of_new[key] = self.dct_of_prefetch_future[key] = self.submit(self._prefetch_table_with_async(key))
+            # 完了時の処理はこのスレッドで呼ばれる場合があるため、ロックを外してから登録する
+            for future in lst_of_future_of_cancel:
+                future.cancel()
+            for key, future in dct_of_future_of_new.items():
+                future.add_done_callback(lambda f, k=key: self._discard_future_of_prefetch(k, f))
+        except Exception:
+            raise
+        else:
+            result = True
+        finally:
+            pass
+        return result
+
+    def _discard_future_of_prefetch(self, key: tuple, future: Future) -> None:
+        """完了した先読みを、先読み中の統計表から外します"""
+        with self.lock_of_prefetch:
+            if self.dct_of_prefetch_future.get(key) is future:
+                del self.dct_of_prefetch_future[key]
+
+    async def _wait_for_prefetched_table(self, key: tuple) -> pl.DataFrame | None:
+        """先読みした統計表を取得します(先読み中の場合は、完了を待ちます)(非同期版)"""
+        with self.lock_of_prefetch:
+            future: Future | None = self.dct_of_prefetch_future.get(key)
+        if future is not None:
+            self.log.info(f"統計表ID => {key[0]}: 先読みの完了を待ちます。")
+            # 先読みが取り消されても、自身は取り消されずに取得し直す
+            await asyncio.wait([asyncio.wrap_future(future)])
+        return self._get_table_lru_cache().get(key)
+
+    def get_table_from_api(self, stats_data_id: str = "", dct_of_query: dict | None = None) -> bool:
+        """APIから指定の統計表を取得します"""
+        result: bool = False
+        try:
+            # 取得中に選択が変わっても、同じ統計表IDを使う
+            stats_data_id = stats_data_id or self.STATS_DATA_ID
+            # ページごとに追加して、最後に1回だけ結合する
+            lst_of_pl_df: list[pl.DataFrame] = []
+            count: int = 0
+            for page_no, pl_df in enumerate(self.get_pages_of_table_from_api(stats_data_id, dct_of_query), start=1):
+                lst_of_pl_df.append(pl_df)
+                count += len(pl_df)
+                self.log.info(f"{page_no}ページ目を取得しました。 => 累計: {count}件")
+            pl_df = self._concat_pages_of_table(lst_of_pl_df)
+            # APIで絞り込んでいない統計表だけを保存する(保存済みの場合は書き直さない)
+            if self.use_store_of_tables and not dct_of_query:
+                key: tuple = self._get_key_of_prefetch(stats_data_id)
+                lru_cache: TableLruCache = self._get_table_lru_cache()
+                if not lru_cache.is_stored(key):
+                    self._store_table_to_dataset(stats_data_id, pl_df, self.get_meta_of_table(stats_data_id))
+                    # 保存済みとして扱えるように、メモリにも保持する
+                    lru_cache.put(key, pl_df)
+                    lru_cache.mark_stored(key)
+            self.pl_df = pl_df
+            self.STATS_DATA_ID_OF_TABLE = stats_data_id
+            self.DATA_COUNT = len(pl_df)
+        except Exception:
+            raise
+        else:
+            result = True
+        finally:
+            pass
+        return result
+
+    async def get_table_from_api_with_async(self, stats_data_id: str = "", dct_of_query: dict | None = None) -> bool:
+        """APIから指定の統計表を取得します(非同期版)"""
+        result: bool = False
+        try:
+            # 待っている間に選択が変わっても、同じ統計表IDを使う
+            stats_data_id = stats_data_id or self.STATS_DATA_ID
+            key: tuple = self._get_key_of_prefetch(stats_data_id)
+            # 先読みした統計表がある場合は、取得しない(APIで絞り込む条件は、後のフィルターでも絞り込まれる)
+            pl_df: pl.DataFrame | None = await self._wait_for_prefetched_table(key)
+            is_prefetched: bool = pl_df is not None
+            if pl_df is not None:
+                self.log.info(f"統計表ID => {stats_data_id}: 先読みした統計表を使います。")
+            else:
+                # ページごとに追加して、最後に1回だけ結合する
+                lst_of_pl_df: list[pl.DataFrame] = []
+                count: int = 0
+                page_no: int = 0
+                async for page_pl_df in self.get_pages_of_table_from_api_with_async(stats_data_id, dct_of_query):
+                    page_no += 1
+                    lst_of_pl_df.append(page_pl_df)
+                    count += len(page_pl_df)
+                    self.log.info(f"{page_no}ページ目を取得しました。 => 累計: {count}件")
+                pl_df = self._concat_pages_of_table(lst_of_pl_df)
+            # APIで絞り込んでいない統計表だけを保存する(先読みした統計表は、保存済みの場合は書き直さない)
+            if self.use_store_of_tables and (is_prefetched or not dct_of_query) and not self._get_table_lru_cache().is_stored(key):
+                meta: dict = await self.get_meta_of_table_with_async(stats_data_id)
+                # 書き出しでイベントループを止めないように、別スレッドで実行する
+                await asyncio.to_thread(self._store_table_to_dataset, stats_data_id, pl_df, meta)
+                self._get_table_lru_cache().mark_stored(key)
+            self.pl_df = pl_df
+            self.STATS_DATA_ID_OF_TABLE = stats_data_id
+            self.DATA_COUNT = len(pl_df)
+        except Exception:
+            raise
+        else:
+            result = True
+        finally:
+            pass
+        return result
+
+    def get_lst_of_stats_data_id_from_catalog(self) -> list[str]:
+        """統計表IDの一覧をフィルターにかけて、統計表IDだけを取得します"""
+        lst_of_stats_data_id: list[str] = []
+        try:
+            if self.lst_of_match_type[self.KEY] == "部分一致":
+                # 統計名と表題の転置インデックスで検索する
+                lst_of_stats_data_id = [row[0] for row in self.search_stats_data_ids_with_index()]
+            else:
+                pl_lazy_df: pl.LazyFrame = self.filter_pl_lazy_df(self.scan_stats_data_ids())
+                pl_df: pl.DataFrame = cast(pl.DataFrame, pl_lazy_df.select(self.header_of_ids_l[0]).collect())
+                lst_of_stats_data_id = pl_df.to_series().to_list()
+            self.DATA_COUNT = len(lst_of_stats_data_id)
+        except Exception:
+            raise
+        else:
+            pass
+        finally:
+            pass
+        return lst_of_stats_data_id
+
+    def _write_table_to_dataset(self, stats_data_id: str, pl_df: pl.DataFrame) -> Path:
+        """統計表IDごとのパーティションに、統計表をParquetファイルで書き出します"""
+        folder_p: Path = self.folder_p_of_dataset / f"stats_data_id={stats_data_id}"
+        folder_p.mkdir(parents=True, exist_ok=True)
+        file_p: Path = folder_p / "part-0.parquet"
+        # 書き出しが完了してから置き換える
+        tmp_p: Path = folder_p / f"part-0.{uuid.uuid4().hex}.tmp"
+        try:
+            pl_df.write_parquet(tmp_p, compression="zstd")
+            os.replace(tmp_p, file_p)
+        except Exception:
+            tmp_p.unlink(missing_ok=True)
+            raise
+        return file_p
+
+    def _get_latest_time_code(self, meta: dict, pl_df: pl.DataFrame) -> str:
+        """統計表にある最新の時間軸のコードを取得します(時間軸がない場合は、空文字を返します)"""
+        obj: dict | None = next((o for o in meta["class_objs"] if o["id"] == "time"), None)
+        if obj is None or obj["name"] not in pl_df.columns:
+            return ""
+        # 名称に変換できなかったコードも対象にする
+        values: set = set(pl_df.get_column(obj["name"]).cast(pl.String).drop_nulls().unique().to_list())
+        return max((c["code"] for c in obj["classes"] if c["name"] in values or c["code"] in values), default="")
+
+    def _upsert_table_of_dataset(self, file_p: Path, new_pl_df: pl.DataFrame, meta: dict, time_from: str) -> pl.DataFrame:
+        """保存した統計表の開始時期以降の行を、新しく取得した行で置き換えます"""
+        old_pl_df: pl.DataFrame = pl.read_parquet(file_p)
+        obj: dict = next(o for o in meta["class_objs"] if o["id"] == "time")
+        # 開始時期以降の期間と、新しく取得した期間
+        values: set = {c["name"] for c in obj["classes"] if c["code"] >= time_from}
+        if obj["name"] in new_pl_df.columns:
+            values.update(new_pl_df.get_column(obj["name"]).cast(pl.String).drop_nulls().unique().to_list())
+        old_pl_df = old_pl_df.filter(~pl.col(obj["name"]).cast(pl.String).is_in(list(values)).fill_null(False))
+        return self._concat_pages_of_table([old_pl_df, new_pl_df])
+
+    def _read_manifest_of_dataset(self) -> dict:
+        """データセットの目録を読み込みます(ない場合は、空の目録を返します)"""
+        manifest: dict = {"version": 1, "updated_at": "", "tables": {}}
+        if self.file_p_of_manifest.exists():
+            manifest = json.loads(self.file_p_of_manifest.read_text(encoding="utf-8"))
+        return manifest
+
+    def _write_manifest_of_dataset(self, entries: list[dict]) -> bool:
+        """データセットの目録に、取得した統計表を反映します"""
+        result: bool = False
+        tmp_p: Path = self.file_p_of_manifest.with_name(f"{self.file_p_of_manifest.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            # 同時に書き込むと、先に書き込んだ統計表の情報が失われる
+            with self.lock_of_manifest:
+                manifest: dict = self._read_manifest_of_dataset()
+                for entry in entries:
+                    old_entry: dict = manifest["tables"].get(entry["stats_data_id"], {})
+                    if entry["status"] == "failure":
+                        # 取得に失敗した場合は、前回のファイルの情報を残す
+                        entry = {**old_entry, **entry}
+                    manifest["tables"][entry["stats_data_id"]] = entry
+                manifest["updated_at"] = self.obj_of_dt2._convert_dt_to_str()
+                tmp_p.write_text(json.dumps(manifest, indent=4, ensure_ascii=False), encoding="utf-8")
+                os.replace(tmp_p, self.file_p_of_manifest)
+        except Exception:
+            tmp_p.unlink(missing_ok=True)
+            raise
+        else:
+            result = True
+        finally:
+            pass
+        return result
+
+    async def _download_table_to_dataset(self, stats_data_id: str, semaphore: asyncio.Semaphore, old_entry: dict | None = None) -> dict:
+        """1つの統計表を取得して、データセットに書き出します(前回の情報がある場合は、新しい期間だけ取得します)(非同期版)"""
+        entry: dict = {"stats_data_id": stats_data_id, "data_type": self.lst_of_data_type[self.KEY]}
+        async with semaphore:
+            try:
+                time_from: str = (old_entry or {}).get("latest_time_code", "")
+                file_p_of_old: Path | None = self.folder_p_of_dataset / old_entry["file"] if old_entry and old_entry.get("file") else None
+                lst_of_pl_df: list[pl.DataFrame] = []
+                if time_from and file_p_of_old is not None and file_p_of_old.exists():
+                    # 新しい期間のコードを含むメタ情報を取得し直す
+                    meta: dict = await self.get_meta_of_table_with_async(stats_data_id, revalidate=True)
+                    if meta["updated_date"] and meta["updated_date"] == cast(dict, old_entry).get("updated_date"):
+                        # 更新日が変わっていない統計表は、取得しない
+                        self.log.info(f"統計表ID => {stats_data_id}: 更新されていないため、取得しません。")
+                        return {
+                            **cast(dict, old_entry),
+                            **entry,
+                            "mode": "skipped",
+                            "time_from": "",
+                            "fetched_rows": 0,
+                            "status": "success",
+                            "error": "",
+                        }
+                    # 保存した最新の期間から取得する(最新の期間の改訂も反映する)
+                    async for pl_df in self.get_pages_of_table_from_api_with_async(stats_data_id, {"cdTimeFrom": time_from}, revalidate=True):
+                        lst_of_pl_df.append(pl_df)
+                    new_pl_df: pl.DataFrame = self._concat_pages_of_table(lst_of_pl_df)
+                    pl_df: pl.DataFrame = await asyncio.to_thread(self._upsert_table_of_dataset, file_p_of_old, new_pl_df, meta, time_from)
+                    entry.update({"mode": "incremental", "time_from": time_from, "fetched_rows": new_pl_df.height})
+                else:
+                    async for pl_df in self.get_pages_of_table_from_api_with_async(stats_data_id):
+                        lst_of_pl_df.append(pl_df)
+                    pl_df = self._concat_pages_of_table(lst_of_pl_df)
+                    entry.update({"mode": "full", "time_from": "", "fetched_rows": pl_df.height})
+                meta = await self.get_meta_of_table_with_async(stats_data_id)
+                latest_time_code: str = self._get_latest_time_code(meta, pl_df)
+                # 書き出しでイベントループを止めないように、別スレッドで実行する
+                file_p: Path = await asyncio.to_thread(self._write_table_to_dataset, stats_data_id, pl_df)
+            except asyncio.CancelledError:
                 raise
+            except Exception as e:
+                entry.update({"status": "failure", "error": str(e)})
+                self.log.error(f"統計表ID => {stats_data_id}: 取得に失敗しました。 => {str(e)}")
             else:
-                pass
+                entry.update(
+                    {
+                        "status": "success",
+                        "error": "",
+                        "file": file_p.relative_to(self.folder_p_of_dataset).as_posix(),
+                        "rows": pl_df.height,
+                        "columns": pl_df.columns,
+                        "latest_time_code": latest_time_code,
+                        "updated_date": meta["updated_date"],
+                        "fetched_at": self.obj_of_dt2._convert_dt_to_str(),
+                    }
+                )
+                self.log.info(f"統計表ID => {stats_data_id}: {entry['fetched_rows']}件を取得して、{pl_df.height}件を書き出しました。")
             finally:
                 pass
-            return pd_df
+        return entry
 
+    async def download_tables_to_dataset_with_async(self, lst_of_stats_data_id: list[str], incremental: bool = False) -> bool:
+        """複数の統計表を同時に取得して、統計表IDで分割したParquetのデータセットに書き出します(非同期版)"""
         result: bool = False
         try:
-            dct_of_params: dict = _get_params_of_url()
-            # セッションを管理する
-            with httpx.Client(timeout=120.0) as client:
-                match self.lst_of_data_type[self.KEY]:
-                    case "xml":
-                        self.pd_df = _with_xml(client, dct_of_params)
-                    case "json":
-                        self.pd_df = _with_json(client, dct_of_params)
-                    case "csv":
-                        self.pd_df = _with_csv(client, dct_of_params)
-                    case _:
-                        raise Exception("データタイプが対応していません。")
-            self.DATA_COUNT = len(self.pd_df)
+            # 重複を除く
+            lst_of_stats_data_id = list(dict.fromkeys(map(str, lst_of_stats_data_id)))
+            if not lst_of_stats_data_id:
+                raise Exception("統計表IDがありません。")
+            self.log.info(f"{self.download_tables_to_dataset_with_async.__doc__} => {len(lst_of_stats_data_id)}件")
+            self.folder_p_of_dataset.mkdir(parents=True, exist_ok=True)
+            # 差分だけ取得する場合は、前回の情報を使う
+            dct_of_old_entry: dict = self._read_manifest_of_dataset()["tables"] if incremental else {}
+            # 同時に取得する統計表の数の上限
+            semaphore: asyncio.Semaphore = asyncio.Semaphore(self.MAX_CONCURRENCY_OF_TABLES)
+            entries: list[dict] = await asyncio.gather(
+                *(self._download_table_to_dataset(i, semaphore, dct_of_old_entry.get(i)) for i in lst_of_stats_data_id)
+            )
+            self._write_manifest_of_dataset(entries)
+            failures: list[str] = [e["stats_data_id"] for e in entries if e["status"] == "failure"]
+            self.DATA_COUNT = len(entries) - len(failures)
+            self.log.info(f"成功: {self.DATA_COUNT}件、失敗: {len(failures)}件")
+            if failures:
+                raise Exception(f"{len(failures)}件の統計表の取得に失敗しました。 => {', '.join(failures)}")
         except Exception:
             raise
         else:
             result = True
+            self.log.info(f"データセットのフォルダ => {self.folder_s_of_dataset}")
         finally:
             pass
         return result
 
-    def filter_pd_df(self, pd_df: pd.DataFrame) -> pd.DataFrame:
-        """データフレームをフィルターにかけます"""
-        filtered_pd_df: pd.DataFrame | None = None
-        filtered_pl_df: pl.DataFrame | None = None
+    def get_lst_of_stats_data_id_from_dataset(self) -> list[str]:
+        """データセットに保存した統計表IDを取得します"""
+        tables: dict = self._read_manifest_of_dataset()["tables"]
+        return [k for k, v in tables.items() if v.get("file")]
+
+    async def refresh_tables_in_dataset_with_async(self, lst_of_stats_data_id: list[str] | None = None) -> bool:
+        """データセットの統計表を、保存した最新の期間以降だけ取得して更新します(非同期版)"""
+        if lst_of_stats_data_id is None:
+            lst_of_stats_data_id = self.get_lst_of_stats_data_id_from_dataset()
+        return await self.download_tables_to_dataset_with_async(lst_of_stats_data_id, incremental=True)
+
+    def _store_table_to_dataset(self, stats_data_id: str, pl_df: pl.DataFrame, meta: dict) -> bool:
+        """取得した1つの統計表を、データセットと目録に保存します"""
+        result: bool = False
+        try:
+            self.folder_p_of_dataset.mkdir(parents=True, exist_ok=True)
+            file_p: Path = self._write_table_to_dataset(stats_data_id, pl_df)
+            entry: dict = {
+                "stats_data_id": stats_data_id,
+                "data_type": self.lst_of_data_type[self.KEY],
+                "mode": "full",
+                "time_from": "",
+                "fetched_rows": pl_df.height,
+                "status": "success",
+                "error": "",
+                "file": file_p.relative_to(self.folder_p_of_dataset).as_posix(),
+                "rows": pl_df.height,
+                "columns": pl_df.columns,
+                "latest_time_code": self._get_latest_time_code(meta, pl_df),
+                "updated_date": meta["updated_date"],
+                "fetched_at": self.obj_of_dt2._convert_dt_to_str(),
+            }
+            self._write_manifest_of_dataset([entry])
+        except Exception:
+            raise
+        else:
+            result = True
+            self.log.info(f"統計表ID => {stats_data_id}: データセットに保存しました。")
+        finally:
+            pass
+        return result
+
+    def get_dct_of_table_in_dataset(self) -> dict[str, str]:
+        """SQLで使うテーブル名と、データセットに保存した統計表IDの辞書を取得します"""
+        # SQLの名前は数字で始められないため、接頭辞を付ける
+        return {f"t_{stats_data_id}": stats_data_id for stats_data_id in self.get_lst_of_stats_data_id_from_dataset()}
+
+    def scan_table_of_dataset(self, stats_data_id: str = "") -> pl.LazyFrame:
+        """データセットに保存した統計表を遅延して読み込みます(必要な列と行だけを読み込めます)"""
+        stats_data_id = stats_data_id or self.STATS_DATA_ID
+        entry: dict = self._read_manifest_of_dataset()["tables"].get(stats_data_id, {})
+        if not entry.get("file"):
+            raise Exception(f"統計表ID => {stats_data_id}: データセットに保存されていません。")
+        return pl.scan_parquet(self.folder_p_of_dataset / entry["file"])
+
+    def _get_sql_context_of_dataset(self) -> pl.SQLContext:
+        """データセットの統計表を、SQLのテーブルとして登録します"""
+        dct_of_table: dict[str, str] = self.get_dct_of_table_in_dataset()
+        if not dct_of_table:
+            raise Exception("データセットに統計表を保存してください。")
+        dct_of_pl_lazy_df: dict[str, pl.LazyFrame] = {name: self.scan_table_of_dataset(i) for name, i in dct_of_table.items()}
+        # 全ての統計表を縦に結合したテーブル(列が異なる場合は、空欄で補う)
+        dataset: pl.LazyFrame = pl.concat(
+            [lf.with_columns(pl.lit(i).alias(self.header_of_ids_l[0])) for i, lf in zip(dct_of_table.values(), dct_of_pl_lazy_df.values())],
+            how="diagonal_relaxed",
+        )
+        return pl.SQLContext({**dct_of_pl_lazy_df, "dataset": dataset})
+
+    def pivot_pl_df(self, pl_df: pl.DataFrame) -> pl.DataFrame:
+        """データフレームの列の値を見出しにして、値の列を集計します"""
+        pivoted_pl_df: pl.DataFrame | None = None
+        try:
+            on: str = self.COLUMN_OF_PIVOT.strip()
+            values: str = self.COLUMN_OF_VALUES.strip()
+            for column in (on, values):
+                if column not in pl_df.columns:
+                    raise Exception(f"その列はありません。 => {column}")
+            # 残りの列を行の見出しにする
+            index: list[str] = [c for c in pl_df.columns if c not in (on, values)]
+            if not index:
+                raise Exception("行の見出しにする列がありません。")
+            pivoted_pl_df = pl_df.pivot(on=on, index=index, values=values, aggregate_function=self.lst_of_aggregate_type[self.KEY])
+        except Exception:
+            raise
+        else:
+            pass
+        finally:
+            pass
+        return pivoted_pl_df
+
+    def query_dataset(self) -> bool:
+        """データセットの統計表をSQLで集計します"""
+        result: bool = False
+        try:
+            sql: str = self.SQL_OF_QUERY.strip()
+            if sql == "":
+                raise Exception("SQLが未入力です。")
+            ctx: pl.SQLContext = self._get_sql_context_of_dataset()
+            # 遅延して実行して、必要な列と条件だけをParquetファイルの読み込みに渡す
+            pl_lazy_df: pl.LazyFrame = ctx.execute(sql, eager=False)
+            self.log.debug(pl_lazy_df.explain())
+            pl_df: pl.DataFrame = cast(pl.DataFrame, pl_lazy_df.collect())
+            if self.COLUMN_OF_PIVOT.strip():
+                pl_df = self.pivot_pl_df(pl_df)
+            self.pl_df = pl_df
+            self.DATA_COUNT = len(pl_df)
+        except Exception:
+            raise
+        else:
+            result = True
+            self.log.info(f"{self.query_dataset.__doc__} => {sql}")
+        finally:
+            pass
+        return result
+
+    def _get_csv_files_of_ids(self, folder_p: Path | None = None) -> list[Path]:
+        """統計表IDの一覧のCSVファイルを、番号順に取得します"""
+        csv_files: list[Path] = list((folder_p or self.folder_p_of_generation_of_ids).glob("list_of_stats_data_ids_*.csv"))
+        csv_files.sort(key=lambda p: int(p.stem.rsplit("_", 1)[-1]) if p.stem.rsplit("_", 1)[-1].isdigit() else -1)
+        return csv_files
+
+    def exists_stats_data_ids(self) -> bool:
+        """統計表IDの一覧が保存されているかどうか判定します"""
+        self._resolve_generation_of_ids()
+        return self.file_p_of_ids.exists() or bool(self._get_csv_files_of_ids())
+
+    def scan_stats_data_ids(self) -> pl.LazyFrame:
+        """統計表IDの一覧のParquetファイル、もしくはCSVファイルを遅延して読み込みます"""
+        pl_lazy_df: pl.LazyFrame | None = None
+        try:
+            # 別の処理で世代が切り替わった場合は、新しい世代を読み込む
+            self._resolve_generation_of_ids()
+            if self.file_p_of_ids.exists():
+                pl_lazy_df = pl.scan_parquet(self.file_p_of_ids)
+            else:
+                csv_files: list[Path] = self._get_csv_files_of_ids()
+                if not csv_files:
+                    raise Exception("統計表IDの一覧を取得してください。")
+                # 全てのCSVファイルを1回のスキャンで並列に読み込む
+                pl_lazy_df = pl.scan_csv(csv_files, schema={h: pl.String for h in self.header_of_ids_l})
+        except Exception:
+            raise
+        else:
+            pass
+        finally:
+            pass
+        return pl_lazy_df
+
+    def _read_stats_data_ids(self) -> pl.DataFrame:
+        """統計表IDの一覧をまとめて読み込みます"""
+        return cast(pl.DataFrame, self.scan_stats_data_ids().collect())
+
+    def _get_ngram_index(self) -> NgramIndex:
+        """統計表IDの一覧の転置インデックスを取得します(ない場合は作成します)"""
+        index: NgramIndex | None = None
+        try:
+            self._resolve_generation_of_ids()
+            mtime: float = self.file_p_of_index.stat().st_mtime if self.file_p_of_index.exists() else 0.0
+            # 別の処理で一覧が更新された場合は、読み込み直す
+            if self.ngram_index is None or mtime == 0.0 or mtime != self.mtime_of_index:
+                # 行は、同じ世代の統計表IDの一覧から読み込む
+                rows: list[tuple] = self._read_stats_data_ids().rows()
+                try:
+                    if mtime == 0.0:
+                        raise Exception("転置インデックスがありません。")
+                    index = NgramIndex()
+                    index.load(self.file_p_of_index, rows)
+                except Exception as e:
+                    self.log.info(f"統計表IDの一覧の転置インデックスを作成します。 => {str(e)}")
+                    index = NgramIndex()
+                    index.add_rows(rows)
+                    index.save(self.file_p_of_index)
+                    mtime = self.file_p_of_index.stat().st_mtime
+                self.ngram_index = index
+                self.mtime_of_index = mtime
+            index = self.ngram_index
+        except Exception:
+            raise
+        else:
+            pass
+        finally:
+            pass
+        return cast(NgramIndex, index)
+
+    def search_stats_data_ids_with_index(self) -> list[tuple]:
+        """転置インデックスで統計表IDの一覧を部分一致で検索します"""
+        rows: list[tuple] = []
+        try:
+            if self.lst_of_match_type[self.KEY] != "部分一致":
+                raise Exception("転置インデックスは、部分一致のみ対応しています。")
+            logic_type: str = self.lst_of_logic_type[self.KEY]
+            keywords: list = list(map(str, self.lst_of_keyword))
+            rows = self._get_ngram_index().search(keywords, logic_type)
+            self.DATA_COUNT = len(rows)
+        except Exception:
+            raise
+        else:
+            pass
+        finally:
+            pass
+        return rows
+
+    def _get_params_of_search(self) -> dict:
+        """APIで統計表IDの一覧を検索するパラメータを取得します"""
+        params: dict = {}
+        try:
+            if self.SEARCH_WORD.strip():
+                params["searchWord"] = self.SEARCH_WORD.strip()
+            if self.STATS_FIELD.strip():
+                if not re.fullmatch(r"[0-9]{2}|[0-9]{4}", self.STATS_FIELD.strip()):
+                    raise Exception("統計分野は、2桁もしくは4桁の数字で入力してください。")
+                params["statsField"] = self.STATS_FIELD.strip()
+            if self.SURVEY_YEARS.strip():
+                if not re.fullmatch(r"[0-9]{4}|[0-9]{6}|[0-9]{6}-[0-9]{6}", self.SURVEY_YEARS.strip()):
+                    raise Exception("調査年月は、yyyy、yyyymm、もしくはyyyymm-yyyymmで入力してください。")
+                params["surveyYears"] = self.SURVEY_YEARS.strip()
+            if not params:
+                raise Exception("検索語、統計分野、調査年月のいずれかを入力してください。")
+        except Exception:
+            raise
+        else:
+            pass
+        finally:
+            pass
+        return params
+
+    def _merge_stats_data_ids_into_catalog(self, rows: list[tuple]) -> int:
+        """検索した統計表IDを、保存している一覧と転置インデックスに追加します"""
+        count: int = 0
+        folder_p: Path | None = None
+        is_published: bool = False
+        try:
+            if not rows:
+                return count
+            # 転置インデックスは、同じ統計表IDの行を更新する
+            index: NgramIndex = self._get_ngram_index() if self.exists_stats_data_ids() else NgramIndex()
+            # 現在の世代を書き換えずに、新しい世代に書き出して切り替える
+            folder_p_of_previous: Path = self.folder_p_of_generation_of_ids
+            folder_p = self._create_generation_of_ids()
+            new_pl_df: pl.DataFrame = pl.DataFrame(rows, schema={h: pl.String for h in self.header_of_ids_l}, orient="row")
+            csv_files: list[Path] = self._get_csv_files_of_ids()
+            if not self.file_p_of_ids.exists() and (csv_files or self.lst_of_catalog_type[self.KEY] == "csv"):
+                # CSVファイルの一覧は、既存のファイルを使い回して、ない統計表IDだけを次の番号のファイルに追加する
+                if csv_files:
+                    old_ids: pl.Series = self.scan_stats_data_ids().select(self.header_of_ids_l[0]).collect().to_series()
+                    new_pl_df = new_pl_df.filter(~pl.col(self.header_of_ids_l[0]).is_in(old_ids.implode()))
+                for file_p in csv_files:
+                    self._link_file_of_ids(file_p, folder_p / file_p.name)
+                file_index: int = int(csv_files[-1].stem.rsplit("_", 1)[-1]) + 1 if csv_files else 1
+                if not new_pl_df.is_empty():
+                    buffer: list = [self.header_of_ids_s] + [f"{stat_id},{col2},{col3}" for stat_id, col2, col3 in new_pl_df.iter_rows()]
+                    self._common_process_for_writing_stats_data_ids_to_file(file_index, buffer, folder_p, folder_p_of_previous)
+            else:
+                # Parquetファイルの一覧は、同じ統計表IDの行を置き換えて書き直す
+                pl_df: pl.DataFrame = new_pl_df
+                if self.file_p_of_ids.exists():
+                    old_pl_df: pl.DataFrame = pl.read_parquet(self.file_p_of_ids)
+                    # 既存の行は順番を保ったまま更新して、ない統計表IDの行を末尾に追加する
+                    is_new: pl.Expr = ~pl.col(self.header_of_ids_l[0]).is_in(old_pl_df.get_column(self.header_of_ids_l[0]).implode())
+                    pl_df = pl.concat([old_pl_df.update(new_pl_df, on=self.header_of_ids_l[0]), new_pl_df.filter(is_new)])
+                pl_df.write_parquet(folder_p / self.file_p_of_ids.name, compression="zstd", row_group_size=self.ROW_GROUP_SIZE_OF_IDS)
+            count = index.add_rows(rows)
+            index.save(folder_p / self.file_p_of_index.name)
+            is_published = self._publish_generation_of_ids(folder_p)
+            self.ngram_index = index
+            self.mtime_of_index = self.file_p_of_index.stat().st_mtime
+        except Exception:
+            raise
+        else:
+            pass
+        finally:
+            if not is_published and folder_p is not None:
+                shutil.rmtree(folder_p, ignore_errors=True)
+        return count
+
+    async def search_stats_data_ids_from_api_with_async(
+        self, on_page: Callable[[list], Any] | None = None, cancel_event: Event | None = None
+    ) -> list[tuple]:
+        """APIで統計表IDの一覧を検索します(非同期版)"""
+        rows: list[tuple] = []
+        try:
+            dct_of_query: dict = self._get_params_of_search()
+            self.log.info(f"{self.search_stats_data_ids_from_api_with_async.__doc__} => {dct_of_query}")
+            # 全件を取得しなくても、ページの到着ごとに結果を渡す
+            async for page in self._get_stats_data_ids_with_async(dct_of_query, cancel_event):
+                self._check_cancel(cancel_event)
+                page_rows: list[tuple] = self._convert_page_to_rows(page)
+                rows.extend(page_rows)
+                if on_page is not None:
+                    on_page(page_rows)
+            # 次回からは、保存している一覧と転置インデックスで検索できるようにする
+            count: int = self._merge_stats_data_ids_into_catalog(rows)
+            self.log.info(f"統計表IDの一覧に追加、もしくは更新した件数 => {count}件")
+            self.DATA_COUNT = len(rows)
+        except asyncio.CancelledError:
+            raise
+        except httpx.HTTPStatusError:
+            raise
+        except httpx.RequestError:
+            raise
+        except Exception:
+            raise
+        else:
+            self.log.info(f"検索した統計表IDの件数 => {self.DATA_COUNT}件")
+        finally:
+            pass
+        return rows
+
+    def show_stats_data_ids(self, rows: list[tuple]) -> bool:
+        """統計表IDの一覧を表示します"""
+        result: bool = False
+        try:
+            self.log.info(tabulate(rows, headers=self.header_of_ids_l, tablefmt="github"))
+            self.log.info(f"表示件数 => {len(rows)}")
+        except Exception:
+            raise
+        else:
+            result = True
+        finally:
+            pass
+        return result
+
+    def _get_str_cols(self, schema: pl.Schema, keywords: list) -> list[pl.Expr]:
+        """キーワードと一致する可能性のある列を、文字列の式として取得します"""
+        str_cols: list[pl.Expr] = []
+        # 数値の列は、キーワードが数値として読める場合だけ対象にする
+        is_numeric_keyword: bool = any(re.fullmatch(r"[0-9.eE+\-]+", k) for k in keywords)
+        for name, dtype in schema.items():
+            if dtype == pl.String:
+                # 文字列の列は、そのまま使う
+                str_cols.append(pl.col(name))
+            elif dtype.is_numeric():
+                if is_numeric_keyword:
+                    str_cols.append(pl.col(name).cast(pl.String))
+            else:
+                # カテゴリなどの列は、文字列に変換する
+                str_cols.append(pl.col(name).cast(pl.String))
+        if not str_cols:
+            # 対象の列がない場合は、どの行も一致しない
+            str_cols.append(pl.lit(None, dtype=pl.String))
+        return str_cols
+
+    def filter_pl_lazy_df(self, pl_lazy_df: pl.LazyFrame) -> pl.LazyFrame:
+        """遅延評価のデータフレームにフィルターの条件を追加します"""
         filtered_pl_lazy_df: pl.LazyFrame | None = None
         try:
             match_type: str = self.lst_of_match_type[self.KEY]
             logic_type: str = self.lst_of_logic_type[self.KEY]
             keywords: list = list(map(str, self.lst_of_keyword))
-            # pandas => polars
-            pl_df: pl.DataFrame = pl.from_pandas(pd_df)
-            pl_lazy_df: pl.LazyFrame = pl_df.lazy()
-            # 全列を文字列として扱う
-            str_cols: pl.Expr = pl.all().cast(pl.Utf8)
+            schema: pl.Schema = pl_lazy_df.collect_schema()
             # 部分一致
             if match_type == "部分一致":
                 # OR
                 if len(keywords) == 1 or logic_type == "OR抽出":
                     pattern: str = "|".join(re.escape(k) for k in keywords)
-                    filtered_pl_lazy_df = pl_lazy_df.filter(pl.any_horizontal(str_cols.str.contains(f"(?i){pattern}")))
+                    str_cols: list[pl.Expr] = self._get_str_cols(schema, keywords)
+                    filtered_pl_lazy_df = pl_lazy_df.filter(pl.any_horizontal([c.str.contains(f"(?i){pattern}") for c in str_cols]))
                 # AND
                 elif logic_type == "AND抽出":
                     filtered_pl_lazy_df = pl_lazy_df.filter(
-                        pl.all_horizontal([pl.any_horizontal(str_cols.str.contains(f"(?i){re.escape(k)}")) for k in keywords])
+                        pl.all_horizontal(
+                            [pl.any_horizontal([c.str.contains(f"(?i){re.escape(k)}") for c in self._get_str_cols(schema, [k])]) for k in keywords]
+                        )
                     )
                 else:
                     raise Exception("その抽出方法はありません。")
@@ -581,32 +3329,47 @@ class GetJapanGovernmentStatistics:
             elif match_type == "完全一致":
                 # OR
                 if len(keywords) == 1 or logic_type == "OR抽出":
-                    filtered_pl_lazy_df = pl_lazy_df.filter(pl.any_horizontal(str_cols.is_in(keywords)))
+                    str_cols: list[pl.Expr] = self._get_str_cols(schema, keywords)
+                    filtered_pl_lazy_df = pl_lazy_df.filter(pl.any_horizontal([c.is_in(keywords) for c in str_cols]))
                 # AND
                 elif logic_type == "AND抽出":
-                    filtered_pl_lazy_df = pl_lazy_df.filter(pl.all_horizontal([pl.any_horizontal(str_cols.eq(k)) for k in keywords]))
+                    filtered_pl_lazy_df = pl_lazy_df.filter(
+                        pl.all_horizontal([pl.any_horizontal([c.eq(k) for c in self._get_str_cols(schema, [k])]) for k in keywords])
+                    )
                 else:
                     raise Exception("その抽出方法はありません。")
             else:
                 raise Exception("その検索方法はありません。")
-            # polars => pandas
-            filtered_pl_df = cast(pl.DataFrame, filtered_pl_lazy_df.collect())
-            filtered_pd_df = filtered_pl_df.to_pandas()
-            self.DATA_COUNT = len(filtered_pd_df)
         except Exception:
             raise
         else:
             pass
         finally:
             pass
-        return filtered_pd_df
+        return filtered_pl_lazy_df
+
+    def filter_pl_df(self, pl_df: pl.DataFrame) -> pl.DataFrame:
+        """データフレームをフィルターにかけます"""
+        filtered_pl_df: pl.DataFrame | None = None
+        try:
+            filtered_pl_df = cast(pl.DataFrame, self.filter_pl_lazy_df(pl_df.lazy()).collect())
+            self.DATA_COUNT = len(filtered_pl_df)
+        except Exception:
+            raise
+        else:
+            pass
+        finally:
+            pass
+        return filtered_pl_df
 
     def show_table(self) -> bool:
         """指定の統計表を表示します"""
         result: bool = False
         try:
-            self.log.info(tabulate(self.pd_df, headers="keys", tablefmt="github", showindex=False))
-            self.log.info(f"統計表ID => {self.STATS_DATA_ID}")
+            if self.pl_df is None:
+                raise Exception("DataFrameが空です。")
+            self.log.info(tabulate(self.pl_df.rows(), headers=self.pl_df.columns, tablefmt="github"))
+            self.log.info(f"統計表ID => {self.STATS_DATA_ID_OF_TABLE or self.STATS_DATA_ID}")
             self.log.info("データの取得形式 => " + ": ".join(self.lst_of_data_type))
             self.log.info("検索方法 => " + ": ".join(self.lst_of_match_type))
             self.log.info("抽出するキーワード => " + (", ".join(map(str, self.lst_of_keyword)) if self.lst_of_keyword else "なし"))
@@ -620,16 +3383,32 @@ class GetJapanGovernmentStatistics:
             pass
         return result
 
-    def output_table_to_csv(self) -> bool:
-        """指定の統計表をcsvファイルに出力します"""
+    def _get_file_p_of_table(self, output_type: str, stats_data_id: str) -> Path:
+        """指定の統計表のファイルのパスを取得します"""
+        self.folder_p_of_table.mkdir(parents=True, exist_ok=True)
+        return self.folder_p_of_table / f"stats_table_{stats_data_id}_{self.obj_of_dt2._convert_for_file_name()}.{output_type}"
+
+    def output_table_to_file(self, output_type: str | None = None) -> bool:
+        """指定の統計表をファイルに出力します(出力形式を指定しない場合は、選択した出力形式)"""
         result: bool = False
         try:
-            if self.pd_df is None:
+            if self.pl_df is None:
                 raise Exception("DataFrameが空です。")
-            self.folder_p_of_table.mkdir(parents=True, exist_ok=True)
-            file_p_of_table: Path = self.folder_p_of_table / f"stats_table_{self.STATS_DATA_ID}_{self.obj_of_dt2._convert_for_file_name()}.csv"
+            output_type = output_type or self.lst_of_output_type[self.KEY]
+            file_p_of_table: Path = self._get_file_p_of_table(output_type, self.STATS_DATA_ID_OF_TABLE or self.STATS_DATA_ID)
             file_s_of_table: str = str(file_p_of_table)
-            self.pd_df.to_csv(file_s_of_table, index=False, encoding="utf-8")
+            match output_type:
+                case "csv":
+                    self.pl_df.write_csv(file_p_of_table)
+                case "csv.gz":
+                    with gzip.open(file_p_of_table, "wb") as f:
+                        self.pl_df.write_csv(f)
+                case "parquet":
+                    self.pl_df.write_parquet(file_p_of_table, compression="zstd")
+                case "feather":
+                    self.pl_df.write_ipc(file_p_of_table, compression="zstd")
+                case _:
+                    raise Exception("その出力形式は対応していません。")
         except Exception:
             raise
         else:
@@ -638,3 +3417,63 @@ class GetJapanGovernmentStatistics:
         finally:
             pass
         return result
+
+    def output_table_to_csv(self) -> bool:
+        """指定の統計表をcsvファイルに出力します"""
+        # 選択した出力形式は変えない
+        return self.output_table_to_file("csv")
+
+    def output_pages_of_table_to_file(self, stats_data_id: str = "") -> bool:
+        """APIから指定の統計表を取得しながら、ページごとにファイルに追記します"""
+        result: bool = False
+        writer: TableFileWriter | None = None
+        try:
+            output_type: str = self.lst_of_output_type[self.KEY]
+            stats_data_id = stats_data_id or self.STATS_DATA_ID
+            file_p_of_table: Path = self._get_file_p_of_table(output_type, stats_data_id)
+            writer = TableFileWriter(file_p_of_table, output_type, self._get_schema_of_meta(self.get_meta_of_table(stats_data_id)))
+            for page_no, pl_df in enumerate(self.get_pages_of_table_from_api(stats_data_id), start=1):
+                writer.write(pl_df)
+                self.log.info(f"{page_no}ページ目を書き出しました。 => 累計: {writer.count}件")
+            writer.close()
+            self.DATA_COUNT = writer.count
+        except BaseException:
+            if writer is not None:
+                writer.abort()
+            raise
+        else:
+            result = True
+            self.log.info(f"指定の統計表のファイル => {str(file_p_of_table)}")
+        finally:
+            pass
+        return result
+
+    async def output_pages_of_table_to_file_with_async(self, stats_data_id: str = "") -> bool:
+        """APIから指定の統計表を取得しながら、ページごとにファイルに追記します(非同期版)"""
+        result: bool = False
+        writer: TableFileWriter | None = None
+        try:
+            output_type: str = self.lst_of_output_type[self.KEY]
+            # 取得中に選択が変わっても、同じ統計表IDを使う
+            stats_data_id = stats_data_id or self.STATS_DATA_ID
+            file_p_of_table: Path = self._get_file_p_of_table(output_type, stats_data_id)
+            meta: dict = await self.get_meta_of_table_with_async(stats_data_id)
+            writer = TableFileWriter(file_p_of_table, output_type, self._get_schema_of_meta(meta))
+            page_no: int = 0
+            async for pl_df in self.get_pages_of_table_from_api_with_async(stats_data_id):
+                page_no += 1
+                # 書き出しでイベントループを止めないように、別スレッドで実行する
+                await asyncio.to_thread(writer.write, pl_df)
+                self.log.info(f"{page_no}ページ目を書き出しました。 => 累計: {writer.count}件")
+            await asyncio.to_thread(writer.close)
+            self.DATA_COUNT = writer.count
+        except BaseException:
+            if writer is not None:
+                writer.abort()
+            raise
+        else:
+            result = True
+            self.log.info(f"指定の統計表のファイル => {str(file_p_of_table)}")
+        finally:
+            pass
+        return result
@@ -0,0 +1,342 @@
+import gzip
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+from xml.sax.saxutils import quoteattr
+
+
+class FakeEStatServer:
+    """e-StatのAPIの疑似サーバーのクラス(ベンチマークとテスト用に、合成したデータをローカルで返します)"""
+
+    def __init__(
+        self,
+        number_of_ids: int = 10000,
+        number_of_cats: int = 4,
+        number_of_areas: int = 47,
+        number_of_times: int = 30,
+        latency: float = 0.0,
+        use_gzip: bool = True,
+        latency_per_row: float = 0.0,
+    ):
+        """初期化します"""
+        # APIのバージョン
+        self.VERSION: float = 3.0
+        # 統計表IDの一覧の総件数
+        self.NUMBER_OF_IDS: int = number_of_ids
+        # 指定の統計表の分類事項(男女、地域、時間軸)の数
+        self.NUMBER_OF_CATS: int = number_of_cats
+        self.NUMBER_OF_AREAS: int = number_of_areas
+        self.NUMBER_OF_TIMES: int = number_of_times
+        # 1つのリクエストあたりの応答の遅延(秒)
+        self.LATENCY: float = latency
+        # 要求された取得件数1件あたりの遅延(秒)(大きいページほど遅くなるサーバーを再現する)
+        self.LATENCY_PER_ROW: float = latency_per_row
+        # 要求された場合に、gzipで圧縮して返すかどうか
+        self.use_gzip: bool = use_gzip
+        # 分類事項のコードと名称
+        self.lst_of_cat: list[tuple[str, str]] = [(f"{i:03d}", f"分類{i}") for i in range(number_of_cats)]
+        self.lst_of_area: list[tuple[str, str]] = [(f"{i:05d}", f"地域{i}") for i in range(number_of_areas)]
+        self.lst_of_time: list[tuple[str, str]] = [(f"{2000 + i}000000", f"{2000 + i}年") for i in range(number_of_times)]
+        # 統計表の更新日(統計表IDごとに変えられる)
+        self.UPDATED_DATE: str = "2024-01-01"
+        self.dct_of_updated_date: dict[str, str] = {}
+        # 受け付けたリクエストの数と、返したバイト数
+        self.count_of_requests: int = 0
+        self.bytes_of_responses: int = 0
+        # APIごとのリクエストの数
+        self.dct_of_count_of_requests: dict[str, int] = {}
+        self.lock: Lock = Lock()
+        self.httpd: ThreadingHTTPServer | None = None
+        self.thread: Thread | None = None
+
+    def __enter__(self) -> "FakeEStatServer":
+        self.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
+
+    @property
+    def url_of_api(self) -> str:
+        """APIのURLの共通部分を返します"""
+        if self.httpd is None:
+            raise Exception("疑似サーバーが起動していません。")
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/rest/{self.VERSION}/app"
+
+    def start(self) -> str:
+        """空いているポートで起動して、APIのURLの共通部分を返します"""
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), _FakeEStatHandler)
+        self.httpd.daemon_threads = True
+        setattr(self.httpd, "fake", self)
+        self.thread = Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self.url_of_api
+
+    def stop(self) -> None:
+        """停止します"""
+        if self.httpd is not None:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def _count(self, path: str, size: int) -> None:
+        """リクエストの数と、返したバイト数を数えます"""
+        name: str = path.rsplit("/", 1)[-1]
+        with self.lock:
+            self.count_of_requests += 1
+            self.bytes_of_responses += size
+            self.dct_of_count_of_requests[name] = self.dct_of_count_of_requests.get(name, 0) + 1
+
+    def get_count_of_requests(self, *names: str) -> int:
+        """指定のAPIのリクエストの数を取得します"""
+        with self.lock:
+            return sum(self.dct_of_count_of_requests.get(name, 0) for name in names)
+
+    def get_latency(self, params: dict) -> float:
+        """リクエストの応答の遅延(秒)を取得します"""
+        return self.LATENCY + self.LATENCY_PER_ROW * int(params.get("limit", 0))
+
+    def handle(self, path: str, params: dict) -> bytes:
+        """パスとパラメータに応じて、レスポンスの本文を作成します"""
+        name: str = path.rsplit("/", 1)[-1]
+        data_type: str = "json" if "/json/" in path else "csv" if name.startswith("getSimple") else "xml"
+        match name:
+            case "getStatsList" | "getSimpleStatsList":
+                return self.build_stats_list(data_type, params)
+            case "getStatsData" | "getSimpleStatsData":
+                return self.build_stats_data(data_type, params)
+            case "getMetaInfo":
+                return self.build_meta_info(params)
+            case _:
+                raise Exception(f"そのAPIは対応していません。: {path}")
+
+    def _get_rows_of_ids(self, params: dict) -> tuple[list[tuple], int]:
+        """統計表IDの一覧のページと総件数を取得します"""
+        start: int = int(params.get("startPosition", 1))
+        limit: int = int(params.get("limit", 100000))
+        search_word: str = params.get("searchWord", "")
+        # 検索語がない場合は、全件を作らずにページの分だけ作る
+        if search_word:
+            numbers: Any = [i for i in range(1, self.NUMBER_OF_IDS + 1) if search_word in self._get_row_of_id(i)[1] + self._get_row_of_id(i)[2]]
+        else:
+            numbers = range(1, self.NUMBER_OF_IDS + 1)
+        rows: list[tuple] = [self._get_row_of_id(i) for i in numbers[start - 1 : start - 1 + limit]]
+        return rows, len(numbers)
+
+    def _get_row_of_id(self, i: int) -> tuple[str, str, str]:
+        """統計表ID、統計名、表題を作成します"""
+        return f"{i:010d}", f"統計調査{i % 97}", f"表題{i} 都道府県別の人口と世帯数"
+
+    def build_stats_list(self, data_type: str, params: dict) -> bytes:
+        """統計表IDの一覧のレスポンスを作成します"""
+        rows, number = self._get_rows_of_ids(params)
+        start: int = int(params.get("startPosition", 1))
+        end: int = start + len(rows) - 1
+        next_key: str = str(end + 1) if end < number else ""
+        match data_type:
+            case "xml":
+                lst: list[str] = [
+                    '<?xml version="1.0" encoding="UTF-8"?><GET_STATS_LIST><RESULT><STATUS>0</STATUS></RESULT><DATALIST_INF>',
+                    f"<NUMBER>{number}</NUMBER><RESULT_INF><FROM_NUMBER>{start}</FROM_NUMBER><TO_NUMBER>{end}</TO_NUMBER>",
+                    f"<NEXT_KEY>{next_key}</NEXT_KEY>" if next_key else "",
+                    "</RESULT_INF>",
+                ]
+                lst.extend(f'<TABLE_INF id="{i}"><STAT_NAME code="00000">{n}</STAT_NAME><TITLE>{t}</TITLE></TABLE_INF>' for i, n, t in rows)
+                lst.append("</DATALIST_INF></GET_STATS_LIST>")
+                return "".join(lst).encode()
+            case "json":
+                datalist_inf: dict = {"NUMBER": number, "RESULT_INF": {"FROM_NUMBER": start, "TO_NUMBER": end}}
+                if next_key:
+                    datalist_inf["RESULT_INF"]["NEXT_KEY"] = int(next_key)
+                if rows:
+                    datalist_inf["TABLE_INF"] = [{"@id": i, "STATISTICS_NAME": n, "TITLE": t} for i, n, t in rows]
+                return json.dumps({"GET_STATS_LIST": {"RESULT": {"STATUS": 0}, "DATALIST_INF": datalist_inf}}, ensure_ascii=False).encode()
+            case _:
+                lst = [
+                    '"RESULT"',
+                    '"STATUS","ERROR_MSG"',
+                    '"0","正常に終了しました。"',
+                    "",
+                    '"RESULT_INF"',
+                    '"NUMBER","FROM_NUMBER","TO_NUMBER","NEXT_KEY"',
+                    f'"{number}","{start}","{end}","{next_key}"',
+                    "",
+                    '"STAT_INF"',
+                    '"TABLE_INF","STAT_CODE","STAT_NAME","TITLE"',
+                ]
+                lst.extend(f'"{i}","00000","{n}","{t}"' for i, n, t in rows)
+                return ("\n".join(lst) + "\n").encode()
+
+    def _get_classes(self, params: dict) -> list[tuple[str, str, list[tuple[str, str]]]]:
+        """パラメータで絞り込んだ分類事項を取得します"""
+
+        def _filter(lst: list[tuple[str, str]], name: str) -> list[tuple[str, str]]:
+            # コードの指定と、範囲の指定(From、To)
+            codes: str = params.get(f"cd{name}", "")
+            if codes:
+                lst = [e for e in lst if e[0] in codes.split(",")]
+            if params.get(f"cd{name}From"):
+                lst = [e for e in lst if e[0] >= params[f"cd{name}From"]]
+            if params.get(f"cd{name}To"):
+                lst = [e for e in lst if e[0] <= params[f"cd{name}To"]]
+            return lst
+
+        return [
+            ("cat01", "分類", _filter(self.lst_of_cat, "Cat01")),
+            ("area", "地域", _filter(self.lst_of_area, "Area")),
+            ("time", "時間軸（年次）", _filter(self.lst_of_time, "Time")),
+        ]
+
+    def get_rows_of_table(self, params: dict) -> tuple[list[tuple], int]:
+        """指定の統計表のページ(表章項目、分類事項のコード、単位、値)と総件数を取得します"""
+        start: int = int(params.get("startPosition", 1))
+        limit: int = int(params.get("limit", 100000))
+        cats, areas, times = (lst for _, _, lst in self._get_classes(params))
+        total: int = len(cats) * len(areas) * len(times)
+        rows: list[tuple] = []
+        # 値は、絞り込む前の統計表の位置から求める(絞り込んでも、同じセルは同じ値になる)
+        index_of_cat: dict[str, int] = {code: i for i, (code, _) in enumerate(self.lst_of_cat)}
+        index_of_area: dict[str, int] = {code: i for i, (code, _) in enumerate(self.lst_of_area)}
+        index_of_time: dict[str, int] = {code: i for i, (code, _) in enumerate(self.lst_of_time)}
+        # 全件を作らずに、ページの位置から分類事項の組み合わせを求める
+        for p in range(start - 1, min(start - 1 + limit, total)):
+            c, rest = divmod(p, len(areas) * len(times))
+            a, t = divmod(rest, len(times))
+            q: int = (index_of_cat[cats[c][0]] * len(self.lst_of_area) + index_of_area[areas[a][0]]) * len(self.lst_of_time) + index_of_time[
+                times[t][0]
+            ]
+            value: str = "-" if q % 97 == 96 else str((q * 37) % 100000)
+            rows.append(("020", cats[c][0], areas[a][0], times[t][0], "人", value))
+        return rows, total
+
+    def build_stats_data(self, data_type: str, params: dict) -> bytes:
+        """指定の統計表のレスポンスを作成します"""
+        rows, total = self.get_rows_of_table(params)
+        start: int = int(params.get("startPosition", 1))
+        end: int = start + len(rows) - 1
+        next_key: str = str(end + 1) if end < total else ""
+        with_meta: bool = params.get("metaGetFlg", "Y") == "Y"
+        classes: list = self._get_classes(params)
+        match data_type:
+            case "xml":
+                lst: list[str] = [
+                    '<?xml version="1.0" encoding="UTF-8"?><GET_STATS_DATA><RESULT><STATUS>0</STATUS></RESULT><STATISTICAL_DATA>',
+                    f"<RESULT_INF><TOTAL_NUMBER>{total}</TOTAL_NUMBER><FROM_NUMBER>{start}</FROM_NUMBER><TO_NUMBER>{end}</TO_NUMBER>",
+                    f"<NEXT_KEY>{next_key}</NEXT_KEY>" if next_key else "",
+                    "</RESULT_INF>",
+                ]
+                if with_meta:
+                    lst.append('<CLASS_INF><CLASS_OBJ id="tab" name="表章項目"><CLASS code="020" name="人口" level="" unit="人"/></CLASS_OBJ>')
+                    for obj_id, obj_name, lst_of_class in classes:
+                        lst.append(f"<CLASS_OBJ id={quoteattr(obj_id)} name={quoteattr(obj_name)}>")
+                        lst.extend(f'<CLASS code="{c}" name="{n}" level="1"/>' for c, n in lst_of_class)
+                        lst.append("</CLASS_OBJ>")
+                    lst.append("</CLASS_INF>")
+                lst.append('<DATA_INF><NOTE char="-">数値が得られないもの</NOTE>')
+                lst.extend(f'<VALUE tab="{r[0]}" cat01="{r[1]}" area="{r[2]}" time="{r[3]}" unit="{r[4]}">{r[5]}</VALUE>' for r in rows)
+                lst.append("</DATA_INF></STATISTICAL_DATA></GET_STATS_DATA>")
+                return "".join(lst).encode()
+            case "json":
+                statistical_data: dict = {"RESULT_INF": {"TOTAL_NUMBER": total, "FROM_NUMBER": start, "TO_NUMBER": end}}
+                if next_key:
+                    statistical_data["RESULT_INF"]["NEXT_KEY"] = int(next_key)
+                if with_meta:
+                    statistical_data["CLASS_INF"] = self._get_class_inf_of_json(classes)
+                statistical_data["DATA_INF"] = {
+                    "VALUE": [{"@tab": r[0], "@cat01": r[1], "@area": r[2], "@time": r[3], "@unit": r[4], "$": r[5]} for r in rows]
+                }
+                return json.dumps({"GET_STATS_DATA": {"RESULT": {"STATUS": 0}, "STATISTICAL_DATA": statistical_data}}, ensure_ascii=False).encode()
+            case _:
+                lst = [
+                    '"RESULT"',
+                    '"STATUS","ERROR_MSG"',
+                    '"0","正常に終了しました。"',
+                    "",
+                    '"RESULT_INF"',
+                    '"TOTAL_NUMBER","FROM_NUMBER","TO_NUMBER","NEXT_KEY"',
+                    f'"{total}","{start}","{end}","{next_key}"',
+                    "",
+                    '"VALUE"',
+                ]
+                if with_meta:
+                    # コードと名称の列を並べる
+                    names: dict = {"020": "人口"}
+                    for _, _, lst_of_class in classes:
+                        names.update(lst_of_class)
+                    lst.append('"tab_code","表章項目","cat01_code","分類","area_code","地域","time_code","時間軸（年次）","unit","value"')
+                    lst.extend(
+                        f'"{r[0]}","{names[r[0]]}","{r[1]}","{names[r[1]]}","{r[2]}","{names[r[2]]}","{r[3]}","{names[r[3]]}","{r[4]}","{r[5]}"'
+                        for r in rows
+                    )
+                else:
+                    lst.append('"tab_code","cat01_code","area_code","time_code","unit","value"')
+                    lst.extend(",".join(f'"{x}"' for x in r) for r in rows)
+                return ("\n".join(lst) + "\n").encode()
+
+    def _get_class_inf_of_json(self, classes: list) -> dict:
+        """JSONのメタ情報(CLASS_INF)を作成します"""
+        lst_of_obj: list = [{"@id": "tab", "@name": "表章項目", "CLASS": {"@code": "020", "@name": "人口", "@level": "", "@unit": "人"}}]
+        for obj_id, obj_name, lst_of_class in classes:
+            lst_of_obj.append({"@id": obj_id, "@name": obj_name, "CLASS": [{"@code": c, "@name": n, "@level": "1"} for c, n in lst_of_class]})
+        return {"CLASS_OBJ": lst_of_obj}
+
+    def build_meta_info(self, params: dict) -> bytes:
+        """指定の統計表のメタ情報のレスポンスを作成します"""
+        _, total = self.get_rows_of_table({"limit": 0})
+        metadata_inf: dict = {
+            "TABLE_INF": {
+                "@id": params.get("statsDataId", ""),
+                "STAT_NAME": {"$": "統計調査"},
+                "TITLE": "都道府県別の人口",
+                "OVERALL_TOTAL_NUMBER": total,
+                "UPDATED_DATE": self.dct_of_updated_date.get(params.get("statsDataId", ""), self.UPDATED_DATE),
+            },
+            "CLASS_INF": self._get_class_inf_of_json(self._get_classes({})),
+        }
+        return json.dumps({"GET_META_INFO": {"RESULT": {"STATUS": 0}, "METADATA_INF": metadata_inf}}, ensure_ascii=False).encode()
+
+
+class _FakeEStatHandler(BaseHTTPRequestHandler):
+    """疑似サーバーのリクエストを処理するクラス"""
+
+    # 接続を使い回せるようにする
+    protocol_version: str = "HTTP/1.1"
+    # ヘッダーと本文を分けて送るため、遅延ACKで待たされないようにする
+    disable_nagle_algorithm: bool = True
+
+    def do_GET(self) -> None:
+        """GETのリクエストを処理します"""
+        fake: FakeEStatServer = getattr(self.server, "fake")
+        url: Any = urlsplit(self.path)
+        params: dict = {k: v[0] for k, v in parse_qs(url.query).items()}
+        try:
+            body: bytes = fake.handle(url.path, params)
+            status: int = 200
+        except Exception as e:
+            body = str(e).encode()
+            status = 404
+        latency: float = fake.get_latency(params)
+        if latency > 0:
+            time.sleep(latency)
+        headers: dict = {"Content-Type": "application/octet-stream"}
+        if status == 200 and fake.use_gzip and "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body, compresslevel=1)
+            headers["Content-Encoding"] = "gzip"
+        headers["Content-Length"] = str(len(body))
+        self.send_response(status)
+        for k, v in headers.items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+        fake._count(url.path, len(body))
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """アクセスログは出力しません"""
+        pass
@@ -93,6 +93,21 @@ class GJGS_With_Cui:
             pass
         return lst
 
+    def _input_text(self, msg: str) -> str:
+        """1つの文字列を入力します(空欄も可)"""
+        text: str = ""
+        try:
+            text = input(f"{msg}(空欄の場合は、指定しない): ").strip()
+        except KeyboardInterrupt:
+            raise
+        except Exception as e:
+            print(f"error: \n{str(e)}")
+        else:
+            pass
+        finally:
+            pass
+        return text
+
     def _input_stats_data_id(self) -> str:
         """統計表IDを入力します"""
         text: str = ""
@@ -173,9 +188,16 @@ async def main() -> bool:
         try:
             obj_of_cls.APP_ID = obj_with_cui._input_app_id()
             obj_of_cls.lst_of_data_type = obj_with_cui._select_element(obj_of_cls.dct_of_data_type)
+            if obj_with_cui._input_bool(f"{obj_of_cls.search_stats_data_ids_from_api_with_async.__doc__} => 行いますか？"):
+                # 一覧の全件を取得しなくても、APIで検索した結果は一覧に追加される
+                obj_of_cls.SEARCH_WORD = obj_with_cui._input_text("検索語を入力してください。")
+                obj_of_cls.STATS_FIELD = obj_with_cui._input_text("統計分野を2桁もしくは4桁の数字で入力してください。")
+                obj_of_cls.SURVEY_YEARS = obj_with_cui._input_text("調査年月をyyyy、yyyymm、もしくはyyyymm-yyyymmで入力してください。")
+                obj_of_cls.show_stats_data_ids(await obj_of_cls.search_stats_data_ids_from_api_with_async())
             if obj_with_cui._input_bool(f"{obj_of_cls.write_stats_data_ids_to_file.__doc__} => 行いますか？"):
-                # 取得方法は非同期のみ
-                obj_of_cls.lst_of_get_type = list(list(obj_of_cls.dct_of_get_type.items())[0])
+                # 取得方法は非同期、並行、パイプラインのみ
+                obj_of_cls.lst_of_get_type = obj_with_cui._select_element({k: v for k, v in obj_of_cls.dct_of_get_type.items() if k != "同期"})
+                obj_of_cls.lst_of_catalog_type = obj_with_cui._select_element(obj_of_cls.dct_of_catalog_type)
                 try:
                     # 統計表IDをテキストファイルに書き出す
                     await obj_of_cls.write_stats_data_ids_to_file()
@@ -187,23 +209,59 @@ async def main() -> bool:
                     obj_of_lt.logger.info(f"{obj_of_cls.write_stats_data_ids_to_file.__doc__} => 成功しました。")
                 finally:
                     pass
-            obj_of_cls.STATS_DATA_ID = obj_with_cui._input_stats_data_id()
-            # 取得方法は同期のみ
-            obj_of_cls.lst_of_get_type = list(list(obj_of_cls.dct_of_get_type.items())[1])
-            obj_of_cls.get_table_from_api()
-            if obj_of_cls.pd_df is None:
-                raise Exception("統計表IDを入力してください。")
-            if obj_with_cui._input_bool("フィルターをかけますか？"):
-                obj_of_cls.lst_of_match_type = obj_with_cui._select_element(obj_of_cls.dct_of_match_type)
-                obj_of_cls.lst_of_keyword = obj_with_cui._input_lst_of_text("抽出するキーワードを入力してください。")
-                if len(obj_of_cls.lst_of_keyword) == 1:
-                    obj_of_cls.lst_of_logic_type = list(list(obj_of_cls.dct_of_logic_type.items())[0])
+            if obj_with_cui._input_bool(f"{obj_of_cls.query_dataset.__doc__} => 行いますか？"):
+                # 保存した統計表は、取得し直さずに集計する
+                tables: list = [*obj_of_cls.get_dct_of_table_in_dataset(), "dataset(全ての統計表を縦に結合したテーブル)"]
+                obj_of_lt.logger.info("テーブル名 => " + ", ".join(tables))
+                obj_of_cls.SQL_OF_QUERY = obj_with_cui._input_text("SQLを入力してください。")
+                obj_of_cls.COLUMN_OF_PIVOT = obj_with_cui._input_text("集計結果をピボットする列名を入力してください。")
+                if obj_of_cls.COLUMN_OF_PIVOT:
+                    obj_of_cls.COLUMN_OF_VALUES = obj_with_cui._input_text("ピボットする値の列名を入力してください。") or "値"
+                    obj_of_cls.lst_of_aggregate_type = obj_with_cui._select_element(obj_of_cls.dct_of_aggregate_type)
+                obj_of_cls.query_dataset()
+                obj_of_cls.show_table()
+                if obj_with_cui._input_bool(f"{obj_of_cls.output_table_to_file.__doc__} => 行いますか？"):
+                    obj_of_cls.lst_of_output_type = obj_with_cui._select_element(obj_of_cls.dct_of_output_type)
+                    obj_of_cls.output_table_to_file()
+            if obj_with_cui._input_bool(f"{obj_of_cls.download_tables_to_dataset_with_async.__doc__} => 行いますか？"):
+                if obj_with_cui._input_bool("統計表IDの一覧をフィルターにかけた結果を使いますか？"):
+                    obj_of_cls.lst_of_match_type = obj_with_cui._select_element(obj_of_cls.dct_of_match_type)
+                    obj_of_cls.lst_of_keyword = obj_with_cui._input_lst_of_text("抽出するキーワードを入力してください。")
+                    if len(obj_of_cls.lst_of_keyword) == 1:
+                        obj_of_cls.lst_of_logic_type = list(list(obj_of_cls.dct_of_logic_type.items())[0])
+                    else:
+                        obj_of_cls.lst_of_logic_type = obj_with_cui._select_element(obj_of_cls.dct_of_logic_type)
+                    lst_of_stats_data_id: list = obj_of_cls.get_lst_of_stats_data_id_from_catalog()
+                else:
+                    lst_of_stats_data_id: list = obj_with_cui._input_lst_of_text("統計表IDを入力してください。")
+                # データセットに保存した統計表は、新しい期間だけ取得する
+                incremental: bool = obj_with_cui._input_bool("データセットに保存した統計表は、新しい期間だけ取得しますか？")
+                await obj_of_cls.download_tables_to_dataset_with_async(lst_of_stats_data_id, incremental)
+            else:
+                obj_of_cls.STATS_DATA_ID = obj_with_cui._input_stats_data_id()
+                if obj_with_cui._input_bool(f"{obj_of_cls.output_pages_of_table_to_file_with_async.__doc__} => 行いますか？"):
+                    # 全体をメモリに載せずに、ページごとにファイルに追記する
+                    obj_of_cls.lst_of_output_type = obj_with_cui._select_element(obj_of_cls.dct_of_output_type)
+                    await obj_of_cls.output_pages_of_table_to_file_with_async()
                 else:
-                    obj_of_cls.lst_of_logic_type = obj_with_cui._select_element(obj_of_cls.dct_of_logic_type)
-                obj_of_cls.pd_df = obj_of_cls.filter_pd_df(obj_of_cls.pd_df)
-            obj_of_cls.show_table()
-            if obj_with_cui._input_bool(f"{obj_of_cls.output_table_to_csv.__doc__} => 行いますか？"):
-                obj_of_cls.output_table_to_csv()
+                    if obj_with_cui._input_bool("フィルターをかけますか？"):
+                        obj_of_cls.lst_of_match_type = obj_with_cui._select_element(obj_of_cls.dct_of_match_type)
+                        obj_of_cls.lst_of_keyword = obj_with_cui._input_lst_of_text("抽出するキーワードを入力してください。")
+                        if len(obj_of_cls.lst_of_keyword) == 1:
+                            obj_of_cls.lst_of_logic_type = list(list(obj_of_cls.dct_of_logic_type.items())[0])
+                        else:
+                            obj_of_cls.lst_of_logic_type = obj_with_cui._select_element(obj_of_cls.dct_of_logic_type)
+                        # 取得する前に条件を決めて、APIで絞り込める条件は絞り込む
+                        await obj_of_cls.get_filtered_table_from_api_with_async()
+                    else:
+                        # 統計表IDの一覧の取得と同じ接続を使い回す
+                        await obj_of_cls.get_table_from_api_with_async()
+                    if obj_of_cls.pl_df is None:
+                        raise Exception("統計表IDを入力してください。")
+                    obj_of_cls.show_table()
+                    if obj_with_cui._input_bool(f"{obj_of_cls.output_table_to_file.__doc__} => 行いますか？"):
+                        obj_of_cls.lst_of_output_type = obj_with_cui._select_element(obj_of_cls.dct_of_output_type)
+                        obj_of_cls.output_table_to_file()
         except KeyboardInterrupt:
             sys.exit(0)
         except Exception as e:
@@ -215,6 +273,7 @@ async def main() -> bool:
             pass
         if obj_with_cui._input_bool("終了しますか？"):
             break
+    await obj_of_cls.aclose()
     return result
 
 
@@ -4,12 +4,12 @@ import sys
 from logging import Logger
 from pathlib import Path
 from threading import Event
+from typing import Any, Coroutine, cast
 
 import httpx
-import pandas as pd
-from pandas.io.parsers import TextFileReader
-from PySide6.QtCore import QModelIndex, QObject, Qt, QThread, Signal, Slot
-from PySide6.QtGui import QFont, QFontDatabase, QStandardItem, QStandardItemModel
+import polars as pl
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, QObject, QPersistentModelIndex, Qt, QThread, QTimer, Signal, Slot
+from PySide6.QtGui import QFont, QFontDatabase
 from PySide6.QtWidgets import (
     QApplication,
     QComboBox,
@@ -32,7 +32,7 @@ from PySide6.QtWidgets import (
 )
 
 from source.common.common import DatetimeTools, GUITools, LogTools, PlatformTools
-from source.get_japan_government_statistics.gjgs_class import GetJapanGovernmentStatistics
+from source.get_japan_government_statistics.gjgs_class import GetJapanGovernmentStatistics, OperationCancelledError
 
 
 class GetIdsWorker(QObject):
@@ -42,27 +42,25 @@ class GetIdsWorker(QObject):
     error: Signal = Signal(str)
     log: Signal = Signal(str)
 
-    def __init__(self, logger: Logger, APP_ID: str, lst_of_data_type: list, lst_of_get_type: list):
+    def __init__(self, logger: Logger, obj_of_cls: GetJapanGovernmentStatistics):
         """初期化します"""
         super().__init__()
+        # この処理だけをキャンセルする(共有するインスタンスには設定しない)
         self.cancel_event: Event = Event()
-        # 共有する
+        # 共有する(接続とイベントループを使い回す)
         self.logger: Logger = logger
-        self.obj_of_cls: GetJapanGovernmentStatistics = GetJapanGovernmentStatistics(self.logger, self.cancel_event)
-        self.obj_of_cls.APP_ID = APP_ID
-        self.obj_of_cls.lst_of_data_type = lst_of_data_type
-        self.obj_of_cls.lst_of_get_type = lst_of_get_type
+        self.obj_of_cls: GetJapanGovernmentStatistics = obj_of_cls
 
     def run(self) -> None:
         """実行します"""
         result: bool = False
-        loop: asyncio.AbstractEventLoop | None = None
         try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            result = loop.run_until_complete(self.obj_of_cls.write_stats_data_ids_to_file())
+            # 常駐するイベントループで実行して、完了を待つ
+            result = self.obj_of_cls.submit(self.obj_of_cls.write_stats_data_ids_to_file(cancel_event=self.cancel_event)).result()
         except asyncio.CancelledError:
             result = False
+        except OperationCancelledError:
+            result = False
         except httpx.HTTPStatusError as e:
             self.logger.error(str(e))
             self.error.emit(str(e))
@@ -75,9 +73,7 @@ class GetIdsWorker(QObject):
         else:
             pass
         finally:
-            if loop is not None:
-                loop.run_until_complete(loop.shutdown_asyncgens())
-                loop.close()
+            pass
         if result:
             self.logger.info("統計表IDの取得が完了しました。")
         else:
@@ -89,6 +85,231 @@ class GetIdsWorker(QObject):
         self.cancel_event.set()
 
 
+class SearchIdsWorker(QObject):
+    """APIで統計表IDの一覧を検索する処理の非同期ワーカー"""
+
+    finished: Signal = Signal(bool)
+    error: Signal = Signal(str)
+    page: Signal = Signal(list)
+
+    def __init__(self, logger: Logger, obj_of_cls: GetJapanGovernmentStatistics):
+        """初期化します"""
+        super().__init__()
+        # 共有する(接続とイベントループを使い回す)
+        self.logger: Logger = logger
+        self.obj_of_cls: GetJapanGovernmentStatistics = obj_of_cls
+
+    def run(self) -> None:
+        """実行します"""
+        result: bool = False
+        try:
+            # ページの到着ごとに、検索結果を一覧に渡す
+            coro: Coroutine = self.obj_of_cls.search_stats_data_ids_from_api_with_async(self.page.emit)
+            # 常駐するイベントループで実行して、完了を待つ
+            self.obj_of_cls.submit(coro).result()
+        except httpx.HTTPStatusError as e:
+            self.logger.error(str(e))
+            self.error.emit(str(e))
+        except httpx.RequestError as e:
+            self.logger.error(str(e))
+            self.error.emit(str(e))
+        except Exception as e:
+            self.logger.error(str(e))
+            self.error.emit(str(e))
+        else:
+            result = True
+        finally:
+            pass
+        self.finished.emit(result)
+
+
+class GetTableWorker(QObject):
+    """指定の統計表を取得する処理の非同期ワーカー"""
+
+    finished: Signal = Signal(bool)
+    error: Signal = Signal(str)
+
+    def __init__(self, logger: Logger, obj_of_cls: GetJapanGovernmentStatistics, stats_data_id: str, use_filter: bool = False):
+        """初期化します"""
+        super().__init__()
+        # 共有する(接続とイベントループを使い回す)
+        self.logger: Logger = logger
+        self.obj_of_cls: GetJapanGovernmentStatistics = obj_of_cls
+        # 取得する統計表ID(取得中に選択が変わっても、変えない)
+        self.stats_data_id: str = stats_data_id
+        # フィルターの条件で絞り込んで取得するかどうか
+        self.use_filter: bool = use_filter
+
+    def run(self) -> None:
+        """実行します"""
+        result: bool = False
+        try:
+            if self.use_filter:
+                coro: Coroutine = self.obj_of_cls.get_filtered_table_from_api_with_async(self.stats_data_id)
+            else:
+                coro = self.obj_of_cls.get_table_from_api_with_async(self.stats_data_id)
+            # 常駐するイベントループで実行して、完了を待つ
+            result = self.obj_of_cls.submit(coro).result()
+        except httpx.HTTPStatusError as e:
+            self.logger.error(str(e))
+            self.error.emit(str(e))
+        except httpx.RequestError as e:
+            self.logger.error(str(e))
+            self.error.emit(str(e))
+        except Exception as e:
+            self.logger.error(str(e))
+            self.error.emit(str(e))
+        else:
+            pass
+        finally:
+            pass
+        self.finished.emit(result)
+
+
+class OutputTableWorker(QObject):
+    """指定の統計表を取得しながらファイルに出力する処理の非同期ワーカー"""
+
+    finished: Signal = Signal(bool)
+    error: Signal = Signal(str)
+
+    def __init__(self, logger: Logger, obj_of_cls: GetJapanGovernmentStatistics, stats_data_id: str):
+        """初期化します"""
+        super().__init__()
+        # 共有する(接続とイベントループを使い回す)
+        self.logger: Logger = logger
+        self.obj_of_cls: GetJapanGovernmentStatistics = obj_of_cls
+        # 出力する統計表ID(出力中に選択が変わっても、変えない)
+        self.stats_data_id: str = stats_data_id
+
+    def run(self) -> None:
+        """実行します"""
+        result: bool = False
+        try:
+            # 常駐するイベントループで実行して、完了を待つ
+            result = self.obj_of_cls.submit(self.obj_of_cls.output_pages_of_table_to_file_with_async(self.stats_data_id)).result()
+        except Exception as e:
+            self.logger.error(str(e))
+            self.error.emit(str(e))
+        else:
+            pass
+        finally:
+            pass
+        self.finished.emit(result)
+
+
+class DownloadTablesWorker(QObject):
+    """複数の統計表を一括で出力する処理の非同期ワーカー"""
+
+    finished: Signal = Signal(bool)
+    error: Signal = Signal(str)
+
+    def __init__(self, logger: Logger, obj_of_cls: GetJapanGovernmentStatistics, lst_of_stats_data_id: list, incremental: bool = False):
+        """初期化します"""
+        super().__init__()
+        # 共有する(接続とイベントループを使い回す)
+        self.logger: Logger = logger
+        self.obj_of_cls: GetJapanGovernmentStatistics = obj_of_cls
+        self.lst_of_stats_data_id: list = lst_of_stats_data_id
+        # 保存した統計表は、新しい期間だけ取得するかどうか
+        self.incremental: bool = incremental
+
+    def run(self) -> None:
+        """実行します"""
+        result: bool = False
+        try:
+            # 常駐するイベントループで実行して、完了を待つ
+            coro: Coroutine = self.obj_of_cls.download_tables_to_dataset_with_async(self.lst_of_stats_data_id, self.incremental)
+            result = self.obj_of_cls.submit(coro).result()
+        except Exception as e:
+            self.logger.error(str(e))
+            self.error.emit(str(e))
+        else:
+            pass
+        finally:
+            pass
+        self.finished.emit(result)
+
+
+class PolarsTableModel(QAbstractTableModel):
+    """polarsのデータフレームを、表示するセルだけ文字列に変換する読み取り専用のモデル"""
+
+    def __init__(self, pl_df: pl.DataFrame | None = None):
+        """初期化します"""
+        super().__init__()
+        self.pl_df: pl.DataFrame = pl.DataFrame()
+        # 列ごとのSeries(セルの参照用)
+        self.lst_of_series: list[pl.Series] = []
+        # 右寄せにする列
+        self.lst_of_numeric: list[bool] = []
+        if pl_df is not None:
+            self.set_pl_df(pl_df)
+
+    def set_pl_df(self, pl_df: pl.DataFrame) -> None:
+        """表示するデータフレームを設定します"""
+        self.beginResetModel()
+        self._set_columns(pl_df)
+        self.endResetModel()
+
+    def append_pl_df(self, pl_df: pl.DataFrame) -> None:
+        """データフレームの行を末尾に追加します"""
+        if pl_df.is_empty():
+            return
+        first: int = self.pl_df.height
+        self.beginInsertRows(QModelIndex(), first, first + pl_df.height - 1)
+        self._set_columns(pl.concat([self.pl_df, pl_df]))
+        self.endInsertRows()
+
+    def _set_columns(self, pl_df: pl.DataFrame) -> None:
+        """列ごとのSeriesを設定します"""
+        # 行番号で参照するため、連続したメモリにまとめる
+        self.pl_df = pl_df.rechunk()
+        self.lst_of_series = self.pl_df.get_columns()
+        self.lst_of_numeric = [series.dtype.is_numeric() for series in self.lst_of_series]
+
+    def get_row(self, row: int) -> tuple:
+        """指定の行を取得します"""
+        return self.pl_df.row(row)
+
+    def rowCount(self, parent: QModelIndex | QPersistentModelIndex = QModelIndex()) -> int:
+        """行数を返します"""
+        return 0 if parent.isValid() else self.pl_df.height
+
+    def columnCount(self, parent: QModelIndex | QPersistentModelIndex = QModelIndex()) -> int:
+        """列数を返します"""
+        return 0 if parent.isValid() else self.pl_df.width
+
+    def data(self, index: QModelIndex | QPersistentModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        """セルの値を返します"""
+        if not index.isValid():
+            return None
+        match role:
+            case Qt.ItemDataRole.DisplayRole:
+                value: Any = self.lst_of_series[index.column()][index.row()]
+                return "" if value is None else str(value)
+            case Qt.ItemDataRole.TextAlignmentRole:
+                if self.lst_of_numeric[index.column()]:
+                    return int(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        """見出しを返します"""
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.pl_df.columns[section] if section < self.pl_df.width else None
+        return str(section + 1)
+
+    def sort(self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder) -> None:
+        """列の値で並べ替えます"""
+        if column < 0 or column >= self.pl_df.width:
+            return
+        self.layoutAboutToBeChanged.emit()
+        self._set_columns(
+            self.pl_df.sort(self.pl_df.columns[column], descending=order == Qt.SortOrder.DescendingOrder, nulls_last=True, maintain_order=True)
+        )
+        self.layoutChanged.emit()
+
+
 class MainApp_Of_GJGS(QMainWindow):
     """GUIアプリ"""
 
@@ -104,9 +325,30 @@ class MainApp_Of_GJGS(QMainWindow):
         self._setup_log()
         self.worker_of_getting_ids: GetIdsWorker | None = None
         self.thread_of_getting_ids: QThread | None = None
+        self.worker_of_searching_ids: SearchIdsWorker | None = None
+        self.thread_of_searching_ids: QThread | None = None
+        self.worker_of_getting_table: GetTableWorker | None = None
+        self.thread_of_getting_table: QThread | None = None
+        self.worker_of_outputting_table: OutputTableWorker | None = None
+        self.thread_of_outputting_table: QThread | None = None
+        self.worker_of_downloading_tables: DownloadTablesWorker | None = None
+        self.thread_of_downloading_tables: QThread | None = None
+        # 表示中の統計表ID(選択が移っても、取得中の先読みを取り消さない)
+        self.stats_data_id_of_showing: str = ""
+        # 表示する統計表の見出し
+        self.dct_of_label_of_table: dict[str, str] = {"統計表ID": "", "統計名": "", "表題": ""}
+        # マウスを重ねた統計表ID
+        self.stats_data_id_of_hovered: str = ""
+        # マウスを重ねてから先読みするまでの待ち時間(ミリ秒)(一覧の上を通り過ぎただけでは、先読みしない)
+        self.DELAY_OF_HOVER_PREFETCH: int = 300
+        self.timer_of_hover_prefetch: QTimer = QTimer(self)
+        self.timer_of_hover_prefetch.setSingleShot(True)
+        self.timer_of_hover_prefetch.timeout.connect(self._prefetch_tables_around_selection)
 
     def closeEvent(self, event):
         """終了します"""
+        # 接続とイベントループを終了する
+        self.obj_of_cls.close()
         if self.obj_of_lt:
             self._show_info(f"ログファイルは、\n{self.obj_of_lt.file_path_of_log}\nに出力されました。")
         super().closeEvent(event)
@@ -235,6 +477,13 @@ class MainApp_Of_GJGS(QMainWindow):
             self.get_type_combo.currentIndexChanged.connect(self._get_get_type)
             self._get_get_type(0)
             self.bottom_right_form.addRow(QLabel("取得方法: "), self.get_type_combo)
+            # 保存形式
+            self.catalog_type_combo: QComboBox = QComboBox()
+            for key, desc in self.obj_of_cls.dct_of_catalog_type.items():
+                self.catalog_type_combo.addItem(f"{key}: {desc}", userData=key)
+            self.catalog_type_combo.currentIndexChanged.connect(self._get_catalog_type)
+            self._get_catalog_type(0)
+            self.bottom_right_form.addRow(QLabel("保存形式: "), self.catalog_type_combo)
             # 統計表IDの一覧を取得する
             self.get_ids_btn: QPushButton = QPushButton("統計表IDの一覧を取得する")
             self.get_ids_btn.clicked.connect(self.get_lst_of_ids)
@@ -242,6 +491,24 @@ class MainApp_Of_GJGS(QMainWindow):
             self.cancel_getting_ids_btn: QPushButton = QPushButton("統計表IDの一覧の取得をキャンセルする")
             self.cancel_getting_ids_btn.clicked.connect(self.cancel_getting_lst_of_ids)
             self.bottom_right_form.addRow(self.get_ids_btn, self.cancel_getting_ids_btn)
+            # APIで検索する検索語
+            self.search_word_text: QLineEdit = QLineEdit()
+            self.search_word_text.editingFinished.connect(self._get_search_word)
+            self.bottom_right_form.addRow(QLabel("検索語: "), self.search_word_text)
+            # APIで検索する統計分野
+            self.stats_field_text: QLineEdit = QLineEdit()
+            self.stats_field_text.setPlaceholderText("2桁もしくは4桁の数字")
+            self.stats_field_text.editingFinished.connect(self._get_stats_field)
+            self.bottom_right_form.addRow(QLabel("統計分野: "), self.stats_field_text)
+            # APIで検索する調査年月
+            self.survey_years_text: QLineEdit = QLineEdit()
+            self.survey_years_text.setPlaceholderText("yyyy、yyyymm、もしくはyyyymm-yyyymm")
+            self.survey_years_text.editingFinished.connect(self._get_survey_years)
+            self.bottom_right_form.addRow(QLabel("調査年月: "), self.survey_years_text)
+            # 統計表IDの一覧をAPIで検索する
+            self.search_ids_btn: QPushButton = QPushButton("統計表IDの一覧をAPIで検索する")
+            self.bottom_right_form.addRow(self.search_ids_btn)
+            self.search_ids_btn.clicked.connect(self.search_lst_of_ids)
             # 統計表IDの一覧を表示する
             show_ids_btn: QPushButton = QPushButton("統計表IDの一覧を表示する")
             self.bottom_right_form.addRow(show_ids_btn)
@@ -269,17 +536,65 @@ class MainApp_Of_GJGS(QMainWindow):
             self._get_logic_type(0)
             self.bottom_right_form.addRow(QLabel("抽出方法: "), self.logic_type_combo)
             # 指定の統計表を表示する
-            show_table_btn: QPushButton = QPushButton("統計表を表示する")
-            self.bottom_right_form.addRow(show_table_btn)
-            show_table_btn.clicked.connect(self.show_table)
+            self.show_table_btn: QPushButton = QPushButton("統計表を表示する")
+            self.bottom_right_form.addRow(self.show_table_btn)
+            self.show_table_btn.clicked.connect(self.show_table)
             # 指定の統計表をフィルターにかける
             filter_table_btn: QPushButton = QPushButton("統計表をフィルターにかける")
             self.bottom_right_form.addRow(filter_table_btn)
             filter_table_btn.clicked.connect(self.filter_table)
-            # 指定の統計表をCSVファイルに出力する
+            # 指定の統計表をAPIで絞り込んでから取得する
+            self.show_filtered_table_btn: QPushButton = QPushButton("統計表をフィルターの条件で取得する")
+            self.bottom_right_form.addRow(self.show_filtered_table_btn)
+            self.show_filtered_table_btn.clicked.connect(self.show_filtered_table)
+            # 指定の統計表の出力形式
+            self.output_type_combo: QComboBox = QComboBox()
+            for key, desc in self.obj_of_cls.dct_of_output_type.items():
+                self.output_type_combo.addItem(f"{key}: {desc}", userData=key)
+            self.output_type_combo.currentIndexChanged.connect(self._get_output_type)
+            self._get_output_type(0)
+            self.bottom_right_form.addRow(QLabel("出力形式: "), self.output_type_combo)
+            # 指定の統計表をファイルに出力する
             output_btn: QPushButton = QPushButton("統計表を出力する")
             self.bottom_right_form.addRow(output_btn)
             output_btn.clicked.connect(self.output_table)
+            # 指定の統計表を取得しながら、ファイルに出力する
+            self.output_pages_btn: QPushButton = QPushButton("統計表を取得しながら出力する")
+            self.bottom_right_form.addRow(self.output_pages_btn)
+            self.output_pages_btn.clicked.connect(self.output_pages_of_table)
+            # 一覧の統計表を一括で出力する
+            self.download_tables_btn: QPushButton = QPushButton("一覧の統計表を一括で出力する")
+            self.bottom_right_form.addRow(self.download_tables_btn)
+            self.download_tables_btn.clicked.connect(self.download_tables)
+            # データセットの統計表を新しい期間だけ更新する
+            self.refresh_tables_btn: QPushButton = QPushButton("データセットの統計表を新しい期間だけ更新する")
+            self.bottom_right_form.addRow(self.refresh_tables_btn)
+            self.refresh_tables_btn.clicked.connect(self.refresh_tables)
+            # データセットの統計表を集計するSQL
+            self.sql_text: QPlainTextEdit = QPlainTextEdit()
+            self.sql_text.setPlaceholderText('例: SELECT "地域", SUM("値") AS "値" FROM t_0000000001 GROUP BY 1')
+            self.sql_text.textChanged.connect(self._get_sql_of_query)
+            self.bottom_right_form.addRow(QLabel("SQL\n(テーブル名は、t_統計表ID、\nもしくはdataset): "), self.sql_text)
+            # 集計結果をピボットする列
+            self.pivot_column_text: QLineEdit = QLineEdit()
+            self.pivot_column_text.setPlaceholderText("空欄の場合は、ピボットしない")
+            self.pivot_column_text.editingFinished.connect(self._get_column_of_pivot)
+            self.bottom_right_form.addRow(QLabel("ピボットする列: "), self.pivot_column_text)
+            # ピボットする値の列
+            self.values_column_text: QLineEdit = QLineEdit(self.obj_of_cls.COLUMN_OF_VALUES)
+            self.values_column_text.editingFinished.connect(self._get_column_of_values)
+            self.bottom_right_form.addRow(QLabel("ピボットする値の列: "), self.values_column_text)
+            # ピボットする場合の集計方法
+            self.aggregate_type_combo: QComboBox = QComboBox()
+            for key, desc in self.obj_of_cls.dct_of_aggregate_type.items():
+                self.aggregate_type_combo.addItem(f"{key}: {desc}", userData=key)
+            self.aggregate_type_combo.currentIndexChanged.connect(self._get_aggregate_type)
+            self._get_aggregate_type(0)
+            self.bottom_right_form.addRow(QLabel("集計方法: "), self.aggregate_type_combo)
+            # データセットの統計表をSQLで集計する
+            query_dataset_btn: QPushButton = QPushButton("データセットの統計表をSQLで集計する")
+            self.bottom_right_form.addRow(query_dataset_btn)
+            query_dataset_btn.clicked.connect(self.query_dataset)
             # クレジット
             credit_area: QVBoxLayout = QVBoxLayout()
             self.main_layout.addLayout(credit_area)
@@ -308,9 +623,12 @@ class MainApp_Of_GJGS(QMainWindow):
             c_of_stat_name: int = 1
             # 表題
             c_of_title: int = 2
-            self.obj_of_cls.STATS_DATA_ID = self.top_left_model.item(r, c_of_id).text()
-            self.obj_of_cls.STAT_NAME = self.top_left_model.item(r, c_of_stat_name).text()
-            self.obj_of_cls.TITLE = self.top_left_model.item(r, c_of_title).text()
+            row: tuple = self.top_left_model.get_row(r)
+            self.obj_of_cls.STATS_DATA_ID = str(row[c_of_id])
+            self.obj_of_cls.STAT_NAME = str(row[c_of_stat_name])
+            self.obj_of_cls.TITLE = str(row[c_of_title])
+            # 表示ボタンを押す前に、取得しておく
+            self._prefetch_tables_around_selection()
         except Exception as e:
             self._show_error(f"error: \n{str(e)}")
         else:
@@ -320,6 +638,40 @@ class MainApp_Of_GJGS(QMainWindow):
                 f"選択された統計表ID: {self.obj_of_cls.STATS_DATA_ID}\n統計名: {self.obj_of_cls.STAT_NAME}\n表題: {self.obj_of_cls.TITLE}"
             )
 
+    @Slot(QModelIndex)
+    def _get_hovered_id_from_lst(self, index: QModelIndex) -> None:
+        """一覧からマウスを重ねた統計表IDを取得します"""
+        if not index.isValid():
+            return
+        self.stats_data_id_of_hovered = str(self.top_left_model.get_row(index.row())[0])
+        # マウスが止まってから先読みする
+        self.timer_of_hover_prefetch.start(self.DELAY_OF_HOVER_PREFETCH)
+
+    @Slot()
+    def _prefetch_tables_around_selection(self) -> None:
+        """選択した統計表と前後の統計表、マウスを重ねた統計表を先読みします(それ以外の先読みは、取り消します)"""
+        try:
+            # 入力が揃っていない場合は、先読みしない(表示する時に確認する)
+            if self.obj_of_cls.APP_ID == "" or not self.obj_of_cls.lst_of_data_type:
+                return
+            lst_of_stats_data_id: list[str] = [self.stats_data_id_of_showing, self.obj_of_cls.STATS_DATA_ID]
+            # 並べ替えた後の行番号で、前後の統計表を取得する
+            r: int = self.top_left_table.currentIndex().row()
+            if r >= 0:
+                for d in range(1, self.obj_of_cls.NUMBER_OF_ADJACENT_PREFETCH + 1):
+                    for i in (r + d, r - d):
+                        if 0 <= i < self.top_left_model.rowCount():
+                            lst_of_stats_data_id.append(str(self.top_left_model.get_row(i)[0]))
+            lst_of_stats_data_id.append(self.stats_data_id_of_hovered)
+            self.obj_of_cls.prefetch_tables(lst_of_stats_data_id)
+        except Exception as e:
+            # 先読みに失敗しても、表示する時に取得する
+            self.obj_of_lt.logger.debug(f"先読みできませんでした。 => {str(e)}")
+        else:
+            pass
+        finally:
+            pass
+
     def _setup_second_ui(self) -> bool:
         """2番目のUser Interfaceを設定します"""
         result: bool = False
@@ -329,11 +681,14 @@ class MainApp_Of_GJGS(QMainWindow):
             self.top_left_scroll_area.setWidget(self.top_left_container)
             self.top_left_table: QTableView = QTableView()
             self.top_left_container_layout.addWidget(self.top_left_table)
-            self.top_left_model: QStandardItemModel = QStandardItemModel()
-            # ヘッダーを追加する
-            self.top_left_model.setHorizontalHeaderLabels(self.obj_of_cls.header_of_ids_l)
+            # ヘッダーだけの空の一覧を表示する
+            self.top_left_model: PolarsTableModel = PolarsTableModel(pl.DataFrame(schema={h: pl.String for h in self.obj_of_cls.header_of_ids_l}))
             self.top_left_table.setModel(self.top_left_model)
+            self._enable_sorting(self.top_left_table)
             self.top_left_table.clicked.connect(self._get_id_from_lst)
+            # マウスを重ねた統計表も先読みする
+            self.top_left_table.setMouseTracking(True)
+            self.top_left_table.entered.connect(self._get_hovered_id_from_lst)
         except Exception:
             raise
         else:
@@ -346,23 +701,19 @@ class MainApp_Of_GJGS(QMainWindow):
         """3番目のUser Interfaceを設定します"""
         result: bool = False
         try:
-            if self.obj_of_cls.pd_df is None:
+            if self.obj_of_cls.pl_df is None:
                 raise Exception("統計表を表示してください。")
             self.bottom_left_container: QWidget = QWidget()
             self.bottom_left_container_layout: QVBoxLayout = QVBoxLayout(self.bottom_left_container)
             self.bottom_left_scroll_area.setWidget(self.bottom_left_container)
             self.bottom_left_table: QTableView = QTableView(self)
-            self.bottom_left_container_layout.addWidget(QLabel(f"統計表ID: {self.obj_of_cls.STATS_DATA_ID}"))
-            self.bottom_left_container_layout.addWidget(QLabel(f"統計名: {self.obj_of_cls.STAT_NAME}"))
-            self.bottom_left_container_layout.addWidget(QLabel(f"表題: {self.obj_of_cls.TITLE}"))
+            # 取得を始めた時の統計表の見出し(取得中に選択が変わっても、変えない)
+            for key, value in self.dct_of_label_of_table.items():
+                self.bottom_left_container_layout.addWidget(QLabel(f"{key}: {value}"))
             self.bottom_left_container_layout.addWidget(self.bottom_left_table)
-            self.bottom_left_model: QStandardItemModel = QStandardItemModel()
-            # ヘッダーを追加する
-            self.bottom_left_model.setHorizontalHeaderLabels(self.obj_of_cls.pd_df.columns.tolist())
-            for r in self.obj_of_cls.pd_df.itertuples(index=False):
-                items = [QStandardItem(str(v)) for v in r]
-                self.bottom_left_model.appendRow(items)
+            self.bottom_left_model: PolarsTableModel = PolarsTableModel(self.obj_of_cls.pl_df)
             self.bottom_left_table.setModel(self.bottom_left_model)
+            self._enable_sorting(self.bottom_left_table)
             self.bottom_left_table.resizeColumnsToContents()
         except Exception:
             raise
@@ -372,6 +723,15 @@ class MainApp_Of_GJGS(QMainWindow):
             pass
         return result
 
+    def _convert_rows_of_ids(self, rows: list) -> pl.DataFrame:
+        """統計表IDの一覧の行をデータフレームに変換します"""
+        return pl.DataFrame(rows, schema={h: pl.String for h in self.obj_of_cls.header_of_ids_l}, orient="row")
+
+    def _enable_sorting(self, table: QTableView) -> None:
+        """見出しのクリックで並べ替えられるようにします(最初は並べ替えません)"""
+        table.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        table.setSortingEnabled(True)
+
     def _check_first_form(self) -> bool:
         """1番目のフォームの入力を確認します"""
         result: bool = False
@@ -497,6 +857,34 @@ class MainApp_Of_GJGS(QMainWindow):
         finally:
             pass
 
+    @Slot(int)
+    def _get_catalog_type(self, index: int) -> None:
+        """保存形式を取得します"""
+        try:
+            key: str = self.catalog_type_combo.itemData(index)
+            desc: str = self.obj_of_cls.dct_of_catalog_type[key]
+            self.obj_of_cls.lst_of_catalog_type = [key, desc]
+        except Exception as e:
+            self._show_error(f"error: \n{str(e)}")
+        else:
+            pass
+        finally:
+            pass
+
+    @Slot(int)
+    def _get_output_type(self, index: int) -> None:
+        """出力形式を取得します"""
+        try:
+            key: str = self.output_type_combo.itemData(index)
+            desc: str = self.obj_of_cls.dct_of_output_type[key]
+            self.obj_of_cls.lst_of_output_type = [key, desc]
+        except Exception as e:
+            self._show_error(f"error: \n{str(e)}")
+        else:
+            pass
+        finally:
+            pass
+
     @Slot(int)
     def _get_match_type(self, index: int) -> None:
         """検索方法を取得します"""
@@ -537,6 +925,98 @@ class MainApp_Of_GJGS(QMainWindow):
         finally:
             pass
 
+    @Slot()
+    def _get_search_word(self) -> None:
+        """検索語を取得します"""
+        try:
+            self.obj_of_cls.SEARCH_WORD = self.search_word_text.text().strip()
+        except Exception as e:
+            self._show_error(f"error: \n{str(e)}")
+        else:
+            pass
+        finally:
+            pass
+
+    @Slot()
+    def _get_stats_field(self) -> None:
+        """統計分野を取得します"""
+        try:
+            tmp: str = self.stats_field_text.text().strip()
+            if tmp and not re.fullmatch(r"[0-9]{2}|[0-9]{4}", tmp):
+                raise Exception("統計分野は、2桁もしくは4桁の数字で入力してください。")
+            self.obj_of_cls.STATS_FIELD = tmp
+        except Exception as e:
+            self._show_error(f"error: \n{str(e)}")
+        else:
+            pass
+        finally:
+            pass
+
+    @Slot()
+    def _get_survey_years(self) -> None:
+        """調査年月を取得します"""
+        try:
+            tmp: str = self.survey_years_text.text().strip()
+            if tmp and not re.fullmatch(r"[0-9]{4}|[0-9]{6}|[0-9]{6}-[0-9]{6}", tmp):
+                raise Exception("調査年月は、yyyy、yyyymm、もしくはyyyymm-yyyymmで入力してください。")
+            self.obj_of_cls.SURVEY_YEARS = tmp
+        except Exception as e:
+            self._show_error(f"error: \n{str(e)}")
+        else:
+            pass
+        finally:
+            pass
+
+    @Slot()
+    def _get_sql_of_query(self) -> None:
+        """データセットの統計表を集計するSQLを取得します"""
+        try:
+            self.obj_of_cls.SQL_OF_QUERY = self.sql_text.toPlainText().strip()
+        except Exception as e:
+            self._show_error(f"error: \n{str(e)}")
+        else:
+            pass
+        finally:
+            pass
+
+    @Slot()
+    def _get_column_of_pivot(self) -> None:
+        """集計結果をピボットする列名を取得します"""
+        try:
+            self.obj_of_cls.COLUMN_OF_PIVOT = self.pivot_column_text.text().strip()
+        except Exception as e:
+            self._show_error(f"error: \n{str(e)}")
+        else:
+            pass
+        finally:
+            pass
+
+    @Slot()
+    def _get_column_of_values(self) -> None:
+        """ピボットする値の列名を取得します"""
+        try:
+            self.obj_of_cls.COLUMN_OF_VALUES = self.values_column_text.text().strip() or "値"
+        except Exception as e:
+            self._show_error(f"error: \n{str(e)}")
+        else:
+            pass
+        finally:
+            pass
+
+    @Slot(int)
+    def _get_aggregate_type(self, index: int) -> None:
+        """ピボットする場合の集計方法を取得します"""
+        try:
+            key: str = self.aggregate_type_combo.itemData(index)
+            desc: str = self.obj_of_cls.dct_of_aggregate_type[key]
+            self.obj_of_cls.lst_of_aggregate_type = [key, desc]
+        except Exception as e:
+            self._show_error(f"error: \n{str(e)}")
+        else:
+            pass
+        finally:
+            pass
+
     @Slot(str)
     def _show_error_on_getting_ids(self, error: str) -> None:
         """統計表IDの一覧を取得する際のエラーを表示します"""
@@ -559,6 +1039,61 @@ class MainApp_Of_GJGS(QMainWindow):
         self.worker_of_getting_ids = None
         self.thread_of_getting_ids = None
 
+    @Slot(list)
+    def _append_rows_of_ids(self, rows: list) -> None:
+        """APIで検索した統計表IDを、一覧に追加します"""
+        self.top_left_model.append_pl_df(self._convert_rows_of_ids(rows))
+
+    @Slot(str)
+    def _show_error_on_searching_ids(self, error: str) -> None:
+        """APIで統計表IDの一覧を検索する際のエラーを表示します"""
+        self._show_error(f"error: \n{error}")
+
+    @Slot(bool)
+    def _show_result_after_searching_ids(self, flag: bool) -> None:
+        """APIで統計表IDの一覧を検索した後の結果を表示します"""
+        self.top_left_table.resizeColumnsToContents()
+        # 検索ボタンを有効化する
+        self.search_ids_btn.setEnabled(True)
+        self._show_result(self.search_lst_of_ids.__doc__, flag)
+
+    @Slot()
+    def _cleanup_after_searching_ids(self) -> None:
+        """APIで統計表IDの一覧を検索した後にクリーンアップします"""
+        self.worker_of_searching_ids = None
+        self.thread_of_searching_ids = None
+
+    @Slot(str)
+    def _show_error_on_getting_table(self, error: str) -> None:
+        """指定の統計表の取得のエラーを表示します"""
+        self._show_error(f"error: \n{error}")
+
+    @Slot(bool)
+    def _show_result_after_getting_table(self, flag: bool) -> None:
+        """指定の統計表を取得した後に表示します"""
+        result: bool = False
+        try:
+            # 取得のエラーは、表示済み
+            if flag:
+                self._setup_third_ui()
+        except Exception as e:
+            self._show_error(f"error: \n{str(e)}")
+        else:
+            result = flag
+            if result:
+                self.obj_of_cls.show_table()
+        finally:
+            self.show_table_btn.setEnabled(True)
+            self.show_filtered_table_btn.setEnabled(True)
+            self._show_result(self.show_table.__doc__, result)
+
+    @Slot()
+    def _cleanup_after_getting_table(self) -> None:
+        """指定の統計表を取得した後にクリーンアップします"""
+        self.worker_of_getting_table = None
+        self.thread_of_getting_table = None
+        self.stats_data_id_of_showing = ""
+
     @Slot()
     def get_lst_of_ids(self) -> bool:
         """統計表IDの一覧を取得します"""
@@ -567,12 +1102,13 @@ class MainApp_Of_GJGS(QMainWindow):
             if self.thread_of_getting_ids is not None and self.thread_of_getting_ids.isRunning():
                 self._show_error("統計表IDの一覧を取得しています。")
                 raise
+            if self.thread_of_searching_ids is not None and self.thread_of_searching_ids.isRunning():
+                raise Exception("統計表IDの一覧を検索しています。")
             self._check_first_form()
-            # 取得方法は非同期のみ
-            self.get_type_combo.setCurrentIndex(0)
-            self.worker_of_getting_ids = GetIdsWorker(
-                self.obj_of_lt.logger, self.obj_of_cls.APP_ID, self.obj_of_cls.lst_of_data_type, self.obj_of_cls.lst_of_get_type
-            )
+            # 取得方法は非同期、並行、パイプラインのみ
+            if self.obj_of_cls.lst_of_get_type[self.obj_of_cls.KEY] == "同期":
+                self.get_type_combo.setCurrentIndex(0)
+            self.worker_of_getting_ids = GetIdsWorker(self.obj_of_lt.logger, self.obj_of_cls)
             self.thread_of_getting_ids = QThread()
             self.worker_of_getting_ids.moveToThread(self.thread_of_getting_ids)
             # キャンセルボタンを有効化する
@@ -605,22 +1141,54 @@ class MainApp_Of_GJGS(QMainWindow):
         # キャンセルボタンを無効化する
         self.cancel_getting_ids_btn.setEnabled(False)
 
+    @Slot()
+    def search_lst_of_ids(self) -> bool:
+        """統計表IDの一覧をAPIで検索します"""
+        result: bool = False
+        try:
+            if self.thread_of_searching_ids is not None and self.thread_of_searching_ids.isRunning():
+                raise Exception("統計表IDの一覧を検索しています。")
+            if self.thread_of_getting_ids is not None and self.thread_of_getting_ids.isRunning():
+                raise Exception("統計表IDの一覧を取得しています。")
+            self._check_first_form()
+            # 入力を確認してから、一覧を空にする
+            self.obj_of_cls._get_params_of_search()
+            self._clear_widget(self.top_left_scroll_area)
+            self._setup_second_ui()
+            self.worker_of_searching_ids = SearchIdsWorker(self.obj_of_lt.logger, self.obj_of_cls)
+            self.thread_of_searching_ids = QThread()
+            self.worker_of_searching_ids.moveToThread(self.thread_of_searching_ids)
+            # 検索ボタンを無効化する
+            self.search_ids_btn.setEnabled(False)
+            self.thread_of_searching_ids.started.connect(self.worker_of_searching_ids.run)
+            self.worker_of_searching_ids.page.connect(self._append_rows_of_ids, Qt.ConnectionType.QueuedConnection)
+            self.worker_of_searching_ids.finished.connect(self.thread_of_searching_ids.quit)
+            self.worker_of_searching_ids.error.connect(self._show_error_on_searching_ids)
+            self.worker_of_searching_ids.finished.connect(self._show_result_after_searching_ids)
+            self.thread_of_searching_ids.finished.connect(self.worker_of_searching_ids.deleteLater)
+            self.thread_of_searching_ids.finished.connect(self.thread_of_searching_ids.deleteLater)
+            self.thread_of_searching_ids.finished.connect(self._cleanup_after_searching_ids)
+            self.thread_of_searching_ids.start()
+        except Exception as e:
+            self._show_error(f"error: \n{str(e)}")
+        else:
+            result = True
+        finally:
+            pass
+        return result
+
     @Slot()
     def show_lst_of_ids(self) -> bool:
         """統計表IDの一覧を表示します"""
         result: bool = False
         try:
-            csv_files: list = list(self.obj_of_cls.folder_p_of_ids.glob("*.csv"))
-            if not csv_files:
+            if not self.obj_of_cls.exists_stats_data_ids():
                 raise Exception("統計表IDの一覧を取得してください。")
             self._clear_widget(self.top_left_scroll_area)
             self._setup_second_ui()
-            for csv_file in csv_files:
-                reader: TextFileReader = pd.read_csv(filepath_or_buffer=str(csv_file), chunksize=1, dtype=str)
-                for chunk in reader:
-                    for _, row in chunk.iterrows():
-                        items: list = [QStandardItem(str(v)) for v in row]
-                        self.top_left_model.appendRow(items)
+            # 全てのファイルをまとめて読み込み、1回でモデルに渡す
+            pl_df: pl.DataFrame = cast(pl.DataFrame, self.obj_of_cls.scan_stats_data_ids().collect())
+            self.top_left_model.set_pl_df(pl_df)
             self.top_left_table.resizeColumnsToContents()
         except Exception as e:
             self._show_error(f"error: \n{str(e)}")
@@ -635,19 +1203,19 @@ class MainApp_Of_GJGS(QMainWindow):
         """統計表IDの一覧をフィルターにかけます"""
         result: bool = False
         try:
-            csv_files: list = list(self.obj_of_cls.folder_p_of_ids.glob(pattern="*.csv"))
-            if not csv_files:
+            if not self.obj_of_cls.exists_stats_data_ids():
                 raise Exception("統計表IDの一覧を取得してください。")
             self._check_second_form()
             self._clear_widget(self.top_left_scroll_area)
             self._setup_second_ui()
-            for csv_file in csv_files:
-                reader: TextFileReader = pd.read_csv(filepath_or_buffer=str(csv_file), chunksize=1, dtype=str)
-                for chunk in reader:
-                    pd_df: pd.DataFrame = self.obj_of_cls.filter_pd_df(chunk)
-                    for _, row in pd_df.iterrows():
-                        items: list = [QStandardItem(str(v)) for v in row]
-                        self.top_left_model.appendRow(items)
+            if self.obj_of_cls.lst_of_match_type[self.obj_of_cls.KEY] == "部分一致":
+                # 統計名と表題の転置インデックスで検索する
+                pl_df: pl.DataFrame = self._convert_rows_of_ids(self.obj_of_cls.search_stats_data_ids_with_index())
+            else:
+                # フィルターを読み込みに含めて、必要な行だけを読み込む
+                pl_lazy_df: pl.LazyFrame = self.obj_of_cls.filter_pl_lazy_df(self.obj_of_cls.scan_stats_data_ids())
+                pl_df: pl.DataFrame = cast(pl.DataFrame, pl_lazy_df.collect())
+            self.top_left_model.set_pl_df(pl_df)
             self.top_left_table.resizeColumnsToContents()
         except Exception as e:
             self._show_error(f"error: \n{str(e)}")
@@ -658,36 +1226,62 @@ class MainApp_Of_GJGS(QMainWindow):
         return result
 
     @Slot()
-    def show_table(self) -> bool:
+    def show_table(self, use_filter: bool = False) -> bool:
         """指定の統計表を表示します"""
         result: bool = False
         try:
             if self.obj_of_cls.STATS_DATA_ID == "":
                 raise Exception("統計表IDを選択してください。")
+            if self.thread_of_getting_table is not None and self.thread_of_getting_table.isRunning():
+                raise Exception("指定の統計表を取得しています。")
             self._check_first_form()
+            if use_filter:
+                self._check_second_form()
             self._clear_widget(self.bottom_left_scroll_area)
-            # 取得方法は同期のみ
-            self.get_type_combo.setCurrentIndex(1)
-            self.obj_of_cls.get_table_from_api()
-            self._setup_third_ui()
+            self.stats_data_id_of_showing = self.obj_of_cls.STATS_DATA_ID
+            self.dct_of_label_of_table = {
+                "統計表ID": self.obj_of_cls.STATS_DATA_ID,
+                "統計名": self.obj_of_cls.STAT_NAME,
+                "表題": self.obj_of_cls.TITLE,
+            }
+            # 画面を止めないように、別スレッドで取得する
+            self.worker_of_getting_table = GetTableWorker(self.obj_of_lt.logger, self.obj_of_cls, self.obj_of_cls.STATS_DATA_ID, use_filter)
+            self.thread_of_getting_table = QThread()
+            self.worker_of_getting_table.moveToThread(self.thread_of_getting_table)
+            # 表示ボタンを無効化する
+            self.show_table_btn.setEnabled(False)
+            self.show_filtered_table_btn.setEnabled(False)
+            self.thread_of_getting_table.started.connect(self.worker_of_getting_table.run)
+            self.worker_of_getting_table.finished.connect(self.thread_of_getting_table.quit)
+            self.worker_of_getting_table.error.connect(self._show_error_on_getting_table)
+            self.worker_of_getting_table.finished.connect(self._show_result_after_getting_table)
+            self.thread_of_getting_table.finished.connect(self.worker_of_getting_table.deleteLater)
+            self.thread_of_getting_table.finished.connect(self.thread_of_getting_table.deleteLater)
+            self.thread_of_getting_table.finished.connect(self._cleanup_after_getting_table)
+            self.thread_of_getting_table.start()
         except Exception as e:
             self._show_error(f"error: \n{str(e)}")
+            self._show_result(self.show_table.__doc__, result)
         else:
             result = True
-            self.obj_of_cls.show_table()
         finally:
-            self._show_result(self.show_table.__doc__, result)
+            pass
         return result
 
+    @Slot()
+    def show_filtered_table(self) -> bool:
+        """APIで絞り込める条件は絞り込んでから、指定の統計表を表示します"""
+        return self.show_table(use_filter=True)
+
     @Slot()
     def filter_table(self) -> bool:
         """指定の統計表をフィルターにかけます"""
         result: bool = False
         try:
-            if self.obj_of_cls.pd_df is None:
+            if self.obj_of_cls.pl_df is None:
                 raise Exception("統計表を表示してください。")
             self._check_second_form()
-            self.obj_of_cls.pd_df = self.obj_of_cls.filter_pd_df(self.obj_of_cls.pd_df)
+            self.obj_of_cls.pl_df = self.obj_of_cls.filter_pl_df(self.obj_of_cls.pl_df)
             self._clear_widget(self.bottom_left_scroll_area)
             self._setup_third_ui()
         except Exception as e:
@@ -699,14 +1293,139 @@ class MainApp_Of_GJGS(QMainWindow):
             self._show_result(self.filter_table.__doc__, result)
         return result
 
+    @Slot(bool)
+    def _show_result_after_outputting_table(self, flag: bool) -> None:
+        """指定の統計表を取得しながら出力した後の結果を表示します"""
+        self.output_pages_btn.setEnabled(True)
+        self._show_result(self.output_pages_of_table.__doc__, flag)
+
+    @Slot()
+    def _cleanup_after_outputting_table(self) -> None:
+        """指定の統計表を取得しながら出力した後にクリーンアップします"""
+        self.worker_of_outputting_table = None
+        self.thread_of_outputting_table = None
+
+    @Slot()
+    def output_pages_of_table(self) -> bool:
+        """指定の統計表を取得しながら、ページごとにファイルに出力します"""
+        result: bool = False
+        try:
+            if self.obj_of_cls.STATS_DATA_ID == "":
+                raise Exception("統計表IDを選択してください。")
+            if self.thread_of_outputting_table is not None and self.thread_of_outputting_table.isRunning():
+                raise Exception("指定の統計表を出力しています。")
+            self._check_first_form()
+            self.worker_of_outputting_table = OutputTableWorker(self.obj_of_lt.logger, self.obj_of_cls, self.obj_of_cls.STATS_DATA_ID)
+            self.thread_of_outputting_table = QThread()
+            self.worker_of_outputting_table.moveToThread(self.thread_of_outputting_table)
+            # 出力ボタンを無効化する
+            self.output_pages_btn.setEnabled(False)
+            self.thread_of_outputting_table.started.connect(self.worker_of_outputting_table.run)
+            self.worker_of_outputting_table.finished.connect(self.thread_of_outputting_table.quit)
+            self.worker_of_outputting_table.error.connect(self._show_error_on_getting_table)
+            self.worker_of_outputting_table.finished.connect(self._show_result_after_outputting_table)
+            self.thread_of_outputting_table.finished.connect(self.worker_of_outputting_table.deleteLater)
+            self.thread_of_outputting_table.finished.connect(self.thread_of_outputting_table.deleteLater)
+            self.thread_of_outputting_table.finished.connect(self._cleanup_after_outputting_table)
+            self.thread_of_outputting_table.start()
+        except Exception as e:
+            self._show_error(f"error: \n{str(e)}")
+            self._show_result(self.output_pages_of_table.__doc__, result)
+        else:
+            result = True
+        finally:
+            pass
+        return result
+
+    @Slot(bool)
+    def _show_result_after_downloading_tables(self, flag: bool) -> None:
+        """複数の統計表を一括で出力した後の結果を表示します"""
+        self.download_tables_btn.setEnabled(True)
+        self.refresh_tables_btn.setEnabled(True)
+        self._show_result(self.download_tables.__doc__, flag)
+
+    @Slot()
+    def _cleanup_after_downloading_tables(self) -> None:
+        """複数の統計表を一括で出力した後にクリーンアップします"""
+        self.worker_of_downloading_tables = None
+        self.thread_of_downloading_tables = None
+
+    @Slot()
+    def download_tables(self, incremental: bool = False) -> bool:
+        """一覧に表示している統計表を一括で出力します"""
+        result: bool = False
+        try:
+            if self.thread_of_downloading_tables is not None and self.thread_of_downloading_tables.isRunning():
+                raise Exception("統計表を一括で出力しています。")
+            self._check_first_form()
+            if incremental:
+                # データセットに保存した統計表ID
+                lst_of_stats_data_id: list = self.obj_of_cls.get_lst_of_stats_data_id_from_dataset()
+                if not lst_of_stats_data_id:
+                    raise Exception("データセットに統計表がありません。")
+            else:
+                if not hasattr(self, "top_left_model") or self.top_left_model.rowCount() == 0:
+                    raise Exception("統計表IDの一覧を表示してください。")
+                # 表示している一覧(フィルターの結果を含む)の統計表ID
+                lst_of_stats_data_id = self.top_left_model.pl_df.get_column(self.obj_of_cls.header_of_ids_l[0]).to_list()
+            self.worker_of_downloading_tables = DownloadTablesWorker(self.obj_of_lt.logger, self.obj_of_cls, lst_of_stats_data_id, incremental)
+            self.thread_of_downloading_tables = QThread()
+            self.worker_of_downloading_tables.moveToThread(self.thread_of_downloading_tables)
+            # 出力ボタンを無効化する
+            self.download_tables_btn.setEnabled(False)
+            self.refresh_tables_btn.setEnabled(False)
+            self.thread_of_downloading_tables.started.connect(self.worker_of_downloading_tables.run)
+            self.worker_of_downloading_tables.finished.connect(self.thread_of_downloading_tables.quit)
+            self.worker_of_downloading_tables.error.connect(self._show_error_on_getting_table)
+            self.worker_of_downloading_tables.finished.connect(self._show_result_after_downloading_tables)
+            self.thread_of_downloading_tables.finished.connect(self.worker_of_downloading_tables.deleteLater)
+            self.thread_of_downloading_tables.finished.connect(self.thread_of_downloading_tables.deleteLater)
+            self.thread_of_downloading_tables.finished.connect(self._cleanup_after_downloading_tables)
+            self.thread_of_downloading_tables.start()
+        except Exception as e:
+            self._show_error(f"error: \n{str(e)}")
+            self._show_result(self.download_tables.__doc__, result)
+        else:
+            result = True
+        finally:
+            pass
+        return result
+
+    @Slot()
+    def refresh_tables(self) -> bool:
+        """データセットの統計表を、保存した最新の期間以降だけ取得して更新します"""
+        return self.download_tables(incremental=True)
+
+    @Slot()
+    def query_dataset(self) -> bool:
+        """データセットの統計表をSQLで集計します"""
+        result: bool = False
+        try:
+            if self.thread_of_getting_table is not None and self.thread_of_getting_table.isRunning():
+                raise Exception("指定の統計表を取得しています。")
+            # 保存した統計表は、取得し直さずに集計する
+            tables: list = [*self.obj_of_cls.get_dct_of_table_in_dataset(), "dataset"]
+            self.obj_of_lt.logger.info("テーブル名 => " + ", ".join(tables))
+            self.obj_of_cls.query_dataset()
+            self._clear_widget(self.bottom_left_scroll_area)
+            self._setup_third_ui()
+        except Exception as e:
+            self._show_error(f"error: \n{str(e)}")
+        else:
+            result = True
+            self.obj_of_cls.show_table()
+        finally:
+            self._show_result(self.query_dataset.__doc__, result)
+        return result
+
     @Slot()
     def output_table(self) -> bool:
         """指定の統計表をファイルに出力します"""
         result: bool = False
         try:
-            if self.obj_of_cls.pd_df is None:
+            if self.obj_of_cls.pl_df is None:
                 raise Exception("統計表を表示してください。")
-            self.obj_of_cls.output_table_to_csv()
+            self.obj_of_cls.output_table_to_file()
         except Exception as e:
             self._show_error(f"error: \n{str(e)}")
         else:
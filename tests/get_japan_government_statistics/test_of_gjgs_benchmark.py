@@ -0,0 +1,20 @@
+import logging
+
+from source.get_japan_government_statistics.gjgs_benchmark import GJGS_Benchmark
+
+
+# テスト関数: 疑似サーバーで、全ての計測が件数どおりに完了することを確認する
+def test_func():
+    obj_of_bm = GJGS_Benchmark(logging.getLogger(__name__), number_of_ids=250, number_of_areas=5, number_of_times=3, repeat=1)
+    lst_of_result = obj_of_bm.run()
+    targets = {r["対象"] for r in lst_of_result}
+    assert targets == {"統計表IDの一覧の取得", "統計表IDの一覧の解析器", "指定の統計表の解析器", "指定の統計表の取得", "filter_pl_df"}
+    for r in lst_of_result:
+        assert r["秒"] >= 0
+        assert r["ページ数"] > 0
+        if r["対象"] == "統計表IDの一覧の取得":
+            assert r["件数"] == 250
+            # 取得件数を調整しても、100件ずつ取得するより多くは要求しない(並行とパイプラインは、総件数の取得を含む)
+            assert r["ページ数"] <= 3 + 1
+        if r["対象"] == "指定の統計表の取得":
+            assert r["件数"] == 4 * 5 * 3
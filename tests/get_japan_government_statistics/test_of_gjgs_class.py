@@ -0,0 +1,534 @@
+import asyncio
+import json
+import logging
+import unicodedata
+from pathlib import Path
+from random import Random
+from threading import Event
+
+import httpx
+import polars as pl
+import pytest
+
+from source.get_japan_government_statistics.gjgs_benchmark import GJGS_Benchmark
+from source.get_japan_government_statistics.gjgs_class import (
+    AdaptivePageSize,
+    AsyncCachedTransport,
+    CachedTransport,
+    GetJapanGovernmentStatistics,
+    OperationCancelledError,
+    ResponseCache,
+    StatsDataParser,
+    TableFileWriter,
+)
+from source.get_japan_government_statistics.gjgs_fake_server import FakeEStatServer
+
+
+def _create_obj_of_cls(url_of_api: str, folder_p: Path) -> GetJapanGovernmentStatistics:
+    """疑似サーバーに接続して、一時フォルダに書き出すインスタンスを作成します"""
+    obj_of_cls = GJGS_Benchmark(logging.getLogger(__name__))._create_obj_of_cls(url_of_api, folder_p)
+    obj_of_cls.lst_of_get_type = ["非同期", ""]
+    obj_of_cls.lst_of_data_type = ["json", ""]
+    # 1ページ100件で取得する
+    obj_of_cls.INITIAL_LIMIT_OF_IDS = obj_of_cls.MIN_LIMIT_OF_IDS = obj_of_cls.MAX_LIMIT_OF_IDS = 100
+    return obj_of_cls
+
+
+# テスト関数: 統計表IDの一覧の更新を途中で中止しても、現在の世代を読み込めることを確認する
+def test_func_of_interrupted_refresh_of_ids(tmp_path, monkeypatch):
+    with FakeEStatServer(number_of_ids=300) as fake:
+        obj_of_cls = _create_obj_of_cls(fake.url_of_api, tmp_path)
+        try:
+            obj_of_cls.submit(obj_of_cls.write_stats_data_ids_to_file()).result()
+            folder_p_of_current = obj_of_cls.folder_p_of_generation_of_ids
+            pointer = obj_of_cls._get_file_p_of_pointer_of_ids().read_text(encoding="utf-8")
+            cancel_event = Event()
+            lst_of_height: list[int] = []
+            convert_page_to_rows = obj_of_cls._convert_page_to_rows
+
+            # 1ページ目を受け取ったら、読み込んでから中止する
+            def fake_convert_page_to_rows(page):
+                lst_of_height.append(obj_of_cls.scan_stats_data_ids().collect().height)
+                cancel_event.set()
+                return convert_page_to_rows(page)
+
+            monkeypatch.setattr(obj_of_cls, "_convert_page_to_rows", fake_convert_page_to_rows)
+            with pytest.raises(OperationCancelledError):
+                obj_of_cls.submit(obj_of_cls.write_stats_data_ids_to_file(cancel_event=cancel_event)).result()
+            # 更新中も、更新後も、現在の世代を読み込む
+            assert lst_of_height == [300]
+            assert obj_of_cls._get_file_p_of_pointer_of_ids().read_text(encoding="utf-8") == pointer
+            assert obj_of_cls._resolve_generation_of_ids() == folder_p_of_current
+            assert obj_of_cls.scan_stats_data_ids().collect().height == 300
+            # 書き込み中の世代は、残さない
+            assert list(obj_of_cls._get_folder_p_of_generations_of_ids().iterdir()) == [folder_p_of_current]
+        finally:
+            obj_of_cls.close()
+
+
+# テスト関数: 古い世代を削除しても、現在の世代と書き込み中の世代は残ることを確認する
+def test_func_of_pruning_generations_of_ids(tmp_path):
+    with FakeEStatServer(number_of_ids=300) as fake:
+        obj_of_cls = _create_obj_of_cls(fake.url_of_api, tmp_path)
+        try:
+            obj_of_cls.KEEP_GENERATIONS_OF_IDS = 1
+            for _ in range(3):
+                obj_of_cls.submit(obj_of_cls.write_stats_data_ids_to_file()).result()
+                folder_p_of_current = obj_of_cls._resolve_generation_of_ids()
+                assert folder_p_of_current.name == obj_of_cls._get_file_p_of_pointer_of_ids().read_text(encoding="utf-8")
+                assert list(obj_of_cls._get_folder_p_of_generations_of_ids().iterdir()) == [folder_p_of_current]
+                assert obj_of_cls.scan_stats_data_ids().collect().height == 300
+            # 現在の世代より新しい世代は、別の処理が書き込み中のため削除しない
+            folder_p_of_writing = obj_of_cls._create_generation_of_ids()
+            obj_of_cls._prune_generations_of_ids()
+            assert folder_p_of_current.is_dir()
+            assert folder_p_of_writing.is_dir()
+            # 現在の世代を指していない場合は、何も削除しない
+            obj_of_cls.folder_p_of_generation_of_ids = obj_of_cls.folder_p_of_ids
+            obj_of_cls._prune_generations_of_ids()
+            assert folder_p_of_current.is_dir()
+            assert folder_p_of_writing.is_dir()
+        finally:
+            obj_of_cls.close()
+
+
+def _get_chunks_of_body(status: int = 0) -> list[bytes]:
+    """e-StatのJSONのレスポンスの本体を、3つのチャンクに分けて取得します"""
+    body: bytes = json.dumps({"GET_STATS_LIST": {"RESULT": {"STATUS": status}, "DATALIST_INF": "x" * 30000}}).encode("utf-8")
+    return [body[:10000], body[10000:20000], body[20000:]]
+
+
+def _get_files_of_cache(cache: ResponseCache) -> list[str]:
+    """キャッシュのフォルダのファイル名を取得します"""
+    return sorted(p.suffix for p in cache.folder_p.iterdir())
+
+
+# テスト関数: 同期版のキャッシュが、有効期間内は再利用され、期限切れは再検証されることを確認する
+def test_func_of_cached_transport(tmp_path):
+    lst_of_request: list[httpx.Request] = []
+
+    def handler(request):
+        lst_of_request.append(request)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, headers={"ETag": '"v1"'}, content=iter(_get_chunks_of_body(int(request.url.params.get("status", 0)))))
+
+    cache = ResponseCache(tmp_path / "__cache__", ttl=60, max_bytes=1024 * 1024)
+    with httpx.Client(transport=CachedTransport(cache, httpx.MockTransport(handler))) as client:
+        body = b"".join(_get_chunks_of_body())
+        # 1回目は取得して、2回目はキャッシュから返す(appIdはキーに含めない)
+        res = client.get("http://estat.test/json/getStatsList", params={"appId": "a", "limit": 1})
+        assert res.content == body and not res.extensions.get("from_cache")
+        res = client.get("http://estat.test/json/getStatsList", params={"limit": 1, "appId": "b"})
+        assert res.content == body and res.extensions["from_cache"]
+        assert len(lst_of_request) == 1
+        # 期限切れの場合は、条件付きリクエストで再検証する
+        cache.ttl = 0
+        res = client.get("http://estat.test/json/getStatsList", params={"limit": 1})
+        assert res.content == body and res.extensions["from_cache"]
+        assert len(lst_of_request) == 2 and lst_of_request[-1].headers["If-None-Match"] == '"v1"'
+        # 異なるパラメータは、別のキャッシュ
+        cache.ttl = 60
+        client.get("http://estat.test/json/getStatsList", params={"limit": 2})
+        assert len(lst_of_request) == 3
+        # エラーのSTATUSのレスポンスは、キャッシュしない
+        client.get("http://estat.test/json/getStatsList", params={"status": 100})
+        client.get("http://estat.test/json/getStatsList", params={"status": 100})
+        assert len(lst_of_request) == 5
+    assert _get_files_of_cache(cache) == [".bin", ".bin", ".json", ".json"]
+
+
+# テスト関数: 本体を最後まで読み込んだ場合だけ、キャッシュが確定されることを確認する
+def test_func_of_tee_of_cached_transport(tmp_path):
+    cache = ResponseCache(tmp_path / "__cache__", ttl=60, max_bytes=1024 * 1024)
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, content=iter(_get_chunks_of_body())))
+    with httpx.Client(transport=CachedTransport(cache, transport)) as client:
+        request = client.build_request("GET", "http://estat.test/json/getStatsList", params={"limit": 1})
+        key = cache.get_key(request)
+        with client.stream("GET", "http://estat.test/json/getStatsList", params={"limit": 1}) as res:
+            iterator = res.iter_raw()
+            next(iterator)
+            # 読み込み中は、書き込み中の一時ファイルだけがある
+            assert cache.load(key) is None
+            assert _get_files_of_cache(cache) == [".tmp"]
+            for _ in iterator:
+                pass
+        assert cache.load(key) is not None
+        assert (cache.folder_p / f"{key}.bin").read_bytes() == b"".join(_get_chunks_of_body())
+        # 途中で中断した場合は、キャッシュも一時ファイルも残さない
+        with client.stream("GET", "http://estat.test/json/getStatsList", params={"limit": 2}) as res:
+            next(res.iter_raw())
+        assert _get_files_of_cache(cache) == [".bin", ".json"]
+
+
+# テスト関数: 非同期版のキャッシュが、同期版と同じように再利用と中断を扱うことを確認する
+def test_func_of_async_cached_transport(tmp_path):
+    lst_of_request: list[httpx.Request] = []
+
+    async def handler(request):
+        lst_of_request.append(request)
+
+        async def aiter_chunks():
+            for chunk in _get_chunks_of_body():
+                yield chunk
+
+        return httpx.Response(200, content=aiter_chunks())
+
+    async def main():
+        async with httpx.AsyncClient(transport=AsyncCachedTransport(cache, httpx.MockTransport(handler))) as client:
+            res = await client.get("http://estat.test/json/getStatsList", params={"limit": 1})
+            assert res.content == body and not res.extensions.get("from_cache")
+            res = await client.get("http://estat.test/json/getStatsList", params={"limit": 1})
+            assert res.content == body and res.extensions["from_cache"]
+            assert len(lst_of_request) == 1
+            # 途中で中断した場合は、キャッシュも一時ファイルも残さない
+            async with client.stream("GET", "http://estat.test/json/getStatsList", params={"limit": 2}) as res:
+                await anext(res.aiter_raw())
+            assert _get_files_of_cache(cache) == [".bin", ".json"]
+            res = await client.get("http://estat.test/json/getStatsList", params={"limit": 2})
+            assert res.content == body and not res.extensions.get("from_cache")
+            assert len(lst_of_request) == 3
+
+    cache = ResponseCache(tmp_path / "__cache__", ttl=60, max_bytes=1024 * 1024)
+    body = b"".join(_get_chunks_of_body())
+    asyncio.run(main())
+    assert _get_files_of_cache(cache) == [".bin", ".bin", ".json", ".json"]
+
+
+def _write_catalog_of_ids(obj_of_cls: GetJapanGovernmentStatistics) -> list[tuple]:
+    """検索のテスト用の統計表IDの一覧を書き出します"""
+    lst_of_stat_name = ["人口推計", "国勢調査", "家計調査", "労働力調査", "ＧＤＰ統計", "gdp速報"]
+    lst_of_title = ["都道府県別", "男女別", "年齢階級別の人口", "月次の推計", "年次の調査", "市区町村別"]
+    random = Random(0)
+    rows = [(f"{i:010d}", random.choice(lst_of_stat_name), random.choice(lst_of_title)) for i in range(1, 301)]
+    obj_of_cls.folder_p_of_ids.mkdir(parents=True, exist_ok=True)
+    text = "\n".join([obj_of_cls.header_of_ids_s] + [",".join(row) for row in rows])
+    (obj_of_cls.folder_p_of_ids / "list_of_stats_data_ids_1.csv").write_text(text, encoding="utf-8")
+    return rows
+
+
+# テスト関数: 転置インデックスの検索結果が、文字列の部分一致の総当たりと同じになることを確認する
+def test_func_of_ngram_index(tmp_path):
+    def normalize(text):
+        return unicodedata.normalize("NFKC", text).lower()
+
+    def search_by_brute_force(rows, keywords, logic_type):
+        found = [[any(normalize(k) in normalize(col) for col in row[1:]) for k in keywords] for row in rows]
+        return [row for row, f in zip(rows, found) if (all(f) if logic_type == "AND抽出" else any(f))]
+
+    obj_of_cls = _create_obj_of_cls("http://127.0.0.1:1", tmp_path)
+    try:
+        rows = _write_catalog_of_ids(obj_of_cls)
+        obj_of_cls.lst_of_match_type = ["部分一致", ""]
+        # 2文字未満のキーワードと、全角と半角、大文字と小文字の違いを含める
+        lst_of_keywords = [["人口"], ["調査", "別"], ["査", "県"], ["gdp"], ["ＧＤＰ", "月次"], ["人口推計都道府県"], ["該当なし"], [""]]
+        for logic_type in ("AND抽出", "OR抽出"):
+            obj_of_cls.lst_of_logic_type = [logic_type, ""]
+            for keywords in lst_of_keywords:
+                obj_of_cls.lst_of_keyword = keywords
+                assert obj_of_cls.search_stats_data_ids_with_index() == search_by_brute_force(rows, keywords, logic_type)
+        assert len(search_by_brute_force(rows, ["査"], "OR抽出")) > 0
+        # 保存したインデックスを読み込んでも、同じ結果になる
+        obj_of_other = _create_obj_of_cls("http://127.0.0.1:1", tmp_path)
+        try:
+            obj_of_other.lst_of_match_type = ["部分一致", ""]
+            obj_of_other.lst_of_logic_type = ["AND抽出", ""]
+            obj_of_other.lst_of_keyword = ["調査", "別"]
+            assert obj_of_other.search_stats_data_ids_with_index() == search_by_brute_force(rows, ["調査", "別"], "AND抽出")
+        finally:
+            obj_of_other.close()
+        # 完全一致は、転置インデックスを使わずに、一覧を絞り込む
+        obj_of_cls.lst_of_match_type = ["完全一致", ""]
+        with pytest.raises(Exception):
+            obj_of_cls.search_stats_data_ids_with_index()
+        for logic_type in ("AND抽出", "OR抽出"):
+            obj_of_cls.lst_of_logic_type = [logic_type, ""]
+            for keywords in [["国勢調査"], ["国勢調査", "都道府県別"], ["人口", "男女別"]]:
+                obj_of_cls.lst_of_keyword = keywords
+                found = [[k in row for k in keywords] for row in rows]
+                expected = [row[0] for row, f in zip(rows, found) if (all(f) if logic_type == "AND抽出" else any(f))]
+                assert obj_of_cls.get_lst_of_stats_data_id_from_catalog() == expected
+    finally:
+        obj_of_cls.close()
+
+
+# テスト関数: APIで絞り込める条件だけがパラメータに変換され、取得後の絞り込みと同じ行になることを確認する
+def test_func_of_compile_filter_to_query(tmp_path):
+    with FakeEStatServer(number_of_ids=10, number_of_areas=5, number_of_times=4) as fake:
+        obj_of_cls = _create_obj_of_cls(fake.url_of_api, tmp_path)
+        try:
+            meta = obj_of_cls.get_meta_of_table("0000000001")
+
+            def compile_filter_to_query(match_type, logic_type, keywords):
+                obj_of_cls.lst_of_match_type = [match_type, ""]
+                obj_of_cls.lst_of_logic_type = [logic_type, ""]
+                obj_of_cls.lst_of_keyword = keywords
+                return obj_of_cls.compile_filter_to_query(meta)
+
+            # 分類事項の名称は、コードに変換する
+            assert compile_filter_to_query("完全一致", "AND抽出", ["分類1"]) == {"cdCat01": "001"}
+            assert compile_filter_to_query("完全一致", "AND抽出", ["地域2"]) == {"cdArea": "00002"}
+            assert compile_filter_to_query("部分一致", "AND抽出", ["分類1", "地域2"]) == {"cdCat01": "001", "cdArea": "00002"}
+            assert compile_filter_to_query("部分一致", "OR抽出", ["分類1", "分類3"]) == {"cdCat01": "001,003"}
+            # 数値、単位、複数の分類事項にまたがるOR、全てのコードに一致する条件は、取得後に絞り込む
+            assert compile_filter_to_query("完全一致", "AND抽出", ["2001"]) == {}
+            assert compile_filter_to_query("部分一致", "AND抽出", ["人"]) == {}
+            assert compile_filter_to_query("部分一致", "OR抽出", ["分類1", "地域2"]) == {}
+            assert compile_filter_to_query("部分一致", "AND抽出", ["地域"]) == {}
+            assert compile_filter_to_query("完全一致", "AND抽出", ["分類1", "2001"]) == {"cdCat01": "001"}
+            # コードの数が上限を超える場合は、連続したコードだけを範囲で絞り込む
+            obj_of_cls.MAX_CODES_OF_QUERY = 2
+            assert compile_filter_to_query("部分一致", "OR抽出", ["地域1", "地域2", "地域3"]) == {"cdAreaFrom": "00001", "cdAreaTo": "00003"}
+            assert compile_filter_to_query("部分一致", "OR抽出", ["2001年", "2002年", "2003年"]) == {
+                "cdTimeFrom": "2001000000",
+                "cdTimeTo": "2003000000",
+            }
+            assert compile_filter_to_query("部分一致", "OR抽出", ["地域0", "地域2", "地域4"]) == {}
+            # 一致する行がないことが分かる場合は、Noneを返す
+            assert compile_filter_to_query("完全一致", "AND抽出", ["分類1", "分類2"]) is None
+            assert compile_filter_to_query("部分一致", "AND抽出", ["分類1", "該当なし"]) is None
+            assert compile_filter_to_query("部分一致", "OR抽出", ["該当なし"]) is None
+            # APIで絞り込んでも、取得後だけで絞り込んだ場合と同じ行になる
+            for match_type, logic_type, keywords in [
+                ("完全一致", "AND抽出", ["分類1", "地域2"]),
+                ("部分一致", "OR抽出", ["分類1", "分類3"]),
+                ("部分一致", "AND抽出", ["分類2", "2001"]),
+                ("完全一致", "AND抽出", ["分類0", "2002年"]),
+                ("部分一致", "OR抽出", ["地域1", "地域2", "地域3"]),
+                ("部分一致", "OR抽出", ["2001年", "2002年", "2003年"]),
+            ]:
+                assert compile_filter_to_query(match_type, logic_type, keywords)
+                obj_of_cls.get_table_from_api("0000000001")
+                expected = sorted(obj_of_cls.filter_pl_df(obj_of_cls.pl_df).rows())
+                obj_of_cls.get_filtered_table_from_api("0000000001")
+                assert sorted(obj_of_cls.pl_df.rows()) == expected
+                assert expected
+            # 一致する行がない場合は、取得しないで、メタ情報の列だけの空の統計表にする
+            count_of_requests = fake.get_count_of_requests("getStatsData")
+            compile_filter_to_query("完全一致", "AND抽出", ["分類1", "分類2"])
+            obj_of_cls.get_filtered_table_from_api("0000000001")
+            assert fake.get_count_of_requests("getStatsData") == count_of_requests
+            assert obj_of_cls.pl_df.is_empty()
+            assert obj_of_cls.pl_df.columns == ["表章項目", "分類", "地域", "時間軸（年次）", "単位", "値"]
+            obj_of_cls.get_table_from_api("0000000001")
+            assert obj_of_cls.filter_pl_df(obj_of_cls.pl_df).is_empty()
+        finally:
+            obj_of_cls.close()
+
+
+# テスト関数: 差分の更新で、更新日が変わった統計表だけを取得し直して、目録に反映することを確認する
+def test_func_of_refresh_tables_in_dataset(tmp_path):
+    with FakeEStatServer(number_of_ids=10, number_of_areas=3, number_of_times=3) as fake:
+        obj_of_cls = _create_obj_of_cls(fake.url_of_api, tmp_path)
+        try:
+            lst_of_stats_data_id = [f"{i:010d}" for i in range(1, 5)]
+            obj_of_cls.submit(obj_of_cls.download_tables_to_dataset_with_async(lst_of_stats_data_id)).result()
+            old_tables = obj_of_cls._read_manifest_of_dataset()["tables"]
+            assert {e["mode"] for e in old_tables.values()} == {"full"}
+            assert {e["updated_date"] for e in old_tables.values()} == {"2024-01-01"}
+            dct_of_mtime = {k: (obj_of_cls.folder_p_of_dataset / e["file"]).stat().st_mtime_ns for k, e in old_tables.items()}
+            # 新しい期間を追加して、一部の統計表の更新日を変える
+            fake.lst_of_time.append(("2003000000", "2003年"))
+            lst_of_updated = lst_of_stats_data_id[:2]
+            fake.dct_of_updated_date.update({k: "2024-02-01" for k in lst_of_updated})
+            count_of_requests = fake.get_count_of_requests("getStatsData")
+            obj_of_cls.submit(obj_of_cls.refresh_tables_in_dataset_with_async()).result()
+            assert fake.get_count_of_requests("getStatsData") - count_of_requests == len(lst_of_updated)
+            tables = obj_of_cls._read_manifest_of_dataset()["tables"]
+            assert sorted(tables) == lst_of_stats_data_id
+            for stats_data_id, entry in tables.items():
+                file_p = obj_of_cls.folder_p_of_dataset / entry["file"]
+                assert entry["status"] == "success"
+                if stats_data_id in lst_of_updated:
+                    # 保存した最新の期間から取得して、置き換える
+                    assert entry["mode"] == "incremental"
+                    assert entry["time_from"] == "2002000000"
+                    assert entry["fetched_rows"] == 4 * 3 * 2
+                    assert entry["rows"] == 4 * 3 * 4
+                    assert entry["latest_time_code"] == "2003000000"
+                    assert entry["updated_date"] == "2024-02-01"
+                    pl_df = pl.read_parquet(file_p)
+                    assert pl_df.height == pl_df.unique().height == 4 * 3 * 4
+                else:
+                    # 更新されていない統計表は、ファイルも目録の情報も変えない
+                    assert entry["mode"] == "skipped"
+                    assert entry["fetched_rows"] == 0
+                    assert {k: v for k, v in entry.items() if k not in ("mode", "time_from", "fetched_rows")} == {
+                        k: v for k, v in old_tables[stats_data_id].items() if k not in ("mode", "time_from", "fetched_rows")
+                    }
+                    assert file_p.stat().st_mtime_ns == dct_of_mtime[stats_data_id]
+        finally:
+            obj_of_cls.close()
+
+
+# テスト関数: 1ページあたりの取得件数が、取得時間と大きさに応じて増減し、上限と下限に収まることを確認する
+def test_func_of_adaptive_page_size():
+    # 初期値は、上限と下限に収める
+    assert AdaptivePageSize(10, 100, 1000, 1.0, 1000000).size == 100
+    assert AdaptivePageSize(5000, 100, 1000, 1.0, 1000000).size == 1000
+    assert AdaptivePageSize(10, 0, 0, 1.0, 1000000).size == 1
+    page_size = AdaptivePageSize(400, 100, 1000, 1.0, 1000000)
+    # 満杯のページが十分に速く、小さい場合は、2倍にして、上限で止める
+    assert page_size.update(400, 400, 0.1, 1000) == 800
+    assert page_size.update(800, 800, 0.1, 1000) == 1000
+    assert page_size.update(1000, 1000, 0.1, 1000) == 1000
+    # 最後のページ(満杯でない)、目安の半分より遅い、もしくは大きいページでは、変えない
+    assert page_size.update(1000, 10, 0.1, 1000) == 1000
+    assert page_size.update(1000, 1000, 0.6, 1000) == 1000
+    assert page_size.update(1000, 1000, 0.1, 600000) == 1000
+    # 遅い、もしくは大きすぎる場合は、取得した時点の件数の半分にして、下限で止める
+    assert page_size.update(1000, 1000, 2.0, 1000) == 500
+    assert page_size.update(500, 500, 0.1, 2000000) == 250
+    # 同時に取得した大きいページの結果では、さらに小さくしない
+    assert page_size.update(1000, 1000, 2.0, 1000) == 250
+    assert page_size.update(250, 250, 2.0, 1000) == 125
+    assert page_size.update(125, 125, 2.0, 1000) == 100
+    assert page_size.update(100, 100, 2.0, 1000) == 100
+    # 取得時の件数より小さくなった後のページでは、大きくしない
+    page_size.size = 400
+    assert page_size.update(200, 200, 0.1, 1000) == 400
+    # 失敗した場合の縮小と、拡大も上限と下限に収める
+    assert page_size.shrink() == 200
+    assert page_size.shrink() == 100
+    assert page_size.shrink() == 100
+    assert page_size.grow() == 200
+    page_size.size = 900
+    assert page_size.grow() == 1000
+    # 指定の件数以下にする(下限は下回らず、大きくはしない)
+    assert page_size.cap(300) == 300
+    assert page_size.cap(10) == 100
+    assert page_size.cap(5000) == 100
+
+
+# テスト関数: 既定では取得した統計表を保存せず、保存する場合も保存済みの統計表は書き直さないことを確認する
+def test_func_of_store_of_tables(tmp_path):
+    assert not GetJapanGovernmentStatistics(logging.getLogger(__name__)).use_store_of_tables
+    with FakeEStatServer(number_of_ids=10, number_of_areas=3, number_of_times=3) as fake:
+        obj_of_cls = _create_obj_of_cls(fake.url_of_api, tmp_path)
+        try:
+            obj_of_cls.get_table_from_api("0000000001")
+            assert not obj_of_cls.folder_p_of_dataset.exists()
+            obj_of_cls.use_store_of_tables = True
+            obj_of_cls.get_table_from_api("0000000001")
+            tables = obj_of_cls._read_manifest_of_dataset()["tables"]
+            assert sorted(tables) == ["0000000001"]
+            mtime = obj_of_cls.file_p_of_manifest.stat().st_mtime_ns
+            count_of_requests = fake.get_count_of_requests("getMetaInfo")
+            # 保存済みの統計表は、メタ情報も取得し直さず、書き直さない
+            obj_of_cls.get_table_from_api("0000000001")
+            obj_of_cls.submit(obj_of_cls.get_table_from_api_with_async("0000000001")).result()
+            assert fake.get_count_of_requests("getMetaInfo") == count_of_requests
+            assert obj_of_cls.file_p_of_manifest.stat().st_mtime_ns == mtime
+            assert obj_of_cls.DATA_COUNT == 4 * 3 * 3
+        finally:
+            obj_of_cls.close()
+
+
+class _FailOnceTransport(httpx.BaseTransport):
+    """指定の開始位置のページを、1回だけ504で失敗させるトランスポート"""
+
+    def __init__(self, transport: httpx.BaseTransport, start: str, lst_of_limit: list[str]):
+        self.transport = transport
+        self.start = start
+        self.lst_of_limit = lst_of_limit
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if request.url.params.get("startPosition") == self.start:
+            self.lst_of_limit.append(request.url.params.get("limit", ""))
+            if len(self.lst_of_limit) == 1:
+                return httpx.Response(504, request=request)
+        return self.transport.handle_request(request)
+
+
+class _AsyncFailOnceTransport(httpx.AsyncBaseTransport):
+    """指定の開始位置のページを、1回だけ504で失敗させるトランスポート(非同期版)"""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, start: str, lst_of_limit: list[str]):
+        self.transport = transport
+        self.start = start
+        self.lst_of_limit = lst_of_limit
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.url.params.get("startPosition") == self.start:
+            self.lst_of_limit.append(request.url.params.get("limit", ""))
+            if len(self.lst_of_limit) == 1:
+                return httpx.Response(504, request=request)
+        return await self.transport.handle_async_request(request)
+
+
+# テスト関数: 統計表のページの取得に失敗した場合は、同じ開始位置から小さいページで取得し直すことを確認する
+def test_func_of_retry_of_pages_of_table(tmp_path):
+    with FakeEStatServer(number_of_ids=10, number_of_areas=3, number_of_times=3) as fake:
+        obj_of_cls = _create_obj_of_cls(fake.url_of_api, tmp_path)
+        try:
+            obj_of_cls.BACKOFF_BASE = 0.0
+            obj_of_cls.LIMIT_OF_TABLE = 20
+            obj_of_cls.MIN_LIMIT_OF_TABLE = 5
+            lst_of_limit: list[str] = []
+            lst_of_async_limit: list[str] = []
+            get_transport = obj_of_cls._get_transport
+            get_async_transport = obj_of_cls._get_async_transport
+            obj_of_cls._get_transport = lambda: _FailOnceTransport(get_transport(), "21", lst_of_limit)
+            obj_of_cls._get_async_transport = lambda: _AsyncFailOnceTransport(get_async_transport(), "21", lst_of_async_limit)
+            lst_of_pl_df = list(obj_of_cls.get_pages_of_table_from_api("0000000001"))
+
+            async def _get_pages() -> list[pl.DataFrame]:
+                return [pl_df async for pl_df in obj_of_cls.get_pages_of_table_from_api_with_async("0000000001")]
+
+            lst_of_async_pl_df = obj_of_cls.submit(_get_pages()).result()
+            for lst, lst_of_pl_df_of_retry in ((lst_of_limit, lst_of_pl_df), (lst_of_async_limit, lst_of_async_pl_df)):
+                # 失敗したページだけを、小さいページで取得し直す
+                assert len(lst) == 2
+                assert int(lst[1]) < int(lst[0])
+                pl_df = obj_of_cls._concat_pages_of_table(lst_of_pl_df_of_retry)
+                assert pl_df.height == pl_df.unique().height == 4 * 3 * 3
+        finally:
+            obj_of_cls.close()
+
+
+# テスト関数: 値列を値を変えずに持てる最も小さい型にして、型が異なるページも値を変えずに書き出すことを確認する
+def test_func_of_dtype_of_values(tmp_path):
+    page_parser = StatsDataParser({}, {"value": "値"})
+    lst_of_case = [
+        (["1", " 2 ", "126146099", "-"], pl.Int32, [1, 2, 126146099, None]),
+        (["1.5", "2.25"], pl.Float32, [1.5, 2.25]),
+        (["0.123456789", "1"], pl.Float64, [0.123456789, 1.0]),
+        (["3000000001"], pl.Float64, [3000000001.0]),
+    ]
+    for lst_of_value, dtype, expected in lst_of_case:
+        page_parser.columns = {"value": lst_of_value}
+        pl_df = page_parser.to_pl_df()
+        assert pl_df.schema["値"] == dtype
+        assert pl_df.get_column("値").to_list() == expected
+    file_p = tmp_path / "table.parquet"
+    writer = TableFileWriter(file_p, "parquet", pl.Schema({"値": pl.Float64()}))
+    for lst_of_value in (["1", "2"], ["0.123456789"]):
+        page_parser.columns = {"value": lst_of_value}
+        writer.write(page_parser.to_pl_df())
+    writer.close()
+    assert pl.read_parquet(file_p).get_column("値").to_list() == [1.0, 2.0, 0.123456789]
+
+
+# テスト関数: 統計表IDの一覧のCSVファイルは、直前の世代と同じ内容の場合だけ、サイズとハッシュ値で判定して使い回すことを確認する
+def test_func_of_reuse_of_files_of_ids(tmp_path):
+    with FakeEStatServer(number_of_ids=250) as fake:
+        obj_of_cls = _create_obj_of_cls(fake.url_of_api, tmp_path)
+        try:
+            obj_of_cls.lst_of_catalog_type = ["csv", ""]
+            obj_of_cls.submit(obj_of_cls.write_stats_data_ids_to_file()).result()
+            old_csv_files = obj_of_cls._get_csv_files_of_ids()
+            assert len(old_csv_files) >= 3
+            for file_p in old_csv_files:
+                assert obj_of_cls._get_file_p_of_digest_of_ids(file_p).exists()
+            # 最後のファイルだけ内容が変わる
+            fake.NUMBER_OF_IDS = 260
+            obj_of_cls.submit(obj_of_cls.write_stats_data_ids_to_file()).result()
+            dct_of_csv_file = {p.name: p for p in obj_of_cls._get_csv_files_of_ids()}
+            for file_p in old_csv_files:
+                new_file_p = dct_of_csv_file[file_p.name]
+                is_same = file_p.stat().st_ino == new_file_p.stat().st_ino
+                assert is_same == (file_p != old_csv_files[-1])
+                assert obj_of_cls._get_file_p_of_digest_of_ids(new_file_p).exists()
+            assert obj_of_cls.scan_stats_data_ids().collect().height == 260
+        finally:
+            obj_of_cls.close()